@@ -1,10 +1,11 @@
 import requests
-from utils.helpers import get_config
+from utils import metrics
+from utils.config import get_config
 from datetime import datetime
 from datetime import datetime
 
 def fetch_token_transfers(address, tokens, chain_id=1, from_block=None):
-    api_key = get_config().get("etherscan_api_key")
+    api_key = get_config().etherscan_api_key
     if not api_key:
         print("[ERROR] Missing Etherscan API key in config.json")
         return []
@@ -20,9 +21,14 @@ def fetch_token_transfers(address, tokens, chain_id=1, from_block=None):
     )
 
     try:
-        r = requests.get(url)
-        data = r.json()
-        txs = data.get("result", [])
+        with metrics.timed("http", "etherscan tokentx") as call:
+            r = requests.get(url)
+            data = r.json()
+            txs = data.get("result", [])
+            if isinstance(txs, list):
+                call.rows = len(txs)
+            else:  # e.g. "Invalid API Key"
+                call.ok, call.detail = False, str(txs)[:200]
         parsed = []
         for tx in txs:
             symbol = tx["tokenSymbol"].upper()
@@ -5,13 +5,14 @@ SQLite ledger, and (optionally) updates the linked account balance.
 
 Dependencies
 ------------
-•   utils.helpers.get_db, get_token_prices, get_config   – existing helper
+•   utils.helpers.get_db, get_token_prices              – existing helper
+•   utils.config.get_config                              – cached, typed config
 •   fetch_normal.fetch_eth_transfers                     – per‑chain ETH scanner
 •   fetch_erc20.fetch_token_transfers                    – per‑chain ERC‑20 scanner
 •   commands.account.set_balance                         – manual balance adjuster
 
 This file NEVER touches hard‑coded paths.  All DB work goes through the
-`get_db()` helper which already wraps utils.path_helpers.get_db_path().
+`get_db()` helper, i.e. the shared connection from utils/db.py.
 
 Atomicity: every DB change is performed inside a single connection /
 transaction per wallet+chain to avoid half‑written entries.
@@ -21,10 +22,11 @@ from __future__ import annotations
 import sqlite3
 from typing import List, Dict, Any
 
+from utils import money
+from utils.config import get_config
 from utils.helpers import (
     get_db,
     get_token_prices,
-    get_config,
 )
 
 from .fetch_normal import fetch_eth_transfers
@@ -35,49 +37,6 @@ from commands.account import set_balance  # internal helper, not CLI
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _ensure_tables(conn: sqlite3.Connection) -> None:
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS web3_scan_state (
-            wallet      TEXT,
-            chain_id    INTEGER,
-            last_block  INTEGER,
-            PRIMARY KEY (wallet, chain_id)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS web3_transactions (
-            date            TEXT,
-            type            TEXT,
-            symbol          TEXT,
-            amount_token    REAL,
-            price_at_time   REAL,
-            value_aud       REAL,
-            account         TEXT,
-            description     TEXT,
-            hash            TEXT,
-            PRIMARY KEY(hash, account)
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS web3_seen_tx (
-            hash        TEXT,
-            direction   TEXT,
-            account     TEXT,
-            chain_id    INTEGER,
-            date        TEXT,
-            PRIMARY KEY(hash, direction)
-        )
-        """
-    )
-    conn.commit()
-
-
 def _get_wallet_accounts() -> List[Dict[str, str]]:
     conn = get_db()
     cur = conn.cursor()
@@ -94,7 +53,7 @@ def _get_wallet_accounts() -> List[Dict[str, str]]:
 def web3_sync() -> None:
     """Synchronise all on‑file wallets across configured chains."""
     cfg = get_config()
-    chains: List[int] = cfg.get("etherscan_chains", [1])  # default mainnet
+    chains: List[int] = list(cfg.etherscan_chains)  # default mainnet
 
     wallets = _get_wallet_accounts()
     print(f"[web3_sync] scanning {len(wallets)} wallet(s)…")
@@ -120,7 +79,6 @@ def _sync_single_wallet(
 
     for chain_id in chains:
         conn = get_db()
-        _ensure_tables(conn)
         cur = conn.cursor()
 
         # last processed block
@@ -167,22 +125,22 @@ def _sync_single_wallet(
             # classify + enrich
             tx_type = "income" if (tx["symbol"] == "ETH" and tx["direction"] == "in") else "swap"
             price = prices.get(tx["symbol"], 0)
-            value_aud = tx["amount"] * price
+            value_fiat = money.to_minor(tx["amount"] * price)
 
             cur.execute(
                 """
                 INSERT OR IGNORE INTO web3_transactions
                           (date, type, symbol, amount_token, price_at_time,
-                           value_aud, account, description, hash)
+                           value_fiat, account, description, hash)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     tx["date"],
                     tx_type,
                     tx["symbol"],
-                    tx["amount"],
+                    money.to_minor(tx["amount"], money.TOKEN_SCALE),
                     price,
-                    value_aud,
+                    value_fiat,
                     account_name,
                     f"{tx['symbol']} {tx_type} {tx['hash'][:8]}",
                     tx["hash"],
@@ -206,7 +164,7 @@ def _sync_single_wallet(
     if final_eth_txs:
         latest = max(final_eth_txs, key=lambda t: t.get("block", 0))
         if "final_balance_aud" in latest:
-            set_balance.callback(account_name, latest["final_balance_aud"])
+            set_balance.callback(account_name, money.to_minor(latest["final_balance_aud"]))
             print(
                 f"[web3_sync] {account_name} balance → {latest['final_balance_aud']:.2f} AUD",
             )
@@ -0,0 +1,18 @@
+"""VaultPlan benchmark suite
+-----------------------------------------------------------------
+Builds synthetic vaults of a chosen size and times the CLI against them.
+
+• generate.py  — deterministic vault generator (same seed + end date, same vault)
+• scenarios.py — timed command scenarios: p50/p95 latency, throughput, peak RSS
+• replay.py    — runs a command with Etherscan/Dexscreener answered from fixtures/
+• imports.py   — import budget of a cold command (python -X importtime)
+• __main__.py  — `python -m benchmarks generate|run|imports`
+
+    python -m benchmarks generate /tmp/bench.db --size medium
+    python -m benchmarks run /tmp/bench.db --repeat 10 --json results.json
+
+Every scenario runs `vaultplan.py` in a fresh process (no daemon), the
+way a user or a cron job would, so latency includes interpreter start-up
+and peak RSS is that process's own. Scenarios write to the vault they
+run against (add-expense), so benchmark a generated copy, not real data.
+"""
@@ -0,0 +1,105 @@
+"""`python -m benchmarks generate|run|imports` (see benchmarks/__init__.py)."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from benchmarks.generate import SIZES, generate as build_vault
+
+app = typer.Typer(help="VaultPlan benchmarks")
+
+
+@app.command()
+def generate(
+    path: Path = typer.Argument(..., help="Database file to create"),
+    size: str = typer.Option("medium", help=f"Vault size: {', '.join(SIZES)}"),
+    journal: Optional[int] = typer.Option(None, help="Override the number of journal postings"),
+    seed: int = typer.Option(1, help="Random seed"),
+    end: str = typer.Option(None, help="Last day with activity (default: today)"),
+    force: bool = typer.Option(False, "--force", help="Replace an existing file"),
+):
+    """Build a deterministic synthetic vault."""
+    if size not in SIZES:
+        typer.echo(f"Unknown size {size!r}; choose {', '.join(SIZES)}")
+        raise typer.Exit(code=1)
+    if path.exists():
+        if not force:
+            typer.echo(f"{path} exists; pass --force to replace it")
+            raise typer.Exit(code=1)
+        for stale in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+            stale.unlink(missing_ok=True)
+
+    spec = SIZES[size]._replace(seed=seed, end=end or date.today().isoformat())
+    if journal is not None:
+        spec = spec._replace(journal=journal)
+
+    # everything below (money.scale() included) talks to this vault
+    os.environ["VAULTPLAN_DB"] = str(path)
+    from utils.db import get_connection
+
+    started = time.perf_counter()
+    counts = build_vault(get_connection(), spec)
+    typer.echo(json.dumps({"path": str(path), "spec": spec._asdict(), "rows": counts,
+                           "seconds": round(time.perf_counter() - started, 1)}, indent=2))
+
+
+@app.command()
+def run(
+    vault: Path = typer.Argument(..., exists=True, dir_okay=False, help="Vault built by `generate`"),
+    repeat: int = typer.Option(5, min=1, help="Runs per scenario"),
+    only: Optional[List[str]] = typer.Option(None, "--only", help="Scenario name (repeatable)"),
+    output: Optional[Path] = typer.Option(None, "--json", help="Write the report to this file"),
+):
+    """Time every scenario and report p50/p95 latency, throughput and peak RSS as JSON."""
+    from benchmarks.scenarios import SCENARIOS, run_all
+
+    unknown = set(only or ()) - {s.name for s in SCENARIOS}
+    if unknown:
+        typer.echo(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        raise typer.Exit(code=1)
+
+    def progress(result: dict) -> None:
+        failed = f"  ({result['failures']} failed)" if result["failures"] else ""
+        typer.echo(f"{result['name']:<24} p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  "
+                   f"rss {result['peak_rss_mb']:>6.1f} MB{failed}", err=True)
+
+    report = run_all(vault, repeat, only or (), progress)
+    text = json.dumps(report, indent=2)
+    if output:
+        output.write_text(text + "\n")
+    else:
+        typer.echo(text)
+
+
+@app.command()
+def imports(
+    vault: Path = typer.Argument(..., exists=True, dir_okay=False, help="Vault built by `generate`"),
+    command: Optional[List[str]] = typer.Argument(None, help="Command to check (default: balance); put -- before options"),
+    repeat: int = typer.Option(5, min=1, help="Runs to take the median import time over"),
+    max_modules: int = typer.Option(170, help="Most modules the command may import after start-up"),
+    max_ms: float = typer.Option(250.0, help="Most milliseconds its imports may take (median)"),
+    network: bool = typer.Option(False, "--network", help="The command goes online: allow requests and Web3"),
+):
+    """Check a cold command's imports against a budget; exits 1 when over it."""
+    import tempfile
+
+    from benchmarks.imports import BANNED, check
+
+    with tempfile.TemporaryDirectory(prefix="vaultplan-bench-") as home:
+        report = check(vault.resolve(), command or ["balance"], repeat, max_modules, max_ms, Path(home),
+                       banned=() if network else BANNED)
+    typer.echo(json.dumps(report, indent=2))
+    for failure in report["failures"]:
+        typer.echo(f"over budget: {failure}", err=True)
+    if report["failures"]:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,210 @@
+# benchmarks/generate.py
+"""Deterministic synthetic vaults.
+
+generate() fills an empty database through the real schema
+(utils/schema.py): accounts with opening balances, a journal of income,
+expenses and transfers spread over `years`, goals, debits, notes and
+web3 transactions. The same VaultSpec (seed and end date included)
+always produces the same rows.
+
+The journal is bulk-loaded with its triggers dropped, then the monthly
+rollups, the search index and the expense items are rebuilt, account
+balances set to their journal totals and the triggers recreated, all in
+one transaction; the result is exactly what the CLI would have built
+row by row (`vaultplan doctor` agrees).
+"""
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+from typing import Iterator, NamedTuple
+
+from utils import items, money, rollups, search
+from utils.balances import add_opening_checkpoint
+from utils.schema import OPENING_DATE, TRIGGERS, create_triggers, ensure_schema
+
+# the wallet the recorded web3 fixtures belong to (fixtures/web3.json)
+FIXTURE_WALLET = "0x5e1f8a0c3d9b7e2a4f6c8d0e1b3a5c7e9f2d4b6a"
+
+CATEGORIES = [("food", 30), ("groceries", 20), ("transport", 12), ("bills", 10), ("coffee", 10),
+              ("entertainment", 8), ("health", 5), ("shopping", 5)]
+MERCHANTS = {
+    "food": ["Grill'd", "Sushi Hub", "Guzman y Gomez", "Local Pho"],
+    "groceries": ["Woolworths", "Coles", "Aldi", "IGA"],
+    "transport": ["Uber *Trip", "Opal Top-up", "Shell", "BP"],
+    "bills": ["Telstra", "Origin Energy", "Sydney Water", "Netflix"],
+    "coffee": ["Campos", "Single O", "Starbucks", "Market Lane"],
+    "entertainment": ["Event Cinemas", "Ticketek", "Steam", "Spotify"],
+    "health": ["Chemist Warehouse", "Priceline", "Fitness First"],
+    "shopping": ["Kmart", "JB Hi-Fi", "Amazon AU", "Uniqlo"],
+}
+ITEMS = {
+    "coffee": ["flat white", "latte", "long black", "croissant", "banana bread"],
+    "groceries": ["milk", "bread", "eggs", "bananas", "coffee beans", "rice", "chicken"],
+    "food": ["burger", "fries", "ramen", "burrito", "salad"],
+}
+TAGS = ["work", "family", "health", "money", "travel", "stress", "win", "habit"]
+TOKENS = [("ETH", 4200.0), ("USDC", 1.54), ("DEGEN", 0.02)]
+
+
+class VaultSpec(NamedTuple):
+    accounts: int = 6
+    journal: int = 1_000_000  # postings; transfers count twice
+    goals: int = 2_000
+    debits: int = 2_000
+    notes: int = 5_000
+    web3: int = 20_000
+    years: int = 5
+    seed: int = 1
+    end: str = "2025-12-31"  # last day with activity (YYYY-MM-DD)
+
+
+SIZES = {
+    "small": VaultSpec(accounts=3, journal=20_000, goals=50, debits=50, notes=500, web3=500, years=2),
+    "medium": VaultSpec(accounts=6, journal=250_000, goals=500, debits=500, notes=2_000, web3=5_000),
+    "large": VaultSpec(),
+    "xlarge": VaultSpec(accounts=12, journal=5_000_000, goals=10_000, debits=10_000, notes=20_000,
+                        web3=100_000, years=10),
+}
+
+
+def _days(spec: VaultSpec) -> list[str]:
+    end = date.fromisoformat(spec.end)
+    return [(end - timedelta(days=n)).isoformat() for n in range(spec.years * 365, -1, -1)]
+
+
+def _cents(rng: random.Random, low: int, high: int) -> int:
+    """A random amount between low and high cents, in this vault's minor units."""
+    return rng.randint(low, high) * 10 ** money.scale() // 100
+
+
+def _journal(rng: random.Random, spec: VaultSpec, accounts: list[str], days: list[str]) -> Iterator[tuple]:
+    categories, weights = zip(*CATEGORIES)
+    made = 0
+    while made < spec.journal:
+        day = days[made * len(days) // spec.journal]  # even spread, sorted by date
+        account = rng.choice(accounts)
+        roll = rng.random()
+        if roll < 0.12:
+            amount = _cents(rng, 50_000, 900_000)
+            yield account, amount, day, "income", None, None, rng.choice(["Salary", "Freelance", "Dividends"]), None, None
+            made += 1
+        elif roll < 0.17 and len(accounts) > 1 and made + 1 < spec.journal:
+            other = rng.choice([a for a in accounts if a != account])
+            amount = _cents(rng, 5_000, 200_000)
+            yield account, -amount, day, "transfer", other, None, f"Transfer to {other}", None, None
+            yield other, amount, day, "transfer", account, None, f"Transfer from {account}", None, None
+            made += 2
+        else:
+            category = rng.choices(categories, weights)[0]
+            bought = ITEMS.get(category)
+            metadata = json.dumps(rng.sample(bought, rng.randint(1, 3)) if bought and rng.random() < 0.5 else [])
+            amount = _cents(rng, 300, 25_000)
+            yield (account, -amount, day, "expense", None, category, rng.choice(MERCHANTS[category]),
+                   None, metadata)
+            made += 1
+
+
+def _chunks(rows: Iterator[tuple], size: int = 10_000) -> Iterator[list[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate(conn: sqlite3.Connection, spec: VaultSpec) -> dict[str, int]:
+    """Fill an empty vault on `conn`; returns {table: rows}."""
+    ensure_schema(conn)
+    if conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]:
+        raise ValueError("the vault already has accounts; generate into an empty database")
+    rng = random.Random(spec.seed)
+    days = _days(spec)
+    start = days[0]
+
+    conn.execute("BEGIN")
+    try:
+        accounts = [f"Bank {n + 1}" for n in range(max(spec.accounts - 1, 1))]
+        for name in accounts:
+            opening = _cents(rng, 100_000, 5_000_000)
+            conn.execute("INSERT INTO accounts (name, type, balance) VALUES (?, 'bank', ?)", (name, opening))
+            conn.execute(
+                "INSERT INTO journal (account, amount, date, kind, description) VALUES (?, ?, ?, 'opening', 'Opening balance')",
+                (name, opening, OPENING_DATE),
+            )
+            add_opening_checkpoint(conn, name, opening)
+        conn.execute("INSERT INTO accounts (name, type, balance, wallet) VALUES ('Wallet', 'wallet', 0, ?)",
+                     (FIXTURE_WALLET,))
+        add_opening_checkpoint(conn, "Wallet", 0)
+
+        journal_triggers = [name for name, sql in TRIGGERS.items() if " ON journal " in sql]
+        for name in journal_triggers:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for chunk in _chunks(_journal(rng, spec, accounts, days)):
+            conn.executemany(
+                "INSERT INTO journal (account, amount, date, kind, counterparty, category, description, note, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                chunk,
+            )
+        rollups.rebuild(conn)
+        search.rebuild(conn)  # notes and web3 rows below go through the triggers again
+        items.rebuild(conn)
+        conn.execute("UPDATE accounts SET balance = (SELECT COALESCE(SUM(amount), 0) FROM journal "
+                     "WHERE journal.account = accounts.name AND date IS NOT NULL)")
+        create_triggers(conn)
+
+        conn.executemany(
+            "INSERT INTO goals (name, target_amount, saved_amount, account, priority, status, created_at, note, deadline) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (f"Goal {n + 1}", target, rng.randint(0, target), rng.choice(accounts), rng.randint(1, 5),
+                 "completed" if rng.random() < 0.2 else "active", rng.choice(days),
+                 rng.choice(["", "stretch", "before summer"]), rng.choice(days) if rng.random() < 0.7 else None)
+                for n, target in ((n, _cents(rng, 50_000, 2_000_000)) for n in range(spec.goals))
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO debits (label, amount_due, amount_paid, account, due_date, created_at, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (f"Bill {n + 1}", due, due if paid else 0, rng.choice(accounts), rng.choice(days),
+                 start, "paid" if paid else "open")
+                for n, due, paid in ((n, _cents(rng, 2_000, 300_000), rng.random() < 0.6)
+                                     for n in range(spec.debits))
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO notes (mood, note, account, tags, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                (rng.randint(1, 5), f"Journal entry {n + 1}", rng.choice(accounts + [None]),
+                 json.dumps(rng.sample(TAGS, rng.randint(0, 3))), f"{rng.choice(days)} {rng.randint(6, 23):02d}:00:00")
+                for n in range(spec.notes)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO web3_transactions (date, type, symbol, amount_token, price_at_time, value_fiat, "
+            "account, description, hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (day, kind, symbol, money.to_minor(qty, money.TOKEN_SCALE), price, money.to_minor(qty * price),
+                 "Wallet", f"{symbol} {kind} {n:08x}", f"0x{rng.getrandbits(256):064x}")
+                for n, day, kind, (symbol, price), qty in (
+                    (n, rng.choice(days), rng.choice(["income", "expense", "swap"]), rng.choice(TOKENS),
+                     round(rng.uniform(0.001, 50), 6))
+                    for n in range(spec.web3)
+                )
+            ),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("accounts", "journal", "goals", "debits", "notes", "web3_transactions")
+    }
@@ -0,0 +1,91 @@
+# benchmarks/imports.py
+"""Import budget of a cold command.
+
+Runs a command under `python -X importtime` and checks what its start-up
+imports against a budget: how many modules load after interpreter
+start-up (`site`), how long those imports take (median over the runs),
+and modules that must not load at all (requests and the web3 sync, unless
+--network says the command goes online).
+
+    python -m benchmarks imports /tmp/bench.db --max-modules 170 --max-ms 250
+
+-X importtime only logs `import` statements, so the command module the
+registry loads with importlib is not listed itself; everything it
+imports is.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+from benchmarks.scenarios import ROOT
+
+BANNED = ("requests", "urllib3", "Web3")
+
+
+class Imported(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(stderr: str) -> list[Imported]:
+    """The `-X importtime` lines after interpreter start-up, in the order logged."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        if module == "site":
+            rows = []  # site and everything it pulled in happen before vaultplan.py runs
+            continue
+        rows.append(Imported(module, int(self_us), int(cumulative_us), (len(name) - len(name.lstrip()) - 1) // 2))
+    return rows
+
+
+def _run_once(argv: Sequence[str], vault: Path, home: Path) -> list[Imported]:
+    env = {**os.environ, "VAULTPLAN_DB": str(vault), "VAULTPLAN_NO_DAEMON": "1", "HOME": str(home),
+           "VAULTPLAN_PAGER": "", "COLUMNS": "120"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", str(ROOT / "vaultplan.py"), *argv],
+                          cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} failed: {proc.stderr[-500:]}")
+    return parse(proc.stderr)
+
+
+def check(vault: Path, argv: Sequence[str], repeat: int, max_modules: int, max_ms: float, home: Path,
+          banned: Sequence[str] = BANNED) -> dict:
+    """Report of `argv`'s imports; `failures` lists what breaks the budget (empty when within it)."""
+    runs = [_run_once(argv, vault, home) for _ in range(repeat)]
+    imported = runs[-1]  # the set of modules is the same every run; the times are not
+    totals = [sum(row.cumulative_us for row in run if row.depth == 0) / 1000 for run in runs]
+    ms = round(statistics.median(totals), 1)
+    # a banned name covers the module and everything under it ("rich" bans rich.table too)
+    loaded = sorted(name for name in banned
+                    if any(row.module == name or row.module.startswith(name + ".") for row in imported))
+
+    failures = []
+    if len(imported) > max_modules:
+        failures.append(f"{len(imported)} modules imported (budget {max_modules})")
+    if ms > max_ms:
+        failures.append(f"imports took {ms} ms (budget {max_ms} ms)")
+    if loaded:
+        failures.append(f"must not import {', '.join(loaded)}")
+
+    heaviest = sorted((row for row in imported if row.depth == 0), key=lambda row: -row.cumulative_us)[:10]
+    return {
+        "command": list(argv),
+        "runs": repeat,
+        "modules": len(imported),
+        "max_modules": max_modules,
+        "import_ms": ms,
+        "max_ms": max_ms,
+        "heaviest": [{"module": row.module, "ms": round(row.cumulative_us / 1000, 1)} for row in heaviest],
+        "failures": failures,
+    }
@@ -0,0 +1,65 @@
+# benchmarks/replay.py
+"""Run a VaultPlan command with its HTTP calls answered from fixtures.
+
+    python -m benchmarks.replay benchmarks/fixtures/web3.json web3-sync
+
+fixtures/web3.json holds Etherscan `txlist`/`tokentx` responses for
+FIXTURE_WALLET on chain 1 and Dexscreener search responses per symbol.
+Other chains answer "No transactions found", like Etherscan does, and
+`startblock` is honoured, so web3-sync follows its normal code path
+without a network or an API key quota.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+_EMPTY = {"status": "0", "message": "No transactions found", "result": []}
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def json(self) -> dict:
+        return self._data
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def answer(fixtures: dict, url: str) -> dict:
+    """The recorded response for `url` (an Etherscan or Dexscreener API call)."""
+    parsed = urlparse(url)
+    query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+    if "dexscreener" in parsed.netloc:
+        return fixtures["dexscreener"].get(query.get("q", "").upper(), {"pairs": []})
+    recorded = fixtures["etherscan"].get(query.get("chainid", "1"), {}).get(query.get("action"))
+    if recorded is None or query.get("address", "").lower() != fixtures["wallet"].lower():
+        return _EMPTY
+    start = int(query.get("startblock", 0))
+    rows = [tx for tx in recorded["result"] if int(tx["blockNumber"]) >= start]
+    return {**recorded, "result": rows} if rows else _EMPTY
+
+
+def install(path: Path) -> None:
+    """Answer every requests.get() in this process from the fixture file at `path`."""
+    import requests
+
+    fixtures = json.loads(Path(path).read_text())
+    requests.get = lambda url, *args, **kwargs: _Response(answer(fixtures, url))
+
+
+def main(argv: list[str]) -> int:
+    install(Path(argv[0]))
+    from commands import registry
+
+    return registry.run(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
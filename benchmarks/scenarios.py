@@ -0,0 +1,171 @@
+# benchmarks/scenarios.py
+"""Timed command scenarios.
+
+Each Scenario is one CLI invocation, run `repeat` times in a fresh
+process against the vault. A run is timed from spawn to exit and its
+peak RSS comes from the child's own rusage (os.wait4), so numbers are
+what a user at the terminal, or a cron job, actually pays.
+
+Results per scenario: p50/p95/mean latency (ms), runs/s and, when the
+scenario knows how many rows it processes, rows/s, plus the peak RSS
+(MB) over all runs.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "web3.json"
+
+
+class Scenario(NamedTuple):
+    name: str
+    argv: list[str]
+    rows_sql: Optional[str] = None  # rows the command works through (for rows/s)
+    setup: Optional[Callable[[sqlite3.Connection], None]] = None  # before every run, untimed
+    replay: bool = False  # answer HTTP calls from fixtures/web3.json
+
+
+def _reset_web3(conn: sqlite3.Connection) -> None:
+    # a fresh first sync every time: forget what the fixtures already delivered
+    fixtures = json.loads(FIXTURES.read_text())
+    hashes = [(tx["hash"],) for chain in fixtures["etherscan"].values()
+              for response in chain.values() for tx in response["result"]]
+    conn.executemany("DELETE FROM web3_transactions WHERE hash = ?", hashes)
+    conn.execute("DELETE FROM web3_seen_tx")
+    conn.execute("DELETE FROM web3_scan_state")
+    conn.commit()
+
+
+SCENARIOS = [
+    Scenario("add-expense", ["add-expense", "12", "--category", "coffee", "--description", "bench",
+                             "--account", "Bank 1", "--metadata", '["flat white"]']),
+    Scenario("balance", ["balance"]),
+    Scenario("balance-as-of", ["balance", "--as-of", "2024-06-30"]),
+    Scenario("balance-json", ["--format", "json", "balance", "--days", "30"]),
+    Scenario("summary", ["summary", "--limit", "50"]),
+    Scenario("summary-json", ["--format", "json", "summary"]),
+    Scenario("export-summary-full", ["export-summary", "--mode", "full", "--format", "ndjson"],
+             rows_sql="SELECT COUNT(*) FROM journal"),
+    Scenario("export-summary-weekly", ["export-summary", "--mode", "weekly"]),
+    Scenario("list-notes", ["list-notes", "--days", "36500", "--limit", "200"]),
+    Scenario("list-notes-tags", ["list-notes", "--days", "36500", "--tag", "work", "--tag", "win", "--limit", "200"]),
+    Scenario("note-tags", ["note-tags"]),
+    Scenario("item-totals", ["item-totals", "--item", "coffee", "--since", "2024-01-01"],
+             rows_sql="SELECT COUNT(*) FROM expense_items"),
+    Scenario("top-items", ["top-items", "--limit", "20"]),
+    Scenario("list-goals", ["list-goals", "--limit", "200"]),
+    Scenario("list-debits", ["list-debits", "--limit", "200"]),
+    Scenario("search", ["search", "woolworths", "--limit", "50"]),
+    Scenario("web3-sync", ["web3-sync"], setup=_reset_web3, replay=True),
+]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (no interpolation, so it is always an observed value)."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def _spawn(argv: list[str], env: dict) -> tuple[float, float, Optional[str]]:
+    """(seconds, peak RSS in MB, stderr tail if it failed) of one child process."""
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=err)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        error = None
+        if proc.returncode != 0:
+            err.seek(0)
+            error = err.read().decode(errors="replace")[-500:] or f"exit code {proc.returncode}"
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return elapsed, rss, error
+
+
+def run_scenario(scenario: Scenario, vault: Path, repeat: int, home: Path) -> dict:
+    env = {**os.environ, "VAULTPLAN_DB": str(vault), "VAULTPLAN_NO_DAEMON": "1", "HOME": str(home),
+           "VAULTPLAN_PAGER": "", "COLUMNS": "120"}
+    if scenario.replay:
+        argv = [sys.executable, "-m", "benchmarks.replay", str(FIXTURES), *scenario.argv]
+    else:
+        argv = [sys.executable, str(ROOT / "vaultplan.py"), *scenario.argv]
+
+    conn = sqlite3.connect(vault)
+    try:
+        rows = conn.execute(scenario.rows_sql).fetchone()[0] if scenario.rows_sql else None
+        times, peak, failures, error = [], 0.0, 0, None
+        for _ in range(repeat):
+            if scenario.setup:
+                scenario.setup(conn)
+            elapsed, rss, failed = _spawn(argv, env)
+            times.append(elapsed)
+            peak = max(peak, rss)
+            if failed:
+                failures, error = failures + 1, failed
+    finally:
+        conn.close()
+
+    mean = sum(times) / len(times)
+    result = {
+        "name": scenario.name,
+        "command": scenario.argv,
+        "runs": repeat,
+        "failures": failures,
+        "p50_ms": round(percentile(times, 50) * 1000, 1),
+        "p95_ms": round(percentile(times, 95) * 1000, 1),
+        "mean_ms": round(mean * 1000, 1),
+        "runs_per_s": round(1 / mean, 2),
+        "peak_rss_mb": round(peak, 1),
+    }
+    if rows is not None:
+        result["rows"] = rows
+        result["rows_per_s"] = round(rows / mean)
+    if error:
+        result["last_error"] = error
+    return result
+
+
+def run_all(vault: Path, repeat: int = 5, only: Sequence[str] = (),
+            progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """Run every scenario (or those named in `only`) and return the JSON report."""
+    vault = Path(vault).resolve()
+    conn = sqlite3.connect(vault)
+    try:
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("accounts", "journal", "goals", "debits", "notes", "web3_transactions")
+        }
+    finally:
+        conn.close()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vaultplan-bench-") as home:  # export files land here
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+            result = run_scenario(scenario, vault, repeat, Path(home))
+            results.append(result)
+            if progress:
+                progress(result)
+
+    return {
+        "vault": str(vault),
+        "rows": counts,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scenarios": results,
+    }
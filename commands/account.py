@@ -6,8 +6,8 @@ Core responsibilities
 • transfer       — move funds between accounts (atomic)
 
 The module exposes a Typer sub‑app that gets mounted from vaultplan.py.
-All DB access goes through utils.path_helpers.get_db_path() so the CLI
-cannot create divergent SQLite files.
+All DB access goes through utils.helpers.get_db() (the shared connection
+from utils/db.py) so the CLI cannot create divergent SQLite files.
 """
 
 from __future__ import annotations
@@ -19,7 +19,11 @@ from typing import Optional
 import typer
 from rich.console import Console
 
+from utils import money
+from utils.balances import add_opening_checkpoint
 from utils.helpers import get_db
+from utils.journal import post, post_transfer
+from utils.schema import OPENING_DATE
 
 app = typer.Typer(help="Account‑related commands")
 console = Console()
@@ -27,7 +31,7 @@ console = Console()
 # ---------------------------------------------------------------------------
 # constants
 # ---------------------------------------------------------------------------
-TRANSFER_CATEGORY = "__transfer__"  # unlikely to collide with user categories
+TRANSFER_CATEGORY = "__transfer__"  # how transfers show up in the expenses view
 
 # ---------------------------------------------------------------------------
 # helpers
@@ -49,7 +53,7 @@ def create_account(
         help="Account type: bank | wallet | cash | other",
         show_default=True,
     ),
-    balance: float = typer.Option(0.0, "--balance", help="Opening balance"),
+    balance: int = typer.Option("0", "--balance", parser=money.amount, help="Opening balance"),
     wallet: Optional[str] = typer.Option(
         None, "--wallet", help="0x… address for on‑chain wallets"
     ),
@@ -67,30 +71,36 @@ def create_account(
             "INSERT INTO accounts (name, type, balance, wallet) VALUES (?, ?, ?, ?)",
             (name, acct_type, balance, wallet),
         )
+        if balance:
+            post(conn, name, balance, "opening", OPENING_DATE, description="Opening balance")
+        add_opening_checkpoint(conn, name, balance)
         conn.commit()
 
     console.print(
-        f"[green]✓[/green] Created account '[bold]{name}[/bold]' with balance ${balance:.2f}"
+        f"[green]✓[/green] Created account '[bold]{name}[/bold]' with balance ${money.fmt(balance)}"
     )
 
 
 @app.command("set-balance")
 def set_balance(
     name: str = typer.Argument(..., help="Account to modify"),
-    new_balance: float = typer.Argument(..., help="New absolute balance"),
+    new_balance: int = typer.Argument(..., parser=money.amount, help="New absolute balance"),
 ):
     """Force‑set an account balance (use rarely!)."""
 
     with _connect() as conn:
         c = conn.cursor()
-        res = c.execute("UPDATE accounts SET balance = ? WHERE name = ?", (new_balance, name))
-        if res.rowcount == 0:
+        row = c.execute("SELECT balance FROM accounts WHERE name = ?", (name,)).fetchone()
+        if row is None:
             console.print(f"[red]Account not found:[/red] {name}")
             raise typer.Exit(code=1)
+        c.execute("UPDATE accounts SET balance = ? WHERE name = ?", (new_balance, name))
+        # keep the journal (and balance checkpoints) in step with the override
+        post(conn, name, new_balance - (row[0] or 0), "adjustment", description="Manual balance override")
         conn.commit()
 
     console.print(
-        f"[yellow]Balance set[/yellow] — {name} now ${new_balance:.2f} (manual override)"
+        f"[yellow]Balance set[/yellow] — {name} now ${money.fmt(new_balance)} (manual override)"
     )
 
 
@@ -98,7 +108,7 @@ def set_balance(
 def transfer_funds(
     from_account: str = typer.Argument(..., help="Debit this account"),
     to_account: str = typer.Argument(..., help="Credit this account"),
-    amount: float = typer.Argument(..., help="Amount to move"),
+    amount: int = typer.Argument(..., parser=money.amount, help="Amount to move"),
 ):
     """Move money between two existing accounts (atomic)."""
 
@@ -123,12 +133,12 @@ def transfer_funds(
             raise typer.Exit(code=1)
         if row_from[0] < amount:
             console.print(
-                f"[red]Insufficient funds:[/red] {from_account} only has ${row_from[0]:.2f}"
+                f"[red]Insufficient funds:[/red] {from_account} only has ${money.fmt(row_from[0])}"
             )
             raise typer.Exit(code=1)
 
         try:
-            c.execute("BEGIN")
+            # the first UPDATE opens the transaction; commit/rollback closes it
             c.execute(
                 "UPDATE accounts SET balance = balance - ? WHERE name = ?",
                 (amount, from_account),
@@ -137,17 +147,8 @@ def transfer_funds(
                 "UPDATE accounts SET balance = balance + ? WHERE name = ?",
                 (amount, to_account),
             )
-            # Record an expense for audit trail
-            c.execute(
-                "INSERT INTO expenses (amount, category, description, account, metadata, note, date) "
-                "VALUES (?, ?, ?, ?, NULL, NULL, DATE('now'))",
-                (
-                    amount,
-                    TRANSFER_CATEGORY,
-                    f"Transfer to {to_account}",
-                    from_account,
-                ),
-            )
+            # debit + credit postings for the audit trail
+            post_transfer(conn, from_account, to_account, amount)
             conn.commit()
         except Exception as err:
             conn.rollback()
@@ -155,7 +156,7 @@ def transfer_funds(
             raise typer.Exit(code=1)
 
     console.print(
-        f"✅ Transferred ${amount:.2f} from '[bold]{from_account}[/bold]' → '[bold]{to_account}[/bold]'"
+        f"✅ Transferred ${money.fmt(amount)} from '[bold]{from_account}[/bold]' → '[bold]{to_account}[/bold]'"
     )
 
 
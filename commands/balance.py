@@ -5,85 +5,109 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
+from utils import money
+from utils.balances import balance_as_of, refresh_checkpoints
 from utils.helpers import get_db
+from utils.listing import Listing, keyset, parse_after, stream
+from utils.output import console, machine, write_cursor, write_rows
 
 from utils.config import get_display_currency
-currency = get_display_currency()
 
 app = typer.Typer()
-console = Console()
+
+# shared with doctor's query plan check (utils/query_plan.py)
+ACCOUNTS_SQL = "SELECT name, type, balance, wallet FROM accounts"
 
 def _open_conn() -> sqlite3.Connection:
     return get_db()  # get_db already returns a connection
 
 def _fetch_accounts(c: sqlite3.Cursor, accounts: str | None):
     if accounts:
-        c.execute(
-            "SELECT name, type, balance, wallet FROM accounts WHERE name = ?",
-            (accounts,),
-        )
+        c.execute(ACCOUNTS_SQL + " WHERE name = ?", (accounts,))
     else:
-        c.execute("SELECT name, type, balance, wallet FROM accounts")
+        c.execute(ACCOUNTS_SQL)
     return c.fetchall()
 
-def _print_balance_table(rows):
-    table = Table(title="Account Balances")
+def _balances_as_of(c: sqlite3.Cursor, rows, as_of: str):
+    conn = c.connection
+    if refresh_checkpoints(conn):
+        conn.commit()
+    return [(name, type_, balance_as_of(conn, name, as_of), wallet) for name, type_, _, wallet in rows]
+
+def _print_balance_table(rows, as_of: str | None = None):
+    from rich.table import Table
+
+    currency = get_display_currency()
+    table = Table(title=f"Account Balances as of {as_of}" if as_of else "Account Balances")
     table.add_column("Account", style="cyan")
     table.add_column("Type", style="magenta")
     table.add_column("Balance", style="green", justify="right")
     table.add_column("Wallet", style="yellow")
     for name, type_, balance, wallet in rows:
-        table.add_row(name, type_, f"{currency}{balance:,.2f}", wallet or "—")
+        shown = "—" if balance is None else f"{currency}{money.fmt(balance)}"
+        table.add_row(name, type_, shown, wallet or "—")
     console.print(table)
 
-def _fetch_activity(c: sqlite3.Cursor, accounts: str | None, since: str):
+def activity_query(accounts: str | None, since: str, until: str = "9999-12-31",
+                   after: tuple | None = None) -> tuple[str, tuple]:
+    """The activity listing's SELECT and parameters (one account, or all of them)."""
+    where = "date >= ? AND date <= ? AND kind != 'opening'"
+    params: tuple = (since, until)
     if accounts:
-        c.execute(
-            """
-            SELECT date, amount * -1, 'Expense', printf('%s: %s', category, description), account
-            FROM expenses WHERE account = ? AND date >= ?
-            UNION ALL
-            SELECT date, amount, 'Income', source, account
-            FROM income WHERE account = ? AND date >= ?
-            ORDER BY date DESC
-            """,
-            (accounts, since, accounts, since),
-        )
-    else:
-        c.execute(
-            """
-            SELECT date, amount * -1, 'Expense', printf('%s: %s', category, description), account
-            FROM expenses WHERE date >= ?
-            UNION ALL
-            SELECT date, amount, 'Income', source, account
-            FROM income WHERE date >= ?
-            ORDER BY date DESC
-            """,
-            (since, since),
-        )
-    return c.fetchall()
+        where = "account = ? AND " + where
+        params = (accounts, *params)
+    sql, cursor_params = keyset(
+        f"""
+        SELECT date, amount, kind,
+               CASE WHEN category IS NOT NULL THEN printf('%s: %s', category, description)
+                    ELSE description END AS description,
+               account, id
+        FROM journal WHERE {where}
+        """,
+        after,
+        "date",
+    )
+    return sql, params + cursor_params
 
-def _print_activity_table(rows, days):
-    table = Table(title=f"Recent Activity (Last {days} days)")
-    table.add_column("Date", style="cyan")
-    table.add_column("Type", style="magenta")
-    table.add_column("Amount", style="green", justify="right")
-    table.add_column("Description", style="yellow")
-    table.add_column("Account", style="blue")
-    for date, amount, typ, desc, acc in rows:
+def _fetch_activity(c: sqlite3.Cursor, accounts: str | None, since: str, until: str = "9999-12-31",
+                    after: tuple | None = None):
+    return c.execute(*activity_query(accounts, since, until, after))
+
+def _activity_listing(days) -> Listing:
+    currency = get_display_currency()
+
+    def cells(row):
+        date, amount, typ, desc, acc, _ = row
         sign = "-" if amount < 0 else "+"
-        table.add_row(date, typ, f"{sign}{currency}{abs(amount):,.2f}", desc, acc)
-    console.print(table)
+        return [date, typ.title(), f"{sign}{currency}{money.fmt(abs(amount))}", desc or "", acc]
+
+    return Listing(
+        f"Recent Activity (Last {days} days)",
+        [("Date", {"style": "cyan"}), ("Type", {"style": "magenta"}),
+         ("Amount", {"style": "green", "justify": "right"}), ("Description", {"style": "yellow"}),
+         ("Account", {"style": "blue"})],
+        cells,
+        lambda row: f"{row[0]},{row[5]}",
+    )
 
 @app.command("balance")
 def show_balance(
     accounts: str | None = typer.Option(None, help="Specific account to show (default: all)"),
     days: int = typer.Option(7, min=1, help="Look‑back window for recent activity"),
+    as_of: str | None = typer.Option(None, "--as-of", help="Show balances at the end of this date (YYYY-MM-DD)"),
+    limit: int | None = typer.Option(None, min=1, help="Show at most N activity rows"),
+    after: str | None = typer.Option(None, help="Continue the activity listing after this cursor"),
 ):
-    since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    if as_of:
+        try:
+            end = datetime.strptime(as_of, "%Y-%m-%d")
+        except ValueError:
+            console.print("[red]Invalid date format. Use YYYY-MM-DD.[/red]")
+            raise typer.Exit(code=1)
+    else:
+        end = datetime.now()
+    since_date = (end - timedelta(days=days)).strftime("%Y-%m-%d")
 
     with _open_conn() as conn:
         c = conn.cursor()
@@ -91,12 +115,16 @@ def show_balance(
         if not result:
             console.print(f"[red]No account found named '{accounts}'.[/red]" if accounts else "[red]No accounts defined yet.[/red]")
             raise typer.Exit(code=1)
-        _print_balance_table(result)
+        if as_of:
+            result = _balances_as_of(c, result, as_of)
+        activity = _fetch_activity(c, accounts, since_date, as_of or "9999-12-31", parse_after(after))
+        if machine():
+            write_rows("balance", ("account", "type", "balance", "wallet"), result, (("balance", None),))
+            write_cursor("activity", activity, (("amount", None),), limit)
+            return
 
-        activity = _fetch_activity(c, accounts, since_date)
-        if activity:
-            _print_activity_table(activity, days)
-        else:
+        _print_balance_table(result, as_of)
+        if not stream(_activity_listing(days), activity, console, limit):
             console.print(f"[yellow]No transactions in the last {days} days.[/yellow]")
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""VaultPlan batch runner
+-----------------------------------------------------------------
+`vaultplan batch <file|->` replays many commands in one process and one
+SQLite transaction instead of one interpreter + connection + fsync per
+line.
+
+Accepted line formats (mixable, blank lines and # comments ignored):
+• command lines   — add-expense 4.50 --account Bank --category food
+                    (a leading "vaultplan" is optional)
+• NDJSON records  — {"command": "add-expense", "args": ["4.50"],
+                     "options": {"account": "Bank", "category": "food"}}
+
+By default the batch is all-or-nothing: the first failing line rolls
+everything back. With --savepoint each line runs in its own savepoint,
+failed lines are skipped and the rest are committed.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import shlex
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Iterable, Iterator, Optional
+
+import typer
+from rich.console import Console
+
+from commands import registry
+from utils.helpers import get_db
+
+app = typer.Typer()
+console = Console()
+
+# commands that make no sense inside a batch
+NOT_BATCHABLE = {"batch", "serve", "wizard"}
+
+
+def _record_to_argv(record: dict) -> list[str]:
+    argv = [str(record["command"])]
+    argv += [str(a) for a in record.get("args", [])]
+    for key, value in (record.get("options") or {}).items():
+        flag = "--" + key.replace("_", "-")
+        if value is True:
+            argv.append(flag)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, list):
+            for item in value:
+                argv += [flag, str(item)]
+        else:
+            argv += [flag, str(value)]
+    return argv
+
+
+def parse_line(line: str) -> Optional[list[str]]:
+    """Turn one batch line into argv (None for blanks and comments)."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        return _record_to_argv(json.loads(line))
+    argv = shlex.split(line)
+    if argv and argv[0] in ("vaultplan", "vaultplan.py"):
+        argv = argv[1:]
+    return argv
+
+
+def _read_lines(source: str) -> Iterator[str]:
+    if source == "-":
+        yield from sys.stdin
+    else:
+        with open(source, encoding="utf-8") as f:
+            yield from f
+
+
+def _run_line(argv: list[str], quiet: bool) -> int:
+    if registry.requested_command(argv) in NOT_BATCHABLE:
+        console.print(f"[red]Not allowed in a batch:[/red] {argv[0]}")
+        return 2
+    try:
+        if quiet:
+            with redirect_stdout(io.StringIO()):
+                return registry.run(argv)
+        return registry.run(argv)
+    except Exception as err:  # a crashing command is just a failed line
+        console.print(f"[red]{type(err).__name__}:[/red] {err}")
+        return 1
+
+
+def run_batch(lines: Iterable[str], savepoint: bool = False, quiet: bool = False) -> tuple[int, int]:
+    """Execute batch lines on the shared connection. Returns (ok, failed)."""
+    ok = failed = 0
+    conn = get_db()
+    conn.execute("BEGIN")
+    conn.held = True
+    committed = False
+    try:
+        for lineno, line in enumerate(lines, 1):
+            try:
+                argv = parse_line(line)
+            except (ValueError, KeyError) as err:
+                argv, code = None, 2
+                console.print(f"[red]Line {lineno}: cannot parse ({err})[/red]")
+            else:
+                if argv is None:
+                    continue
+                if savepoint:
+                    conn.execute("SAVEPOINT batch_line")
+                code = _run_line(argv, quiet)
+
+            if code == 0:
+                ok += 1
+                if savepoint:
+                    conn.execute("RELEASE batch_line")
+                continue
+
+            failed += 1
+            if not savepoint:
+                console.print(f"[red]✗ Line {lineno} failed (exit {code}); rolling back the whole batch.[/red]")
+                return ok, failed
+            if argv is not None:
+                conn.execute("ROLLBACK TO batch_line")
+                conn.execute("RELEASE batch_line")
+            console.print(f"[yellow]↷ Line {lineno} skipped (exit {code}).[/yellow]")
+
+        conn.finish(commit=True)
+        committed = True
+    finally:
+        if not committed:
+            conn.finish(commit=False)
+    return ok, failed
+
+
+@app.command("batch")
+def batch(
+    source: str = typer.Argument(..., help="File of vaultplan command lines or NDJSON records ('-' for stdin)"),
+    savepoint: bool = typer.Option(False, "--savepoint", help="Run each line in a savepoint: skip failed lines, commit the rest"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Hide the output of individual commands"),
+):
+    """Run many commands from a file or stdin in a single transaction."""
+    try:
+        lines = _read_lines(source)
+        started = time.perf_counter()
+        ok, failed = run_batch(lines, savepoint=savepoint, quiet=quiet)
+        elapsed = time.perf_counter() - started
+    except OSError as err:
+        console.print(f"[red]Cannot read batch:[/red] {err}")
+        raise typer.Exit(code=1)
+
+    rate = (ok + failed) / elapsed if elapsed > 0 else 0.0
+    status = "committed" if savepoint or not failed else "rolled back"
+    console.print(
+        f"[bold]Batch {status}:[/bold] {ok} ok, {failed} failed in {elapsed:.2f}s ({rate:,.0f} commands/s)"
+    )
+    if failed:
+        raise typer.Exit(code=1)
@@ -4,26 +4,29 @@ from rich.console import Console
 from pathlib import Path
 import json
 
+from utils import money
+
 app = typer.Typer()
 console = Console()
 
-def coin_mode(pocket_total: float, notes: float):
+def coin_mode(pocket_total: int, notes: int):
+    """Amounts in minor units (see utils/money.py)."""
     coins = pocket_total - notes
-    if coins >= 50:
+    if coins >= money.to_minor(50):
         return {
             "action": "DEPOSIT_NOTES",
             "amount_to_bank": notes,
-            "message": f"Coin mode triggered: Deposit ${notes:.2f} in notes. Survive on ${coins:.2f} in coins."
+            "message": f"Coin mode triggered: Deposit ${money.fmt(notes)} in notes. Survive on ${money.fmt(coins)} in coins."
         }
     else:
         return {
             "action": "HOLD",
-            "message": f"Coins ${coins:.2f} not yet at $50 threshold. No deposit triggered."
+            "message": f"Coins ${money.fmt(coins)} not yet at $50 threshold. No deposit triggered."
         }
 
 @app.command("check")
-def run_coin_mode(notes: float = typer.Argument(..., help="How much in paper notes you have"),
-                  pocket: float = typer.Option(None, help="Override current Pocket balance")):
+def run_coin_mode(notes: int = typer.Argument(..., parser=money.amount, help="How much in paper notes you have"),
+                  pocket: int = typer.Option(None, parser=money.amount, help="Override current Pocket balance")):
     """Run the BUNB Coin Mode protocol."""
     from utils.helpers import get_db
 
@@ -12,17 +12,19 @@ from __future__ import annotations
 
 import sqlite3
 from datetime import datetime
+from typing import Optional
+
 import typer
-from rich.console import Console
-from rich.table import Table
 
+from utils import money
 from utils.helpers import get_db
+from utils.listing import Listing, keyset, parse_after, stream
+from utils.output import console, machine, write_cursor
+from utils.journal import post
 
-from utils.config import get_display_currency  # if not already
-currency = get_display_currency()
+from utils.config import get_display_currency
 
 app = typer.Typer()
-console = Console()
 
 # ---------------------------------------------------------------------------
 # Commands
@@ -31,9 +33,10 @@ console = Console()
 @app.command("add-debit")
 def add_debit(
     label: str = typer.Argument(..., help="Name or label of the debit"),
-    amount_due: float = typer.Argument(..., help="Amount due"),
+    amount_due: int = typer.Argument(..., parser=money.amount, help="Amount due"),
     due_date: str = typer.Option(None, help="Due date (YYYY-MM-DD)"),
     account: str = typer.Option("Pocket", help="Account to pay from"),
+    note: str = typer.Option(None, help="Optional note"),
 ):
     """Add a new debit (bill, recurring charge, etc.)"""
     try:
@@ -46,31 +49,19 @@ def add_debit(
     with get_db() as conn:
         c = conn.cursor()
         c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS debits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                label TEXT,
-                amount_due REAL,
-                amount_paid REAL DEFAULT 0.0,
-                due_date TEXT,
-                account TEXT,
-                status TEXT DEFAULT 'open'
-            )
-            """
-        )
-        c.execute(
-            "INSERT INTO debits (label, amount_due, amount_paid, due_date, account) VALUES (?, ?, ?, ?, ?)",
-            (label, amount_due, 0.0, due_date, account)
+            "INSERT INTO debits (label, amount_due, amount_paid, due_date, account, status, note) "
+            "VALUES (?, ?, ?, ?, ?, 'open', ?)",
+            (label, amount_due, 0, due_date, account, note or None)
         )
         conn.commit()
-        console.print(f"[green]✅ Debit added:[/green] {label} for ${amount_due:.2f}")
+        console.print(f"[green]✅ Debit added:[/green] {label} for ${money.fmt(amount_due)}")
 
 
 @app.command("pay-debit")
 def pay_debit(
     debit_id: int = typer.Argument(..., help="ID of the debit to pay"),
     account: str = typer.Argument(..., help="Account to deduct from"),
-    amount: float = typer.Option(None, help="Amount to pay (optional, defaults to full remaining)")
+    amount: int = typer.Option(None, parser=money.amount, help="Amount to pay (optional, defaults to full remaining)")
 ):
     """Make a payment toward a debit."""
     with get_db() as conn:
@@ -89,8 +80,7 @@ def pay_debit(
             raise typer.Exit(code=1)
 
         id_, label, due, paid = row
-        paid = paid or 0.0
-        remaining = due - paid
+        remaining = due - (paid or 0)
 
         if amount is None:
             amount = remaining
@@ -104,49 +94,46 @@ def pay_debit(
             c.execute("UPDATE debits SET status = 'paid' WHERE id = ?", (id_,))
 
         c.execute("UPDATE accounts SET balance = balance - ? WHERE name = ?", (amount, account))
+        post(conn, account, -amount, "expense", category="debit", description=label)
         conn.commit()
-        console.print(f"[green]✅ Paid ${amount:.2f} toward '{label}'. Remaining: ${remaining - amount:.2f}")
+        console.print(f"[green]✅ Paid ${money.fmt(amount)} toward '{label}'. Remaining: ${money.fmt(remaining - amount)}")
+
+
+def debits_query(show_all: bool = False, after: Optional[tuple] = None) -> tuple[str, tuple]:
+    """list-debits' SELECT and parameters (also checked by doctor, see utils/query_plan.py)."""
+    query = "SELECT id, label, amount_due, amount_paid, due_date, account, status FROM debits WHERE 1"
+    if not show_all:
+        query += " AND status = 'open'"
+    # undated debits sort first, as they always did with ORDER BY due_date
+    return keyset(query, after, "COALESCE(due_date, '')", descending=False)
 
 
 @app.command("list-debits")
 def list_debits(
-    show_all: bool = typer.Option(False, "--all", help="Show all debits, not just open ones")
+    show_all: bool = typer.Option(False, "--all", help="Show all debits, not just open ones"),
+    limit: int = typer.Option(None, min=1, help="Show at most N debits"),
+    after: str = typer.Option(None, help="Continue after this cursor (printed under a limited listing)"),
 ):
     """List all or only outstanding debits."""
-    with get_db() as conn:
-        c = conn.cursor()
-        if show_all:
-            c.execute("SELECT id, label, amount_due, amount_paid, due_date, account, status FROM debits ORDER BY due_date")
-        else:
-            c.execute("SELECT id, label, amount_due, amount_paid, due_date, account, status FROM debits WHERE status = 'open' ORDER BY due_date")
-
-        rows = c.fetchall()
-        if not rows:
-            console.print("[yellow]No debits found.[/yellow]")
-            raise typer.Exit()
-
-        table = Table(title="Debits")
-        table.add_column("ID", justify="right", style="cyan")
-        table.add_column("Label", style="magenta")
-        table.add_column("Due", style="green", justify="right")
-        table.add_column("Paid", style="yellow", justify="right")
-        table.add_column("Date", style="blue")
-        table.add_column("Account", style="white")
-        table.add_column("Status", style="bold")
-
-        for id_, label, due, paid, date, acct, status in rows:
-            paid = paid or 0.0
-            table.add_row(
-                str(id_),
-                label,
-                f"{currency}{due:.2f}",
-                f"{currency}{paid:.2f}",
-                date or "—",
-                acct or "—",
-                status
-            )
-
-        console.print(table)
+    currency = get_display_currency()
+    conn = get_db()
+    query, params = debits_query(show_all, parse_after(after))
+    if machine():
+        write_cursor("debit", conn.execute(query, params), (("amount_due", None), ("amount_paid", None)), limit)
+        return
+
+    listing = Listing(
+        "Debits",
+        [("ID", {"justify": "right", "style": "cyan"}), ("Label", {"style": "magenta"}),
+         ("Due", {"style": "green", "justify": "right"}), ("Paid", {"style": "yellow", "justify": "right"}),
+         ("Date", {"style": "blue"}), ("Account", {"style": "white"}), ("Status", {"style": "bold"})],
+        lambda r: [str(r[0]), r[1], f"{currency}{money.fmt(r[2])}", f"{currency}{money.fmt(r[3])}",
+                   r[4] or "—", r[5] or "—", r[6]],
+        lambda r: f"{r[4] or ''},{r[0]}",
+    )
+    if not stream(listing, conn.execute(query, params), console, limit):
+        console.print("[yellow]No debits found.[/yellow]")
+        raise typer.Exit()
 
 
 if __name__ == "__main__":
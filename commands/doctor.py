@@ -0,0 +1,105 @@
+import typer
+from rich.console import Console
+from rich.panel import Panel
+
+from utils import money, rollups, search
+from utils.db import connect, legacy_db_path, resolve_db_path
+from utils.helpers import get_db
+from utils.journal import verify_balances
+from utils.query_plan import check_hot_queries
+from utils.schema import (
+    SCHEMA_VERSION, TABLES, MigrationError, current_version, migrate, pending_migrations, table_columns,
+)
+
+console = Console()
+
+
+def doctor():
+    """Check the database and apply any pending schema migrations."""
+    console.print(Panel(f"Connected to database: [bold green]{resolve_db_path()}[/bold green]"))
+
+    # earlier versions split the data: income, expenses and todos went to the
+    # file beside the code, everything else to the database above
+    legacy = legacy_db_path()
+    if legacy:
+        console.print(f"[red]⚠ Found an older database at {legacy}[/]: earlier versions wrote income, expenses "
+                      f"and todos there and VaultPlan no longer reads it. Copy its rows into {resolve_db_path()} "
+                      f"(or point VAULTPLAN_DB at it), then move it out of {legacy.parent}.")
+        raise typer.Exit(code=1)
+
+    # a connection of our own: get_db() would run the migrations before we
+    # could report on them (the app callback skips them for doctor)
+    conn = connect()
+    try:
+        journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        console.print(f"Journal mode: {journal}")
+        version = current_version(conn)
+        console.print(f"Schema version: {version} (latest {SCHEMA_VERSION})")
+        pending = pending_migrations(conn)
+        if pending:
+            try:
+                migrate(conn)
+            except MigrationError as e:
+                if e.applied:
+                    console.print(f"[yellow]⏎ Applied migrations:[/] {', '.join(map(str, e.applied))}")
+                console.print(f"[red]⚠ Migration {e.version} failed:[/] {e.cause}")
+                raise typer.Exit(code=1)
+            console.print(f"[yellow]⏎ Applied migrations:[/] {', '.join(map(str, pending))}")
+        console.print(f"Amounts stored as integer minor units ({money.scale()} decimal places)")
+
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        console.print("Tables found:", tables)
+        for table, expected_cols in TABLES.items():
+            if table not in tables:
+                console.print(f"[red]Table not found:[/] {table}")
+                continue
+            existing_cols = table_columns(conn, table)
+            for col, _ in expected_cols:
+                if col not in existing_cols:
+                    console.print(f"[red]Missing column in {table}:[/] {col}")
+
+        # --- Query plans: every hot query should be served by an index ---
+        for query, plan, scans in check_hot_queries(conn):
+            if scans:
+                console.print(f"[red]✗ Full table scan[/] in {query.label}: {'; '.join(scans)}")
+            else:
+                console.print(f"[green]✓[/green] {query.label}: {'; '.join(plan)}")
+
+        # --- Balances: accounts.balance must equal the sum of its postings ---
+        mismatches = verify_balances(conn)
+        for name, stored, ledger in mismatches:
+            console.print(
+                f"[red]✗ Balance mismatch[/red] {name}: stored {money.fmt(stored)}, journal {money.fmt(ledger)}"
+            )
+        if not mismatches:
+            console.print("[green]✓[/green] Account balances match the journal")
+
+        # --- Rollups: journal_monthly must match a fresh GROUP BY of the journal ---
+        stale = rollups.verify(conn)
+        if stale:
+            console.print(f"[red]✗ Monthly rollups out of date[/red] ({len(stale)} groups); run `vaultplan rebuild-rollups`")
+        else:
+            console.print("[green]✓[/green] Monthly rollups match the journal")
+
+        # --- Search index: one entry per searchable row, text up to date ---
+        drift = search.verify(conn)
+        if drift:
+            console.print(f"[red]✗ Search index out of date[/red] ({drift} entries); run `vaultplan rebuild-search`")
+        else:
+            console.print("[green]✓[/green] Search index matches notes, journal and web3 transactions")
+    finally:
+        conn.close_for_real()
+
+
+def rebuild_rollups():
+    """Recompute the monthly journal rollups used by summary and export-summary."""
+    with get_db() as conn:
+        groups = rollups.rebuild(conn)
+    console.print(f"[green]✓[/green] Rebuilt monthly rollups: {groups} groups")
+
+
+def rebuild_search():
+    """Refill the full-text index used by `vaultplan search`."""
+    with get_db() as conn:
+        entries = search.rebuild(conn)
+    console.print(f"[green]✓[/green] Rebuilt search index: {entries} entries")
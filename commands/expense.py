@@ -1,32 +1,24 @@
 import typer
-from pathlib import Path
-import sqlite3
 from datetime import datetime
-from utils.helpers import ensure_data_dir
+from utils import money
+from utils.helpers import get_db
+from utils.journal import post
 import json
 
 app = typer.Typer()
 
-def get_db():
-    ensure_data_dir()
-    db_path = Path(__file__).parent.parent / "data" / "vaultplan.db"
-    conn = sqlite3.connect(db_path)
-    return conn
-
 @app.command()
 def add_expense(
-    amount: str = typer.Argument(..., help="Expense amount (supports $4.97 format)"),
+    amount: int = typer.Argument(..., parser=money.amount, help="Expense amount (supports $4.97 format)"),
     category: str = typer.Option("general", help="Expense category"),
     description: str = typer.Option("", help="Description"),
     account: str = typer.Option(..., help="Account name"),
-    metadata: str = typer.Option("[]", help="JSON array of items [item1, item2, ...]"),
+    metadata: str = typer.Option("[]", help='JSON array of items: ["item1", ...] or [{"item": "latte", "qty": 2, "price": 4.5}, ...]'),
     note: str = typer.Option("", help="Additional note about the expense"),
-    date: str = typer.Option(datetime.now().strftime("%Y-%m-%d"), help="Date (YYYY-MM-DD)")
+    date: str = typer.Option(None, help="Date (YYYY-MM-DD, default: today)")
 ):
     """Log an expense and update account balance."""
-    # Clean amount (remove $ and convert to float)
-    clean_amount = float(amount.replace('$', '').replace(',', ''))
-    
+    date = date or datetime.now().strftime("%Y-%m-%d")  # per run: the daemon outlives the day
     # Parse metadata
     try:
         items = json.loads(metadata)
@@ -36,40 +28,23 @@ def add_expense(
     conn = get_db()
     c = conn.cursor()
     
-    # Create tables if they don't exist
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS expenses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            amount REAL,
-            category TEXT,
-            description TEXT,
-            account TEXT,
-            date TEXT,
-            note TEXT,
-            metadata TEXT
-        )
-    """)
-    
     # Insert expense
-    c.execute(
-        """INSERT INTO expenses 
-           (amount, category, description, account, date, note, metadata) 
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-        (clean_amount, category, description, account, date, note, json.dumps(items))
-    )
+    post(conn, account, -amount, "expense", date, category=category, description=description,
+         note=note, metadata=json.dumps(items))
     
     # Update account balance
     c.execute(
         "UPDATE accounts SET balance = balance - ? WHERE name = ?",
-        (clean_amount, account)
+        (amount, account)
     )
     
     conn.commit()
     conn.close()
     
     # Format output
-    items_str = f" ({', '.join(items)})" if items else ""
+    names = [i.get("item", "?") if isinstance(i, dict) else str(i) for i in items] if isinstance(items, list) else []
+    items_str = f" ({', '.join(names)})" if names else ""
     note_str = f"\n📝 Note: {note}" if note else ""
     
-    typer.echo(f"🧾 Expense of ${clean_amount:.2f} logged to '{account}' ({category}: {description}){items_str}.{note_str}")
+    typer.echo(f"🧾 Expense of ${money.fmt(amount)} logged to '{account}' ({category}: {description}){items_str}.{note_str}")
     typer.echo("�� Balance updated.") 
\ No newline at end of file
@@ -1,43 +1,76 @@
-import json
+import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 import typer
+from utils import money
+from utils.export import FORMATS, Section, amounts_of, write_delta_export, write_export
 from utils.helpers import get_db
 
 app = typer.Typer()
 
-def fetch_rows(c, sql, params=()):
-    c.execute(sql, params)
-    return [dict(zip([col[0] for col in c.description], row)) for row in c.fetchall()]
+# export_<mode>_<YYYY-mm-ddTHH-MM-SS>.<format>[.gz], any format
+EXPORT_NAME = re.compile(r"export_[a-z]+_(\d{4}-\d{2}-\d{2})T(\d{2})-(\d{2})-(\d{2})\.")
 
-def compress_goals(goals):
-    for g in goals:
-        g["progress"] = round(float(g.get("current_amount", 0)) / float(g.get("target_amount", 1)), 4)
-    return goals
+# progress is computed by SQLite so rows can stream straight to the file
+GOALS_SQL = """
+    SELECT *, ROUND(CAST(COALESCE(saved_amount, 0) AS REAL) / COALESCE(NULLIF(target_amount, 0), 1), 4) AS progress
+    FROM goals
+"""
+DEBITS_SQL = """
+    SELECT *, ROUND(CAST(COALESCE(amount_paid, 0) AS REAL) / COALESCE(NULLIF(amount_due, 0), 1), 4) AS progress
+    FROM debits
+"""
+# the "recent" sections: rows from the cutoff date on
+INCOME_SQL = "SELECT * FROM income WHERE date >= ?"
+EXPENSES_SQL = "SELECT * FROM expenses WHERE date >= ?"
+# the outgoing leg of each transfer, in the expenses view's columns
+TRANSFERS_SQL = """
+    SELECT id, account, -amount AS amount, '__transfer__' AS category, description, date, note, metadata
+    FROM journal
+    WHERE kind = 'transfer' AND amount < 0 AND date >= ?
+"""
 
-def compress_debits(debits):
-    for d in debits:
-        d["progress"] = round(float(d.get("paid_amount", 0)) / float(d.get("amount", 1)), 4)
-    return debits
-
-def calc_balance(accounts):
-    return sum(float(a["balance"]) for a in accounts)
-
-def summarize_growth(income, expenses):
-    total_in = sum(float(i["amount"]) for i in income)
-    total_out = sum(float(e["amount"]) for e in expenses)
+def summarize_growth(c):
+    # all-time income and expenses from the monthly rollups, as `summary` counts them
+    # (transfers, adjustments and opening balances are not growth)
+    total_in, total_out = c.execute(
+        "SELECT COALESCE(SUM(total) FILTER (WHERE kind = 'income'), 0), "
+        "COALESCE(-SUM(total) FILTER (WHERE kind = 'expense'), 0) "
+        "FROM journal_monthly"
+    ).fetchone()
     net = total_in - total_out
-    return {"total_income": total_in, "total_expense": total_out, "net_growth": net}
+    return {
+        "period": "all-time",
+        "total_income": money.as_float(total_in),
+        "total_expense": money.as_float(total_out),
+        "net_growth": money.as_float(net),
+    }
+
+def last_export_time(output_path: Path) -> Optional[str]:
+    """Timestamp of the newest export in `output_path`, read from its file name."""
+    stamps = []
+    for f in output_path.glob("export_*"):
+        m = EXPORT_NAME.match(f.name)
+        if m:
+            day, hh, mm, ss = m.groups()
+            stamps.append(f"{day}T{hh}:{mm}:{ss}")
+    return max(stamps, default=None)
 
 @app.command("export-summary")
 def export_summary(
-    mode: str = typer.Option("weekly", help="Choose: full, weekly, last"),
-    output_dir: str = typer.Option("reports", help="Directory for output")
+    mode: str = typer.Option("weekly", help="Choose: full, weekly, last, delta (rows changed since the last delta export)"),
+    output_dir: str = typer.Option("reports", help="Directory for output"),
+    fmt: str = typer.Option("json", "--format", help=f"Output format: {', '.join(FORMATS)}"),
+    gzip_output: bool = typer.Option(False, "--gzip", help="Compress the output (.gz)"),
 ):
+    if fmt not in FORMATS:
+        typer.echo(f"Unknown format {fmt!r}; choose {', '.join(FORMATS)}")
+        raise typer.Exit(1)
     conn = get_db()
     c = conn.cursor()
     now = datetime.now()
-    today = now.strftime("%Y-%m-%d")
     output_path = Path.home() / "vaultplan" / output_dir
     output_path.mkdir(parents=True, exist_ok=True)
 
@@ -45,62 +78,64 @@ def export_summary(
     if mode == "weekly":
         date_cutoff = (now - timedelta(days=7)).strftime("%Y-%m-%d")
     elif mode == "last":
-        files = sorted(output_path.glob("export_*.json"), reverse=True)
-        last_date = None
-        if files:
-            with open(files[0]) as f:
-                last_export = json.load(f)
-                last_date = last_export.get("timestamp", today)
-        date_cutoff = last_date or (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        date_cutoff = last_export_time(output_path) or (now - timedelta(days=1)).strftime("%Y-%m-%d")
     elif mode == "full":
         date_cutoff = "2000-01-01"
+    elif mode == "delta":
+        date_cutoff = None  # change_log cursors, see utils/export.py
     else:
         typer.echo("[red]Invalid mode[/red]")
         raise typer.Exit(1)
 
-    # Fetch tables
-    accounts = fetch_rows(c, "SELECT * FROM accounts")
-    income = fetch_rows(c, "SELECT * FROM income WHERE date >= ?", (date_cutoff,))
-    expenses = fetch_rows(c, "SELECT * FROM expenses WHERE date >= ?", (date_cutoff,))
-    transfers = fetch_rows(c, "SELECT * FROM expenses WHERE (description LIKE '%transfer%' OR category LIKE '%transfer%') AND date >= ?", (date_cutoff,))
-    notes = fetch_rows(c, "SELECT * FROM notes WHERE created_at >= ?", (date_cutoff,))
-    goals = fetch_rows(c, "SELECT * FROM goals")
-    debits = fetch_rows(c, "SELECT * FROM debits")
-    
-    # Always include full goals/debits for AI continuity
-    goals = compress_goals(goals)
-    debits = compress_debits(debits)
-
-    # Balance calculations
-    current_balance = calc_balance(accounts)
-
-    # Net growth since start (for full, otherwise from cutoff)
-    all_income = fetch_rows(c, "SELECT * FROM income")
-    all_expenses = fetch_rows(c, "SELECT * FROM expenses")
-    growth = summarize_growth(all_income, all_expenses)
-
-    export = {
+    # Totals are aggregates; everything row-shaped streams in write_export
+    current_balance = c.execute("SELECT COALESCE(SUM(balance), 0) FROM accounts").fetchone()[0]
+    header = {
         "timestamp": now.isoformat(),
         "mode": mode,
-        "since": date_cutoff,
-        "accounts": [{k: a[k] for k in ("name", "type", "balance")} for a in accounts],
-        "current_balance": current_balance,
-        "growth": growth,
-        "goals": goals,
-        "debits": debits,
-        "recent": {
-            "income": income,
-            "expenses": expenses,
-            "transfers": transfers,
-            "notes": notes
-        }
+        "current_balance": money.as_float(current_balance),
     }
+    stem = output_path / f"export_{mode}_{now.strftime('%Y-%m-%dT%H-%M-%S')}"
+    if mode == "delta":
+        # work proportional to the changes: no whole-journal aggregates here
+        files, rows = write_delta_export(conn, stem, header, fmt, gzip_output)
+        typer.echo(f"[green]Export complete:[/green] {', '.join(str(f) for f in files)} ({rows} changed rows)")
+        return
+
+    # growth covers the whole history whatever the mode; the cutoff only limits the recent sections
+    header["growth"] = summarize_growth(c)
+    header["since"] = date_cutoff
+    since = (date_cutoff,)
+    sections = [
+        Section("accounts", "SELECT name, type, balance FROM accounts", amounts=amounts_of("accounts")),
+        # Always include full goals/debits for AI continuity
+        Section("goals", GOALS_SQL, amounts=amounts_of("goals")),
+        Section("debits", DEBITS_SQL, amounts=amounts_of("debits")),
+        Section("income", INCOME_SQL, since, amounts_of("income"), "recent"),
+        Section("expenses", EXPENSES_SQL, since, amounts_of("expenses"), "recent"),
+        Section("transfers", TRANSFERS_SQL, since, amounts_of("expenses"), "recent"),
+        Section("notes", "SELECT * FROM notes WHERE created_at >= ?", since, group="recent"),
+    ]
+
+    files, rows = write_export(conn, stem, header, sections, fmt, gzip_output)
 
-    filename = output_path / f"export_{mode}_{now.strftime('%Y-%m-%dT%H-%M-%S')}.json"
-    with open(filename, "w") as f:
-        json.dump(export, f, indent=2)
+    typer.echo(f"[green]Export complete:[/green] {', '.join(str(f) for f in files)} ({rows} rows)")
+
+@app.command("export-snapshot")
+def export_snapshot(
+    output_dir: str = typer.Option("reports", help="Directory for output"),
+):
+    """Write every table as memory-mappable NumPy columns (load with utils.columnar.load_snapshot)."""
+    try:
+        from utils.columnar import write_snapshot
+    except ImportError:
+        typer.echo("export-snapshot needs NumPy: pip install numpy")
+        raise typer.Exit(1)
 
-    typer.echo(f"[green]Export complete:[/green] {filename}")
+    started = time.perf_counter()
+    target = Path.home() / "vaultplan" / output_dir / f"snapshot_{datetime.now().strftime('%Y-%m-%dT%H-%M-%S')}"
+    counts = write_snapshot(get_db(), target)
+    elapsed = time.perf_counter() - started
+    typer.echo(f"Snapshot written: {target} ({sum(counts.values())} rows, {len(counts)} tables, {elapsed:.2f}s)")
 
 if __name__ == "__main__":
     app()
@@ -1,10 +1,18 @@
 
+import shlex
+
 import typer
-import subprocess
 
-def run_command(cmd):
-    print(f"\n[Running] {cmd}")
-    subprocess.run(f'python3 ~/vaultplan/vaultplan.py {cmd.replace("vaultplan ", "")}', shell=True)
+from commands import registry
+from utils.helpers import get_db
+
+def run_command(argv):
+    """Run a registered command in this process (no shell, no new interpreter)."""
+    print(f"\n[Running] vaultplan {shlex.join(argv)}")
+    registry.run(argv)
+    conn = get_db()
+    if conn.in_transaction:  # a failed command must not leak into the next one
+        conn.rollback()
 
 def wizard():
     typer.echo("\nVaultPlan Wizard Main Menu")
@@ -22,7 +30,7 @@ def wizard():
     choice = typer.prompt("Select", type=int)
 
     if choice == 1:
-        run_command("vaultplan balance")
+        run_command(["balance"])
     elif choice == 2:
         def account_menu():
             while True:
@@ -35,18 +43,18 @@ def wizard():
                 if choice == 1:
                     name = typer.prompt("Account Name")
                     acc_type = typer.prompt("Account Type (bank/wallet)", default="bank")
-                    balance = typer.prompt("Initial Balance", type=float, default=0.0)
+                    balance = typer.prompt("Initial Balance", default="0")
                     wallet = typer.prompt("ETH Wallet Address (optional)", default="")
-                    cmd = f'create-account "{name}" --type "{acc_type}" --balance {balance}'
+                    cmd = ["create-account", name, "--type", acc_type, "--balance", str(balance)]
                     if wallet:
-                        cmd += f' --wallet "{wallet}"'
+                        cmd += ["--wallet", wallet]
                     run_command(cmd)
         
                 elif choice == 2:
                     from_acc = typer.prompt("From Account")
                     to_acc = typer.prompt("To Account")
-                    amount = typer.prompt("Amount", type=float)
-                    cmd = f'transfer "{from_acc}" "{to_acc}" {amount}'
+                    amount = typer.prompt("Amount")
+                    cmd = ["transfer", from_acc, to_acc, str(amount)]
                     run_command(cmd)
         
                 elif choice == 0:
@@ -63,13 +71,13 @@ def wizard():
                 choice = typer.prompt("Select", type=int)
         
                 if choice == 1:
-                    amount = typer.prompt("Income Amount", type=float)
+                    amount = typer.prompt("Income Amount")
                     source = typer.prompt("Source/Label", default="unknown")
                     account = typer.prompt("Account")
                     date = typer.prompt("Date (YYYY-MM-DD, default today)", default="")
-                    cmd = f'add-income {amount} --source "{source}" --account "{account}"'
+                    cmd = ["add-income", str(amount), "--source", source, "--account", account]
                     if date:
-                        cmd += f' --date "{date}"'
+                        cmd += ["--date", date]
                     run_command(cmd)
         
                 elif choice == 0:
@@ -93,9 +101,10 @@ def wizard():
                     metadata = typer.prompt("Metadata (JSON array, optional)", default="[]")
                     note = typer.prompt("Note (optional)", default="")
                     date = typer.prompt("Date (YYYY-MM-DD, default today)", default="")
-                    cmd = f'add-expense "{amount}" --category "{category}" --description "{description}" --account "{account}" --metadata \'{metadata}\' --note "{note}"'
+                    cmd = ["add-expense", amount, "--category", category, "--description", description,
+                           "--account", account, "--metadata", metadata, "--note", note]
                     if date:
-                        cmd += f' --date "{date}"'
+                        cmd += ["--date", date]
                     run_command(cmd)
         
                 elif choice == 0:
@@ -123,34 +132,38 @@ def wizard():
                     priority = typer.prompt("Priority (1-5)", type=int, default=1)
                     deadline = typer.prompt("Deadline (YYYY-MM-DD, optional)", default="")
                     note = typer.prompt("Note (optional)", default="")
-                    cmd = f'set-goal "{title}" {target} --account "{account}" --priority {priority} --deadline "{deadline}" --note "{note}"'
+                    cmd = ["set-goal", title, str(target), "--priority", str(priority), "--note", note]
+                    if account:
+                        cmd += ["--account", account]
+                    if deadline:
+                        cmd += ["--deadline", deadline]
                     run_command(cmd)
     
                 elif choice == 2:
                     status = typer.prompt("Status (active/completed)", default="active")
                     account = typer.prompt("Filter by Account (optional)", default="")
-                    cmd = f'list-goals --status "{status}"'
+                    cmd = ["list-goals", "--status", status]
                     if account.strip():
-                        cmd += f' --account "{account}"'
+                        cmd += ["--account", account]
                     run_command(cmd)
     
                 elif choice == 3:
                     title = typer.prompt("Goal Title to Update")
-                    amount = typer.prompt("Amount to Add", type=float)
+                    amount = typer.prompt("Amount to Add")
                     account = typer.prompt("Source Account")
-                    cmd = f'update-goal "{title}" --amount {amount} --account "{account}"'
+                    cmd = ["update-goal", title, "--amount", str(amount), "--account", account]
                     run_command(cmd)
     
                 elif choice == 4:
                     title = typer.prompt("Goal Title to Mark as Completed")
-                    run_command(f'complete-goal "{title}"')
+                    run_command(["complete-goal", title])
     
                 elif choice == 5:
                     title = typer.prompt("Goal Title to Delete")
-                    run_command(f'delete-goal "{title}"')
+                    run_command(["delete-goal", title])
     
                 elif choice == 6:
-                    run_command("goal-history")
+                    run_command(["goal-history"])
     
                 elif choice == 0:
                     break
@@ -171,30 +184,31 @@ def wizard():
         
                 if choice == 1:
                     label = typer.prompt("Debit Label")
-                    amount = typer.prompt("Amount", type=float)
+                    amount = typer.prompt("Amount")
                     account = typer.prompt("Account")
                     due_date = typer.prompt("Due Date (YYYY-MM-DD, optional)", default="")
                     note = typer.prompt("Note (optional)", default="")
-                    cmd = f'add-debit "{label}" {amount} "{account}"'
+                    cmd = ["add-debit", label, str(amount), "--account", account]
                     if due_date:
-                        cmd += f' --due-date "{due_date}"'
+                        cmd += ["--due-date", due_date]
                     if note:
-                        cmd += f' --note "{note}"'
+                        cmd += ["--note", note]
                     run_command(cmd)
         
                 elif choice == 2:
-                    label = typer.prompt("Debit Label")
-                    amount = typer.prompt("Payment Amount", type=float)
+                    debit_id = typer.prompt("Debit ID", type=int)
                     account = typer.prompt("Account to Pay From")
-                    cmd = f'pay-debit "{label}" {amount} --account "{account}"'
+                    amount = typer.prompt("Payment Amount (blank = full remaining)", default="")
+                    cmd = ["pay-debit", str(debit_id), account]
+                    if amount:
+                        cmd += ["--amount", amount]
                     run_command(cmd)
         
                 elif choice == 3:
-                    account = typer.prompt("Filter by Account (optional)", default="")
-                    status = typer.prompt("Status (pending/paid)", default="pending")
-                    cmd = f'list-debits --status "{status}"'
-                    if account.strip():
-                        cmd += f' --account "{account}"'
+                    show_all = typer.confirm("Include paid debits?", default=False)
+                    cmd = ["list-debits"]
+                    if show_all:
+                        cmd.append("--all")
                     run_command(cmd)
         
                 elif choice == 0:
@@ -216,19 +230,19 @@ def wizard():
                     content = typer.prompt("Note Text")
                     account = typer.prompt("Account (optional)", default="")
                     tags = typer.prompt("Tags (JSON array, optional)", default="[]")
-                    cmd = f'add-note {mood} "{content}"'
+                    cmd = ["add-note", str(mood), content]
                     if account:
-                        cmd += f' --account "{account}"'
+                        cmd += ["--account", account]
                     if tags:
-                        cmd += f" --tags '{tags}'"
+                        cmd += ["--tags", tags]
                     run_command(cmd)
         
                 elif choice == 2:
                     account = typer.prompt("Filter by Account (optional)", default="")
                     days = typer.prompt("Days to Look Back", type=int, default=7)
-                    cmd = f'list-notes --days {days}'
+                    cmd = ["list-notes", "--days", str(days)]
                     if account.strip():
-                        cmd += f' --account "{account}"'
+                        cmd += ["--account", account]
                     run_command(cmd)
         
                 elif choice == 0:
@@ -264,16 +278,12 @@ def wizard():
         
                 if choice == 1:
                     days = typer.prompt("Days to Summarize", type=int, default=30)
-                    account = typer.prompt("Account (optional)", default="")
-                    cmd = f'summary --days {days}'
-                    if account.strip():
-                        cmd += f' --account "{account}"'
-                    run_command(cmd)
+                    run_command(["summary", "--days", str(days)])
         
                 elif choice == 2:
                     days = typer.prompt("Days to Include", type=int, default=30)
                     directory = typer.prompt("Export Directory (default: reports)", default="reports")
-                    cmd = f'summary-export --days {days} --output-dir "{directory}"'
+                    cmd = ["summary-export", "--days", str(days), "--output-dir", directory]
                     run_command(cmd)
         
                 elif choice == 0:
@@ -291,7 +301,7 @@ def wizard():
                 if choice == 1:
                     days = typer.prompt("Days to Include", type=int, default=30)
                     directory = typer.prompt("Export Directory (default: reports)", default="reports")
-                    cmd = f'summary-export --days {days} --output-dir "{directory}"'
+                    cmd = ["summary-export", "--days", str(days), "--output-dir", directory]
                     run_command(cmd)
                 elif choice == 0:
                     break
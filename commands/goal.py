@@ -15,18 +15,33 @@ from __future__ import annotations
 
 import sqlite3
 from datetime import datetime
+from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
+from utils import money
 from utils.helpers import get_db
+from utils.listing import Listing, keyset, parse_after, stream
+from utils.output import console, machine, write_cursor
+from utils.journal import post
 
-from utils.config import get_display_currency  # if not already
-currency = get_display_currency()
+from utils.config import get_display_currency
 
 app = typer.Typer()
-console = Console()
+
+# shared with doctor's query plan check (utils/query_plan.py)
+GOAL_SQL = "SELECT saved_amount, target_amount FROM goals WHERE name = ?"
+
+
+def goals_query(status: str, account: Optional[str] = None, after: Optional[tuple] = None) -> tuple[str, tuple]:
+    """list-goals' SELECT and parameters."""
+    query = "SELECT name, target_amount, saved_amount, deadline, priority, note, id FROM goals WHERE status = ?"
+    params: tuple = (status,)
+    if account:
+        query += " AND account = ?"
+        params += (account,)
+    query, cursor_params = keyset(query, after, "id", descending=False)
+    return query, params + cursor_params
 
 # ---------------------------------------------------------------------------
 # Commands
@@ -35,7 +50,7 @@ console = Console()
 @app.command("set-goal")
 def set_goal(
     name: str = typer.Argument(..., help="Name of the goal"),
-    target_amount: float = typer.Argument(..., help="Target amount to save"),
+    target_amount: int = typer.Argument(..., parser=money.amount, help="Target amount to save"),
     deadline: str = typer.Option(None, help="Deadline (YYYY-MM-DD), optional"),
     account: str = typer.Option("Goals", help="Account name for savings transfer"),
     priority: int = typer.Option(3, min=1, max=5, help="Goal priority (1-5)"),
@@ -51,38 +66,23 @@ def set_goal(
 
     with get_db() as conn:
         c = conn.cursor()
-        c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                target_amount REAL,
-                saved_amount REAL DEFAULT 0.0,
-                deadline TEXT,
-                account TEXT,
-                priority INTEGER DEFAULT 3,
-                note TEXT,
-                status TEXT DEFAULT 'active'
-            )
-            """
-        )
         c.execute("INSERT INTO goals (name, target_amount, deadline, account, priority, note) VALUES (?, ?, ?, ?, ?, ?)",
                   (name, target_amount, deadline, account, priority, note))
         conn.commit()
-        console.print(f"[green]✅ Goal created:[/green] {name} → ${target_amount:.2f}")
+        console.print(f"[green]✅ Goal created:[/green] {name} → ${money.fmt(target_amount)}")
 
 
 @app.command("update-goal")
 def update_goal(
     name: str = typer.Argument(..., help="Goal name"),
-    amount: float = typer.Option(..., help="Amount to add to goal"),
+    amount: int = typer.Option(..., parser=money.amount, help="Amount to add to goal"),
     account: str = typer.Option(..., help="Account to deduct from")
 ):
     """Transfer funds from account toward a goal."""
     with get_db() as conn:
         c = conn.cursor()
 
-        c.execute("SELECT saved_amount, target_amount FROM goals WHERE name = ?", (name,))
+        c.execute(GOAL_SQL, (name,))
         row = c.fetchone()
         if not row:
             console.print("[red]❌ Goal not found.[/red]")
@@ -90,8 +90,7 @@ def update_goal(
 
 
         saved, target = row
-        saved = saved or 0.0
-        remaining = target - saved
+        remaining = target - (saved or 0)
 
         if amount <= 0 or amount > remaining:
             console.print("[red]❌ Invalid amount. Must be positive and <= remaining.[/red]")
@@ -110,56 +109,53 @@ def update_goal(
 
         c.execute("UPDATE goals SET saved_amount = saved_amount + ? WHERE name = ?", (amount, name))
         c.execute("UPDATE accounts SET balance = balance - ? WHERE name = ?", (amount, account))
+        post(conn, account, -amount, "transfer", description=f"Transfer to goal {name}")
         conn.commit()
-        console.print(f"[green]✅ Added ${amount:.2f} to '{name}'[/green]")
+        console.print(f"[green]✅ Added ${money.fmt(amount)} to '{name}'[/green]")
 
 
 @app.command("list-goals")
 def list_goals(
     status: str = typer.Option("active", help="Goal status to filter by (active/completed)"),
-    account: str = typer.Option(None, help="Optional account filter")
+    account: str = typer.Option(None, help="Optional account filter"),
+    limit: int = typer.Option(None, min=1, help="Show at most N goals"),
+    after: str = typer.Option(None, help="Continue after this goal id (printed under a limited listing)"),
 ):
     """List goals by status and optional account."""
-    with get_db() as conn:
-        c = conn.cursor()
-
-        query = "SELECT name, target_amount, saved_amount, deadline, priority, note FROM goals WHERE status = ?"
-        params = [status]
-
-        if account:
-            query += " AND account = ?"
-            params.append(account)
-
-        c.execute(query, tuple(params))
-        rows = c.fetchall()
-
-        if not rows:
-            console.print("[yellow]No goals found.[/yellow]")
-            raise typer.Exit()
-
-        table = Table(title=f"Goals ({status.title()})")
-        table.add_column("Name", style="cyan")
-        table.add_column("Target", style="magenta", justify="right")
-        table.add_column("Saved", style="green", justify="right")
-        table.add_column("%", style="yellow", justify="right")
-        table.add_column("Deadline", style="blue")
-        table.add_column("Priority", justify="center")
-        table.add_column("Note", style="dim")
-
-        for name, target, saved, deadline, priority, note in rows:
-            saved = saved or 0.0
-            pct = f"{(saved / target) * 100:.0f}%" if target else "—"
-            table.add_row(
-                name,
-                f"{currency}{target:.2f}",
-                f"{currency}{saved:.2f}",
-                pct,
-                deadline or "—",
-                str(priority),
-                note or "—"
-            )
-
-        console.print(table)
+    currency = get_display_currency()
+    conn = get_db()
+
+    query, params = goals_query(status, account, parse_after(after, numeric=True))
+    if machine():
+        cur = conn.execute(query, params)
+        write_cursor("goal", cur, (("target_amount", None), ("saved_amount", None)), limit)
+        return
+
+    def cells(row):
+        name, target, saved, deadline, priority, note, _ = row
+        saved = saved or 0
+        pct = f"{(saved / target) * 100:.0f}%" if target else "—"
+        return [
+            name,
+            f"{currency}{money.fmt(target)}",
+            f"{currency}{money.fmt(saved)}",
+            pct,
+            deadline or "—",
+            str(priority),
+            note or "—"
+        ]
+
+    listing = Listing(
+        f"Goals ({status.title()})",
+        [("Name", {"style": "cyan"}), ("Target", {"style": "magenta", "justify": "right"}),
+         ("Saved", {"style": "green", "justify": "right"}), ("%", {"style": "yellow", "justify": "right"}),
+         ("Deadline", {"style": "blue"}), ("Priority", {"justify": "center"}), ("Note", {"style": "dim"})],
+        cells,
+        lambda row: str(row[6]),
+    )
+    if not stream(listing, conn.execute(query, params), console, limit):
+        console.print("[yellow]No goals found.[/yellow]")
+        raise typer.Exit()
 
 
 @app.command("complete-goal")
@@ -185,6 +181,7 @@ def delete_goal(name: str):
 @app.command("goal-history")
 def goal_history():
     """View all completed goals."""
+    currency = get_display_currency()
     with get_db() as conn:
         c = conn.cursor()
         c.execute("SELECT name, target_amount, saved_amount, deadline, priority, note FROM goals WHERE status = 'completed'")
@@ -194,6 +191,8 @@ def goal_history():
             console.print("[yellow]No completed goals.[/yellow]")
             raise typer.Exit()
 
+        from rich.table import Table
+
         table = Table(title="Completed Goals")
         table.add_column("Name", style="cyan")
         table.add_column("Target", style="magenta", justify="right")
@@ -203,11 +202,10 @@ def goal_history():
         table.add_column("Note", style="dim")
 
         for name, target, saved, deadline, priority, note in rows:
-            saved = saved or 0.0
             table.add_row(
                 name,
-                f"{currency}{target:.2f}",
-                f"{currency}{saved:.2f}",
+                f"{currency}{money.fmt(target)}",
+                f"{currency}{money.fmt(saved)}",
                 deadline or "—",
                 str(priority),
                 note or "—"
@@ -1,44 +1,27 @@
 import typer
-from pathlib import Path
-import sqlite3
 from datetime import datetime
-from utils.helpers import ensure_data_dir
+from utils import money
+from utils.helpers import get_db
+from utils.journal import post
 
 app = typer.Typer()
 
-def get_db():
-    ensure_data_dir()
-    db_path = Path(__file__).parent.parent / "data" / "vaultplan.db"
-    conn = sqlite3.connect(db_path)
-    return conn
-
 @app.command()
 def add_income(
-    amount: float = typer.Argument(..., help="Income amount"),
+    amount: int = typer.Argument(..., parser=money.amount, help="Income amount"),
     source: str = typer.Option("", help="Income source"),
     account: str = typer.Option(..., help="Account name"),
-    date: str = typer.Option(datetime.now().strftime("%Y-%m-%d"), help="Date (YYYY-MM-DD)")
+    date: str = typer.Option(None, help="Date (YYYY-MM-DD, default: today)")
 ):
     """Log new income (amount, source, date) and update account balance."""
+    date = date or datetime.now().strftime("%Y-%m-%d")  # per run: the daemon outlives the day
     conn = get_db()
     c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS income (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            amount REAL,
-            source TEXT,
-            account TEXT,
-            date TEXT
-        )
-    """)
-    c.execute(
-        "INSERT INTO income (amount, source, account, date) VALUES (?, ?, ?, ?)",
-        (amount, source, account, date)
-    )
+    post(conn, account, amount, "income", date, description=source)
     c.execute(
         "UPDATE accounts SET balance = balance + ? WHERE name = ?",
         (amount, account)
     )
     conn.commit()
     conn.close()
-    typer.echo(f"💰 Logged {amount} income to '{account}' from '{source}'. Balance updated. Streak begun.") 
\ No newline at end of file
+    typer.echo(f"💰 Logged {money.fmt(amount)} income to '{account}' from '{source}'. Balance updated. Streak begun.") 
\ No newline at end of file
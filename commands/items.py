@@ -0,0 +1,87 @@
+"""VaultPlan expense item commands
+-----------------------------------------------------------------
+• item-totals — purchases, quantity and spend per expense item over a
+                date range, optionally only items matching --item
+• top-items   — the N items with the most spend (or purchases, qty)
+
+Both aggregate the expense_items table in SQL (see utils/items.py).
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import typer
+
+from utils import money
+from utils.config import get_display_currency
+from utils.helpers import check_date, get_db
+from utils.items import ORDERS, totals
+from utils.output import console, machine, write_cursor
+
+
+def _period(since: Optional[str], until: Optional[str]) -> str:
+    if since and until:
+        return f"{since} – {until}"
+    if since or until:
+        return f"since {since}" if since else f"until {until}"
+    return "all time"
+
+
+def _print(title: str, rows: list[tuple], show_total: bool) -> None:
+    from rich.table import Table
+
+    currency = get_display_currency()
+    table = Table(title=title, show_footer=show_total)
+    spent = sum(row[3] or 0 for row in rows)
+    table.add_column("Item", style="cyan", footer="Total")
+    table.add_column("Purchases", justify="right")
+    table.add_column("Qty", justify="right")
+    table.add_column("Spent", style="green", justify="right", footer=f"{currency}{money.fmt(spent)}")
+    table.add_column("Last bought", style="blue")
+    for item, purchases, qty, amount, last in rows:
+        table.add_row(item, str(purchases), f"{qty:g}", f"{currency}{money.fmt(amount)}", last or "—")
+    console.print(table)
+
+
+def item_totals(
+    item: Optional[List[str]] = typer.Option(None, "--item", help="Only items whose name contains this (repeatable)"),
+    category: Optional[str] = typer.Option(None, help="Only expenses in this category"),
+    since: Optional[str] = typer.Option(None, help="First day (YYYY-MM-DD)"),
+    until: Optional[str] = typer.Option(None, help="Last day (YYYY-MM-DD)"),
+):
+    """Show purchases, quantity and spend per expense item."""
+    check_date(since, "--since")
+    check_date(until, "--until")
+    cur = totals(get_db(), since, until, category, item or ())
+    if machine():
+        write_cursor("item", cur, (("spent", None),))
+        return
+    rows = cur.fetchall()
+    if not rows:
+        console.print("[yellow]No expense items found.[/yellow]")
+        raise typer.Exit()
+    _print(f"Expense items ({_period(since, until)})", rows, show_total=True)
+
+
+def top_items(
+    limit: int = typer.Option(10, min=1, help="Number of items"),
+    by: str = typer.Option("spent", help=f"Rank by {', '.join(ORDERS)}"),
+    category: Optional[str] = typer.Option(None, help="Only expenses in this category"),
+    since: Optional[str] = typer.Option(None, help="First day (YYYY-MM-DD)"),
+    until: Optional[str] = typer.Option(None, help="Last day (YYYY-MM-DD)"),
+):
+    """Show the items you spend the most on."""
+    if by not in ORDERS:
+        raise typer.BadParameter(f"{by!r} is not one of {', '.join(ORDERS)}", param_hint="--by")
+    check_date(since, "--since")
+    check_date(until, "--until")
+    cur = totals(get_db(), since, until, category, order=by, limit=limit)
+    if machine():
+        write_cursor("item", cur, (("spent", None),))
+        return
+    rows = cur.fetchall()
+    if not rows:
+        console.print("[yellow]No expense items found.[/yellow]")
+        raise typer.Exit()
+    _print(f"Top {limit} items by {by} ({_period(since, until)})", rows, show_total=False)
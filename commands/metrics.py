@@ -0,0 +1,62 @@
+"""VaultPlan metrics command
+-----------------------------------------------------------------
+• metrics — latency percentiles and failures per command and per web3
+            HTTP call, from the `metrics` table (see utils/metrics.py);
+            --prom writes a node_exporter textfile-collector file
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from utils.helpers import get_db
+from utils.metrics import summarize, write_prom
+from utils.output import console, machine, write_rows
+
+
+def _ms(seconds: float) -> str:
+    ms = seconds * 1000
+    return f"{ms:.1f}" if ms < 10 else f"{ms:.0f}"
+
+
+def metrics(
+    days: int = typer.Option(7, min=1, help="Window to summarize, in days"),
+    prom: Optional[Path] = typer.Option(None, "--prom", help="Also write Prometheus textfile metrics to this .prom file"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="No table (e.g. cron refreshing --prom)"),
+):
+    """Show p50/p95/p99 latency and failures per command and HTTP call."""
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+    summaries = summarize(get_db(), since)
+    window = f"{days} day{'s' if days != 1 else ''}"
+
+    if prom:
+        write_prom(prom, summaries, window)
+    if quiet:
+        return
+    if machine():
+        write_rows("metrics", ("kind", "name", "runs", "failures", "p50", "p95", "p99", "max", "total",
+                               "avg_rows", "last_at"), summaries)
+        return
+    if not summaries:
+        console.print(f"[yellow]No runs recorded in the last {window}.[/yellow]")
+    else:
+        from rich.table import Table
+
+        table = Table(title=f"Latency (ms) over the last {window}")
+        table.add_column("Command / call", style="cyan", no_wrap=True)
+        for header in ("Runs", "Fail", "p50", "p95", "p99", "Max", "Rows"):
+            table.add_column(header, justify="right")
+        for s in summaries:
+            table.add_row(
+                s.name if s.kind == "command" else f"[magenta]{s.kind}:[/magenta] {s.name}", str(s.runs),
+                f"[red]{s.failures}[/red]" if s.failures else "0",
+                *(_ms(v) for v in (s.p50, s.p95, s.p99, s.max)),
+                "—" if s.avg_rows is None else f"{s.avg_rows:.0f}",
+            )
+        console.print(table)
+    if prom:
+        console.print(f"[green]✓[/green] Prometheus metrics written to {prom}")
@@ -2,24 +2,55 @@
 -----------------------------------------------------------------
 Core responsibilities:
 • add-note    — log mood, emotional tone, and optional tags/account
-• list-notes  — filter notes by account and date range
+• list-notes  — filter notes by account, date range and tags
+• note-tags   — how often each tag is used (from the note_tags index)
 
 Uses consistent DB connection from utils.helpers.get_db().
 """
 
 from __future__ import annotations
 
+import json
 import sqlite3
 from datetime import datetime, timedelta
+from typing import List, Optional
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
 
 from utils.helpers import get_db
+from utils.listing import Listing, keyset, parse_after, stream
+from utils.output import console, machine, write_cursor
 
 app = typer.Typer()
-console = Console()
+
+
+def notes_query(since: str, account: Optional[str] = None, tags: Optional[List[str]] = None,
+                any_tag: bool = False, after: Optional[tuple] = None) -> tuple[str, tuple]:
+    """list-notes' SELECT and parameters (also checked by doctor, see utils/query_plan.py)."""
+    query = "SELECT mood, note, account, tags, created_at, id FROM notes WHERE created_at >= ?"
+    params: tuple = (since,)
+    if account:
+        query += " AND account = ?"
+        params += (account,)
+    if tags:
+        wanted = sorted({t.strip().lower() for t in tags})
+        query += f" AND id IN (SELECT note_id FROM note_tags WHERE tag IN ({', '.join('?' * len(wanted))})"
+        query += ")" if any_tag or len(wanted) == 1 else " GROUP BY note_id HAVING COUNT(*) = ?)"
+        params += (*wanted,) if any_tag or len(wanted) == 1 else (*wanted, len(wanted))
+    query, cursor_params = keyset(query, after, "created_at")
+    return query, params + cursor_params
+
+
+def tags_query(since: Optional[str] = None) -> tuple[str, tuple]:
+    """note-tags' SELECT and parameters: every note, or those created since `since`."""
+    if since is None:
+        query = "SELECT tag, COUNT(*) AS notes FROM note_tags GROUP BY tag"
+        params: tuple = ()
+    else:
+        query = ("SELECT t.tag, COUNT(*) AS notes FROM notes n JOIN note_tags t ON t.note_id = n.id "
+                 "WHERE n.created_at >= ? GROUP BY t.tag")
+        params = (since,)
+    return query + " ORDER BY notes DESC, tag", params
 
 # ---------------------------------------------------------------------------
 # Commands
@@ -36,21 +67,17 @@ def add_note(
     if not 1 <= mood <= 10:
         console.print("[red]❌ Mood rating must be between 1 and 10.[/red]")
         raise typer.Exit()
+    try:
+        parsed = json.loads(tags)
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, list) or not all(isinstance(tag, str) for tag in parsed):
+        console.print('[red]❌ Tags must be a JSON array of strings, e.g. \'["work", "win"]\'.[/red]')
+        raise typer.Exit(code=1)
 
     with get_db() as conn:
         c = conn.cursor()
 
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                mood INTEGER,
-                note TEXT,
-                account TEXT,
-                tags TEXT,
-                created_at TEXT
-            )
-        """)
-
         created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         c.execute("""
             INSERT INTO notes (mood, note, account, tags, created_at)
@@ -67,39 +94,29 @@ def add_note(
 @app.command("list-notes")
 def list_notes(
     account: str = typer.Option(None, help="Filter by account"),
-    days: int = typer.Option(7, help="Show notes from last N days")
+    days: int = typer.Option(7, help="Show notes from last N days"),
+    limit: int = typer.Option(None, min=1, help="Show at most N notes"),
+    after: str = typer.Option(None, help="Continue after this cursor (printed under a limited listing)"),
+    tag: Optional[List[str]] = typer.Option(None, "--tag", help="Only notes with this tag (repeatable)"),
+    any_tag: bool = typer.Option(False, "--any", help="With several --tag: notes with any of them, not all"),
 ):
-    """List recent notes filtered by date or account."""
-    with get_db() as conn:
-        c = conn.cursor()
+    """List recent notes filtered by date, account or tags."""
+    conn = get_db()
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    since = start_date.strftime("%Y-%m-%d")
+
+    query, params = notes_query(since, account, tag, any_tag, parse_after(after))
+    if machine():
+        write_cursor("note", conn.execute(query, params), limit=limit)
+        return
 
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        since = start_date.strftime("%Y-%m-%d")
-
-        if account:
-            c.execute("""
-                SELECT mood, note, account, tags, created_at
-                FROM notes
-                WHERE account = ? AND created_at >= ?
-                ORDER BY created_at DESC
-            """, (account, since))
-        else:
-            c.execute("""
-                SELECT mood, note, account, tags, created_at
-                FROM notes
-                WHERE created_at >= ?
-                ORDER BY created_at DESC
-            """, (since,))
-
-        rows = c.fetchall()
-
-        if not rows:
-            console.print("[yellow]No notes found.[/yellow]")
-            raise typer.Exit()
-
-        for mood, content, acct, tags, created_at in rows:
-            panel = f'''
+    def render(row):
+        from rich.panel import Panel
+
+        mood, content, acct, tags, created_at, _ = row
+        panel = f'''
 [bold]Mood:[/bold] {'😊' * mood} ({mood}/10)
 [bold]Time:[/bold] {created_at}
 [bold]Account:[/bold] {acct or '—'}
@@ -107,7 +124,39 @@ def list_notes(
 
 {content}
 '''
-            console.print(Panel(panel.strip(), border_style="cyan"))
+        return Panel(panel.strip(), border_style="cyan")
+
+    listing = Listing("Notes", [], None, lambda row: f"{row[4]},{row[5]}", render)
+    if not stream(listing, conn.execute(query, params), console, limit):
+        console.print("[yellow]No notes found.[/yellow]")
+        raise typer.Exit()
+
+
+@app.command("note-tags")
+def note_tags(
+    days: int = typer.Option(None, min=1, help="Only count notes from the last N days (default: all)"),
+    limit: int = typer.Option(None, min=1, help="Show at most N tags"),
+):
+    """Show how many notes carry each tag, most used first."""
+    conn = get_db()
+    since = None if days is None else (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    cur = conn.execute(*tags_query(since))
+    if machine():
+        write_cursor("tag", cur, limit=limit)
+        return
+
+    rows = cur.fetchmany(limit) if limit else cur.fetchall()
+    if not rows:
+        console.print("[yellow]No tagged notes found.[/yellow]")
+        raise typer.Exit()
+    from rich.table import Table
+
+    table = Table(title="Note tags" if days is None else f"Note tags (last {days} days)")
+    table.add_column("Tag", style="cyan")
+    table.add_column("Notes", justify="right")
+    for name, count in rows:
+        table.add_row(name, str(count))
+    console.print(table)
 
 
 if __name__ == "__main__":
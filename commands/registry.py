@@ -0,0 +1,275 @@
+"""VaultPlan command registry
+-----------------------------------------------------------------
+Maps every CLI command name to the module that implements it, so an
+invocation only imports the code for the command it actually runs.
+
+• COMMANDS     — top-level commands, in --help order
+• GROUPS       — Typer sub-apps mounted as command groups (todo, coins)
+• build_app()  — Typer app with just the commands argv needs
+• run()        — execute one argv in-process and return its exit code
+                 (inside a utils/profiling.py Session under --profile)
+
+Importing this module is cheap (typer is only imported by build_app) so
+the daemon client in utils/daemon.py can use requested_command() before
+deciding whether to load anything at all.
+
+`vaultplan --help` (or an unknown command) still registers everything so
+the help screen and error messages are unchanged.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    import typer
+
+APP_HELP = "VaultPlan - Your personal finance command center"
+
+# command name -> (module, attribute)
+COMMANDS: dict[str, tuple[str, str]] = {
+    "create-account": ("commands.account", "create_account"),
+    "add-income": ("commands.income", "add_income"),
+    "transfer": ("commands.account", "transfer_funds"),
+    "add-expense": ("commands.expense", "add_expense"),
+    "item-totals": ("commands.items", "item_totals"),
+    "top-items": ("commands.items", "top_items"),
+    "set-goal": ("commands.goal", "set_goal"),
+    "list-goals": ("commands.goal", "list_goals"),
+    "update-goal": ("commands.goal", "update_goal"),
+    "delete-goal": ("commands.goal", "delete_goal"),
+    "complete-goal": ("commands.goal", "complete_goal"),
+    "goal-history": ("commands.goal", "goal_history"),
+    "add-debit": ("commands.debit", "add_debit"),
+    "pay-debit": ("commands.debit", "pay_debit"),
+    "list-debits": ("commands.debit", "list_debits"),
+    "balance": ("commands.balance", "show_balance"),
+    "summary": ("commands.summary", "show_summary"),
+    "summary-export": ("commands.summary", "summary_export"),
+    "add-note": ("commands.note", "add_note"),
+    "list-notes": ("commands.note", "list_notes"),
+    "note-tags": ("commands.note", "note_tags"),
+    "web3-sync": ("Web3.web3_sync", "web3_sync"),
+    "summary-web3": ("commands.summary_web3", "summary_web3"),
+    "export-summary": ("commands.export_summaries", "export_summary"),
+    "export-snapshot": ("commands.export_summaries", "export_snapshot"),
+    "doctor": ("commands.doctor", "doctor"),
+    "rebuild-rollups": ("commands.doctor", "rebuild_rollups"),
+    "rebuild-search": ("commands.doctor", "rebuild_search"),
+    "search": ("commands.search", "search"),
+    "metrics": ("commands.metrics", "metrics"),
+    "serve": ("commands.serve", "serve"),
+    "wizard": ("commands.wizard", "wizard"),
+    "batch": ("commands.batch", "batch"),
+    "import": ("commands.statement_import", "import_statement"),
+}
+
+# group name -> (module, attribute of the Typer sub-app)
+GROUPS: dict[str, tuple[str, str]] = {
+    "todo": ("commands.todo", "todo_app"),
+    "coins": ("commands.coins", "app"),
+}
+
+# commands that open the vault before it is migrated (doctor applies the
+# migrations itself so it can report one that fails)
+UNMIGRATED = {"doctor"}
+
+
+def _load(target: tuple[str, str]):
+    module, attr = target
+    return getattr(importlib.import_module(module), attr)
+
+
+# global options that take a value (`--format json balance`)
+VALUE_OPTIONS = ("--format", "--profile-out")
+
+
+def requested_command(argv: Sequence[str]) -> Optional[str]:
+    """Return the command name argv is asking for (first non-option token)."""
+    tokens = iter(argv)
+    for token in tokens:
+        if token in VALUE_OPTIONS:
+            next(tokens, None)
+        elif not token.startswith("-"):
+            return token
+    return None
+
+
+def global_options(argv: Sequence[str]) -> list[str]:
+    """The tokens before the command name (options of the app itself)."""
+    wanted = requested_command(argv)
+    return list(argv) if wanted is None else list(argv[: list(argv).index(wanted)])
+
+
+def profile_requested(argv: Sequence[str]) -> Optional[str]:
+    """None unless argv asks for --profile; else the --profile-out path ("" for none)."""
+    head = global_options(argv)
+    dump = ""
+    for i, token in enumerate(head):
+        if token == "--profile-out" and i + 1 < len(head):
+            dump = head[i + 1]
+        elif token.startswith("--profile-out="):
+            dump = token.split("=", 1)[1]
+    if dump or "--profile" in head:
+        return dump
+    return None
+
+
+_prepared = False
+
+
+def _prepare() -> None:
+    # runs once a subcommand has been resolved, never for bare --help;
+    # a long-lived process (vaultplan serve) only pays for it once
+    global _prepared
+    if _prepared:
+        return
+    from utils.db_init import init_tables
+
+    init_tables()
+    _prepared = True
+
+
+def build_app(argv: Sequence[str] = ()) -> typer.Typer:
+    """Build the Typer app, importing only the command(s) argv refers to."""
+    import typer
+
+    from utils.output import FORMATS, set_format
+
+    app = typer.Typer(help=APP_HELP)
+    wanted = requested_command(argv)
+
+    # an explicit callback keeps Typer in group mode even with one command
+    @app.callback()
+    def main(
+        output_format: str = typer.Option(
+            "table", "--format", metavar="FORMAT",
+            help=f"Output of read commands: {', '.join(FORMATS)} (json/csv/tsv skip rich rendering)",
+        ),
+        profile: bool = typer.Option(
+            False, "--profile", help="Report time per phase and the slowest SQL statements and functions (stderr)",
+        ),
+        profile_out: Optional[str] = typer.Option(
+            None, "--profile-out", metavar="FILE", help="With --profile: also write the cProfile data to FILE",
+        ),
+    ):
+        set_format(output_format)  # every run, so `serve` and `batch` never inherit it
+        if wanted in UNMIGRATED:
+            return
+        if profile or profile_out:
+            from utils import profiling
+
+            profiling.mark("prepare")
+            _prepare()
+            profiling.mark("command")
+        else:
+            _prepare()
+
+    if wanted in COMMANDS:
+        commands, groups = [wanted], []
+    elif wanted in GROUPS:
+        commands, groups = [], [wanted]
+    else:
+        commands, groups = list(COMMANDS), list(GROUPS)
+
+    for name in commands:
+        fn: Callable = _load(COMMANDS[name])
+        app.command(name)(fn)
+    for name in groups:
+        app.add_typer(_load(GROUPS[name]), name=name)
+    return app
+
+
+# Long-lived callers (serve, batch, wizard) run the same commands over and
+# over: keep the built app and, from the second run on, the click command
+# Typer would otherwise rebuild from the function signatures every call.
+_apps: dict[Optional[str], "typer.Typer"] = {}
+_click_commands: dict = {}
+
+
+def command_name(argv: Sequence[str]) -> str:
+    """`balance`, or `todo add` for a command group (the name metrics are kept under)."""
+    wanted = requested_command(argv)
+    if wanted is None:
+        return "(none)"
+    if wanted in GROUPS:
+        rest = list(argv)[list(argv).index(wanted) + 1:]
+        sub = next((token for token in rest if not token.startswith("-")), None)
+        if sub:
+            return f"{wanted} {sub}"
+    return wanted
+
+
+def run(argv: Sequence[str]) -> int:
+    """Execute one CLI invocation in-process and return its exit code."""
+    dump = profile_requested(argv)
+    if dump is None:
+        return _measured(argv)
+    from utils import profiling
+
+    profiling.start(list(argv))
+    try:
+        return _measured(argv)
+    finally:
+        profiling.stop(dump or None)
+
+
+_depth = 0  # run() calls in progress (fullwizard and batch run commands from inside a command)
+
+
+def _measured(argv: Sequence[str]) -> int:
+    global _depth
+    from utils import metrics
+
+    start, before, code = time.perf_counter(), metrics.changes(), 1
+    _depth += 1
+    try:
+        code = _run(argv)
+        return code
+    finally:
+        _depth -= 1
+        if _depth == 0:
+            _drop_unfinished()
+        metrics.record_command(command_name(argv), time.perf_counter() - start, code,
+                               metrics.changes() - before)
+
+
+def _drop_unfinished() -> None:
+    # a transaction still open once the command is done was abandoned (it
+    # raised, or never committed): exiting would roll it back, so do it now,
+    # before the metrics row is written and before `serve` takes its next request
+    from utils.db import shared_connection
+
+    conn = shared_connection()
+    if conn is not None and conn.in_transaction and not conn.held:
+        conn.rollback()
+
+
+def _run(argv: Sequence[str]) -> int:
+    from utils.schema import MigrationError
+
+    wanted = requested_command(argv)
+    key = wanted if wanted in COMMANDS or wanted in GROUPS else None
+    command = _click_commands.get(key)
+    if command is None and key in _apps:
+        from typer.main import get_command
+
+        command = _click_commands[key] = get_command(_apps[key])
+    try:
+        if command is not None:
+            command.main(args=list(argv), prog_name="vaultplan")
+        else:
+            app = _apps[key] = build_app(argv)
+            app(args=list(argv), prog_name="vaultplan")
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        return exc.code if isinstance(exc.code, int) else 1
+    except MigrationError as exc:
+        # the vault cannot be brought up to date; doctor reports the same failure in full
+        print(f"⚠ {exc}; run `vaultplan doctor`", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,73 @@
+"""VaultPlan search command
+-----------------------------------------------------------------
+• search — full-text search over notes, journal descriptions/notes and
+           web3 transactions, best matches first with the matching
+           words highlighted (see utils/search.py)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List, Optional
+
+import typer
+
+from utils.helpers import check_date, get_db
+from utils.output import console, machine, write_cursor
+from utils.search import match_expression, query
+
+_MARKS = ("\x02", "\x03")  # around matched words; replaced after escaping rich markup
+
+
+def _highlight(snippet: str) -> str:
+    from rich.markup import escape
+
+    return escape(snippet).replace(_MARKS[0], "[bold yellow]").replace(_MARKS[1], "[/bold yellow]")
+
+
+def search(
+    words: List[str] = typer.Argument(..., help="Words to find (all must match; end a word with * for a prefix)"),
+    since: Optional[str] = typer.Option(None, help="Only entries on or after this date (YYYY-MM-DD)"),
+    until: Optional[str] = typer.Option(None, help="Only entries on or before this date (YYYY-MM-DD)"),
+    account: Optional[str] = typer.Option(None, help="Only entries of this account"),
+    kind: Optional[List[str]] = typer.Option(
+        None, "--kind", help="note, web3 or a journal kind (expense, income, transfer, ...); repeatable"
+    ),
+    limit: int = typer.Option(20, min=1, help="Show at most N matches"),
+    fts: bool = typer.Option(False, "--fts", help="WORDS are an FTS5 query (OR, NOT, NEAR, \"phrases\")"),
+):
+    """Find notes, postings and web3 transactions by their text."""
+    text = " ".join(words)
+    check_date(since, "--since")
+    check_date(until, "--until")
+    expression = text if fts else match_expression(text)
+    if not expression:
+        raise typer.BadParameter("nothing to search for", param_hint="WORDS")
+
+    conn = get_db()
+    try:
+        if machine():
+            write_cursor("match", query(conn, expression, since, until, account, kind or (), limit))
+            return
+        rows = query(conn, expression, since, until, account, kind or (), limit, _MARKS).fetchall()
+    except sqlite3.OperationalError as e:
+        console.print(f"[red]Invalid search query:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    from rich.markup import escape
+
+    if not rows:
+        console.print(f"[yellow]No matches for {escape(repr(text))}.[/yellow]", highlight=False)
+        raise typer.Exit()
+
+    from rich.table import Table
+
+    table = Table(title=f"Matches for {escape(repr(text))}")
+    table.add_column("Date", style="blue", no_wrap=True)
+    table.add_column("Kind", style="magenta")
+    table.add_column("ID", style="cyan", justify="right")
+    table.add_column("Account", style="green")
+    table.add_column("Text")
+    for kind_, ref, date, acct, snippet, _ in rows:
+        table.add_row((date or "—")[:16], kind_, str(ref), acct or "—", _highlight(snippet))
+    console.print(table)
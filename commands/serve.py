@@ -0,0 +1,117 @@
+"""VaultPlan daemon (`vaultplan serve`)
+-----------------------------------------------------------------
+Keeps one Python process alive with every command module imported and
+the schema already checked, and runs the argv that the thin client in
+utils/daemon.py forwards over a Unix socket.
+
+Requests are handled one at a time, so commands never race each other
+on the SQLite file. Output is captured per request and shipped back to
+the client together with the exit code. A request for another vault
+(a different VAULTPLAN_DB on the client) is sent back to run in the
+client's own process, and nothing is ever paged here: the daemon's
+stdout is its log, not the client's terminal.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import signal
+import socket
+import socketserver
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+import typer
+from rich.console import Console
+
+from commands import registry
+from utils.daemon import LOCAL_ONLY, SOCKET_PATH, db_key, read_message, send_message
+from utils.db import get_connection, resolve_db_path
+
+console = Console()
+
+
+class _Capture(io.StringIO):
+    """StringIO that reports the client's terminal state to rich/typer."""
+
+    def __init__(self, tty: bool):
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        return self._tty
+
+
+def execute(request: dict) -> dict:
+    """Run one forwarded argv in this process and capture its output."""
+    argv = request.get("argv", [])
+    if registry.requested_command(argv) in LOCAL_ONLY:
+        return {"stdout": "", "stderr": "This command cannot run inside the daemon.\n", "code": 2}
+    ours = db_key(resolve_db_path())
+    if request.get("db", ours) != ours:
+        return {"other_db": ours}
+
+    tty = bool(request.get("tty"))
+    out, err = _Capture(tty), _Capture(tty)
+    here = os.getcwd()
+    try:
+        os.chdir(request.get("cwd") or here)
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                code = registry.run(argv)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        os.chdir(here)
+        conn = get_connection()
+        if conn.in_transaction:  # a failed command must not leak into the next request
+            conn.rollback()
+    return {"stdout": out.getvalue(), "stderr": err.getvalue(), "code": code}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        request = read_message(self.request)
+        if request is not None:
+            send_message(self.request, execute(request))
+
+
+def _daemon_alive() -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(str(SOCKET_PATH))
+        return True
+    except OSError:
+        return False
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve():
+    """Keep VaultPlan warm and run commands forwarded by the CLI."""
+    if SOCKET_PATH.exists():
+        if _daemon_alive():
+            console.print(f"[red]A VaultPlan daemon is already running on[/red] {SOCKET_PATH}")
+            raise typer.Exit(code=1)
+        SOCKET_PATH.unlink()  # left behind by a daemon that was killed
+
+    os.environ["VAULTPLAN_PAGER"] = ""  # utils/listing.py would start `less` on the daemon's own stdout
+    registry.build_app()  # import every command module up front
+    registry._prepare()  # opens the shared connection and checks the schema
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    server = socketserver.UnixStreamServer(str(SOCKET_PATH), _Handler)
+    os.chmod(SOCKET_PATH, 0o600)
+    signal.signal(signal.SIGTERM, _stop)
+    console.print(f"[green]✓[/green] VaultPlan daemon listening on {SOCKET_PATH} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[yellow]Daemon stopped.[/yellow]")
+    finally:
+        server.server_close()
+        SOCKET_PATH.unlink(missing_ok=True)
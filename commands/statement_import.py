@@ -0,0 +1,425 @@
+"""VaultPlan statement import
+-----------------------------------------------------------------
+`vaultplan import <file|-> --account Bank` loads a bank statement
+(CSV, OFX or QIF) in one streaming pass:
+
+    parse → normalize → dedupe → classify → insert
+
+Each stage is a generator, so a 100k-line statement never sits in
+memory. Rows go into the journal with executemany() in chunks inside a
+single transaction, and the account balance is updated once at the end.
+
+Every row carries a content hash (account, date, amount, description,
+the bank's transaction id if any, and how many identical rows came
+before it in the file). journal.import_hash is UNIQUE, so importing an
+overlapping statement again only adds the rows that are new.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import re
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import typer
+from rich.console import Console
+
+from utils import money
+from utils.helpers import get_db
+
+app = typer.Typer()
+console = Console()
+
+CHUNK_SIZE = 5000
+FORMATS = ("csv", "ofx", "qif")
+# candidates when --date-format is not given; the statement's dates pick one (see normalize)
+DATE_FORMATS = ("%Y-%m-%d", "%Y%m%d", "%d/%m/%Y", "%d/%m/%y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y")
+MAX_REPORTED_ERRORS = 10
+
+# CSV header aliases (compared lower-cased)
+DATE_COLUMNS = ("date", "transaction date", "posted date", "posting date", "value date")
+AMOUNT_COLUMNS = ("amount", "transaction amount")
+DEBIT_COLUMNS = ("debit", "withdrawal", "withdrawals", "money out", "paid out")
+CREDIT_COLUMNS = ("credit", "deposit", "deposits", "money in", "paid in")
+DESCRIPTION_COLUMNS = ("description", "payee", "narrative", "details", "transaction details", "memo", "name")
+CATEGORY_COLUMNS = ("category",)
+ID_COLUMNS = ("id", "transaction id", "fitid", "reference")
+
+
+class RawRow(NamedTuple):
+    line: int
+    date: str
+    amount: str  # signed; unused when the statement has debit/credit columns
+    description: str
+    category: Optional[str] = None
+    memo: Optional[str] = None
+    bank_id: Optional[str] = None
+    debit: Optional[str] = None  # money out, as written (None: no such column)
+    credit: Optional[str] = None  # money in, as written
+
+
+class Txn(NamedTuple):
+    date: str  # YYYY-MM-DD
+    amount: int  # signed minor units
+    description: str
+    category: Optional[str]
+    memo: Optional[str]
+    bank_id: Optional[str]
+
+
+class RowError(ValueError):
+    """A row that cannot be imported (reported, then skipped)."""
+
+
+# ---------------------------------------------------------------------------
+# parse: one generator per format, all yielding RawRow
+# ---------------------------------------------------------------------------
+
+def _pick(header: dict[str, str], names: tuple[str, ...]) -> Optional[str]:
+    for name in names:
+        if name in header:
+            return header[name]
+    return None
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[RawRow]:
+    reader = csv.DictReader(lines)
+    header = {name.strip().lower(): name for name in reader.fieldnames or ()}
+    date_col = _pick(header, DATE_COLUMNS)
+    amount_col = _pick(header, AMOUNT_COLUMNS)
+    debit_col = _pick(header, DEBIT_COLUMNS)
+    credit_col = _pick(header, CREDIT_COLUMNS)
+    desc_col = _pick(header, DESCRIPTION_COLUMNS)
+    if date_col is None or (amount_col is None and debit_col is None and credit_col is None):
+        raise typer.BadParameter(f"CSV needs a date and an amount (or debit/credit) column, got {reader.fieldnames}")
+    category_col = _pick(header, CATEGORY_COLUMNS)
+    id_col = _pick(header, ID_COLUMNS)
+
+    for row in reader:
+        yield RawRow(
+            line=reader.line_num,
+            date=row.get(date_col) or "",
+            amount=(row.get(amount_col) or "") if amount_col else "",
+            description=(row.get(desc_col) or "") if desc_col else "",
+            category=row.get(category_col) if category_col else None,
+            bank_id=row.get(id_col) if id_col else None,
+            debit=None if amount_col or not debit_col else row.get(debit_col) or "",
+            credit=None if amount_col or not credit_col else row.get(credit_col) or "",
+        )
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def parse_ofx(lines: Iterable[str]) -> Iterator[RawRow]:
+    # OFX 1.x is SGML without closing tags, 2.x is XML; reading <TAG>value
+    # pairs line by line handles both without building a document tree
+    txn: Optional[dict[str, str]] = None
+    start = 0
+    for lineno, line in enumerate(lines, 1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not closing:
+                    txn, start = {}, lineno
+                elif txn is not None:
+                    yield RawRow(
+                        line=start,
+                        date=txn.get("DTPOSTED", "")[:8],
+                        amount=txn.get("TRNAMT", ""),
+                        description=txn.get("NAME") or txn.get("PAYEE") or txn.get("MEMO", ""),
+                        memo=txn.get("MEMO") if txn.get("NAME") else None,
+                        bank_id=txn.get("FITID"),
+                    )
+                    txn = None
+            elif txn is not None and not closing and value.strip():
+                txn[tag] = value.strip()
+
+
+def _qif_date(text: str) -> str:
+    # Quicken writes years from 2000 on as 1/31'26
+    text = text.replace(" ", "")
+    if "'" in text:
+        day_month, year = text.split("'", 1)
+        text = f"{day_month}/{2000 + int(year or 0)}" if year.isdigit() else text
+    return text
+
+
+def parse_qif(lines: Iterable[str]) -> Iterator[RawRow]:
+    record: dict[str, str] = {}
+    start = 0
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        code, value = line[0], line[1:].strip()
+        if code == "^":
+            if record:
+                yield RawRow(
+                    line=start,
+                    date=_qif_date(record.get("D", "")),
+                    amount=record.get("T") or record.get("U", ""),
+                    description=record.get("P") or record.get("M", ""),
+                    category=record.get("L"),
+                    memo=record.get("M") if record.get("P") else None,
+                    bank_id=record.get("N"),
+                )
+            record = {}
+            continue
+        if not record:
+            start = lineno
+        record.setdefault(code, value)
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qif": parse_qif}
+
+
+# ---------------------------------------------------------------------------
+# normalize → dedupe → classify
+# ---------------------------------------------------------------------------
+
+def _parse_date(text: str, fmt: str) -> Optional[str]:
+    try:
+        return datetime.strptime(text.strip(), fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _side(text: Optional[str]) -> int:
+    # one of a debit/credit pair: empty (or 0.00) means nothing moved that way
+    text = (text or "").strip()
+    return abs(_parse_amount(text)) if text else 0
+
+
+def _row_amount(row: RawRow) -> int:
+    if row.debit is None and row.credit is None:
+        return _parse_amount(row.amount)
+    debit, credit = _side(row.debit), _side(row.credit)
+    if debit and credit:
+        raise RowError(f"both debit {row.debit.strip()!r} and credit {row.credit.strip()!r} are set")
+    if not debit and not credit:
+        raise RowError("no debit or credit amount")
+    return credit - debit
+
+
+def _txn(row: RawRow, date: Optional[str]) -> Txn:
+    if date is None:
+        raise RowError(f"unrecognised date {row.date.strip()!r}")
+    return Txn(
+        date=date,
+        amount=_row_amount(row),
+        description=" ".join(row.description.split()),
+        category=(row.category or "").strip() or None,
+        memo=(row.memo or "").strip() or None,
+        bank_id=(row.bank_id or "").strip() or None,
+    )
+
+
+def _parse_amount(text: str) -> int:
+    text = text.strip()
+    negative = text.startswith("(") and text.endswith(")")  # accounting style
+    if negative:
+        text = text[1:-1]
+    try:
+        units = money.amount(text)
+    except (ValueError, typer.BadParameter):
+        raise RowError(f"unrecognised amount {text!r}") from None
+    return -units if negative else units
+
+
+def normalize(rows: Iterable[RawRow], date_format: Optional[str], errors: list[str]) -> Iterator[Txn]:
+    """Rows → Txn, with one date format for the whole statement.
+
+    Without --date-format, rows are held back while more than one of
+    DATE_FORMATS fits every date so far (03/04/2024 is both %d/%m/%Y and
+    %m/%d/%Y); the first date only one of them fits (13/04/2024) settles
+    it and the rest stream. A statement that never settles it is refused
+    unless the remaining formats read every date the same.
+    """
+    formats = [date_format] if date_format else list(DATE_FORMATS)
+    pending: list[tuple[RawRow, dict[str, Optional[str]]]] = []
+
+    def emit(row: RawRow, date: Optional[str]) -> Iterator[Txn]:
+        try:
+            yield _txn(row, date)
+        except RowError as err:
+            errors.append(f"line {row.line}: {err}")
+
+    for row in rows:
+        if len(formats) == 1:
+            yield from emit(row, _parse_date(row.date, formats[0]))
+            continue
+        dates = {fmt: _parse_date(row.date, fmt) for fmt in formats}
+        fits = [fmt for fmt in formats if dates[fmt] is not None]
+        if not fits:
+            yield from emit(row, None)
+            continue
+        formats = fits
+        pending.append((row, dates))
+        if len(formats) == 1:
+            for held, held_dates in pending:
+                yield from emit(held, held_dates[formats[0]])
+            pending = []
+
+    if pending:
+        differ = [row for row, dates in pending if len({dates[fmt] for fmt in formats}) > 1]
+        if differ:
+            raise typer.BadParameter(
+                f"dates such as {differ[0].date.strip()!r} fit {' and '.join(formats)}; "
+                "pass the statement's format, e.g. --date-format %d/%m/%Y",
+                param_hint="--date-format",
+            )
+        for held, held_dates in pending:
+            yield from emit(held, held_dates[formats[0]])
+
+
+def with_hashes(txns: Iterable[Txn], account: str) -> Iterator[tuple[Txn, str]]:
+    """Pair every row with its import hash.
+
+    Two identical rows in one statement (same coffee, same day) are both
+    real; the occurrence counter keeps their hashes apart while staying
+    stable across re-imports of the same file.
+    """
+    seen: dict[tuple, int] = {}
+    for txn in txns:
+        key = (account, txn.date, txn.amount, txn.description, txn.bank_id)
+        seen[key] = occurrence = seen.get(key, 0) + 1
+        digest = hashlib.sha1("\x1f".join(map(str, (*key, occurrence))).encode("utf-8")).hexdigest()
+        yield txn, digest
+
+
+def _known_categories(conn) -> dict[str, str]:
+    """Latest category used per description, to file imports like past entries."""
+    rows = conn.execute(
+        """
+        SELECT lower(description), category FROM journal
+        WHERE kind = 'expense' AND category IS NOT NULL AND description IS NOT NULL
+        ORDER BY date
+        """
+    )
+    return {desc: category for desc, category in rows}
+
+
+def classify(hashed: Iterable[tuple[Txn, str]], account: str, known: dict[str, str],
+             default_category: str) -> Iterator[tuple]:
+    """→ journal rows (account, amount, date, kind, category, description, note, import_hash)."""
+    for txn, digest in hashed:
+        if txn.amount >= 0:
+            kind, category = "income", None
+        else:
+            kind = "expense"
+            category = txn.category or known.get(txn.description.lower()) or default_category
+        yield (account, txn.amount, txn.date, kind, category, txn.description, txn.memo, digest)
+
+
+# ---------------------------------------------------------------------------
+# insert
+# ---------------------------------------------------------------------------
+
+INSERT_SQL = (
+    "INSERT OR IGNORE INTO journal "
+    "(account, amount, date, kind, category, description, note, import_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def import_rows(conn, rows: Iterable[tuple], account: str) -> tuple[int, int]:
+    """Insert journal rows in chunks. Returns (seen, inserted); the caller commits."""
+    first_new = conn.execute("SELECT COALESCE(MAX(id), 0) FROM journal").fetchone()[0]
+    seen = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        conn.executemany(INSERT_SQL, chunk)
+        seen += len(chunk)
+
+    # one balance update for everything that was actually new
+    inserted, delta = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(amount), 0) FROM journal WHERE id > ? AND account = ?",
+        (first_new, account),
+    ).fetchone()
+    if delta:
+        conn.execute("UPDATE accounts SET balance = balance + ? WHERE name = ?", (delta, account))
+    return seen, inserted
+
+
+def _open(source: str):
+    if source == "-":
+        return nullcontext(sys.stdin)  # not ours to close
+    return open(source, encoding="utf-8-sig", newline="")
+
+
+def _detect_format(source: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt.lower()
+    suffix = Path(source).suffix.lower().lstrip(".")
+    if suffix == "qfx":
+        return "ofx"
+    if suffix in FORMATS:
+        return suffix
+    raise typer.BadParameter("cannot tell the statement format; pass --format csv|ofx|qif")
+
+
+# ---------------------------------------------------------------------------
+# Command
+# ---------------------------------------------------------------------------
+
+@app.command("import")
+def import_statement(
+    source: str = typer.Argument(..., help="Statement file (CSV, OFX/QFX or QIF), or '-' for stdin"),
+    account: str = typer.Option(..., help="Account the statement belongs to"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="csv | ofx | qif (default: from the file extension)"),
+    date_format: Optional[str] = typer.Option(None, help="strptime format of the date column, e.g. %d/%m/%Y"),
+    category: str = typer.Option("uncategorized", help="Category for expenses no earlier entry explains"),
+):
+    """Import a bank statement in one transaction, skipping rows imported before."""
+    fmt = _detect_format(source, fmt)
+    if fmt not in PARSERS:
+        raise typer.BadParameter(f"unknown format {fmt!r}; use csv, ofx or qif")
+
+    conn = get_db()
+    if conn.execute("SELECT 1 FROM accounts WHERE name = ?", (account,)).fetchone() is None:
+        console.print(f"[red]❌ Account '{account}' does not exist.[/red]")
+        raise typer.Exit(code=1)
+
+    errors: list[str] = []
+    started = time.perf_counter()
+    try:
+        with _open(source) as lines:
+            rows = classify(
+                with_hashes(normalize(PARSERS[fmt](lines), date_format, errors), account),
+                account,
+                _known_categories(conn),
+                category,
+            )
+            seen, inserted = import_rows(conn, rows, account)
+        conn.commit()
+    except OSError as err:
+        conn.rollback()
+        console.print(f"[red]Cannot read statement:[/red] {err}")
+        raise typer.Exit(code=1)
+    except Exception:
+        conn.rollback()
+        raise
+    elapsed = time.perf_counter() - started
+
+    for message in errors[:MAX_REPORTED_ERRORS]:
+        console.print(f"[yellow]↷ Skipped {message}[/yellow]")
+    if len(errors) > MAX_REPORTED_ERRORS:
+        console.print(f"[yellow]↷ … and {len(errors) - MAX_REPORTED_ERRORS} more unreadable rows[/yellow]")
+
+    rate = seen / elapsed if elapsed > 0 else 0.0
+    console.print(
+        f"[green]✅ Imported {inserted} rows into '{account}'[/green] "
+        f"({seen - inserted} already present, {len(errors)} unreadable) "
+        f"in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+    )
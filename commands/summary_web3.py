@@ -1,22 +1,36 @@
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.columns import Columns
 from utils.helpers import get_token_prices, get_db
 from utils.config import get_display_currency
-currency = get_display_currency()
+from utils.output import console, machine, write_cursor
+from utils import money
+
+RECENT_SQL = """
+    SELECT date, type, symbol, amount_token, value_fiat
+    FROM web3_transactions
+    ORDER BY date DESC
+    LIMIT 5
+"""
 
 def summary_web3():
-    console = Console()
+    currency = get_display_currency()
     conn = get_db()
     c = conn.cursor()
 
+    if machine():
+        c.execute("SELECT type, COUNT(*) AS count, SUM(value_fiat) AS total_fiat FROM web3_transactions GROUP BY type")
+        write_cursor("web3_totals", c, (("total_fiat", None),))
+        write_cursor("recent", conn.execute(RECENT_SQL), (("amount_token", money.TOKEN_SCALE), ("value_fiat", None)))
+        return
+
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.table import Table
+
     # ── aggregate web3_transactions by type ──
     c.execute("""
         SELECT type,
                COUNT(*) AS cnt,
-               SUM(value_aud) FILTER(WHERE type='income')  AS total_in_aud,
-               SUM(value_aud) FILTER(WHERE type='expense') AS total_out_aud
+               SUM(value_fiat) FILTER(WHERE type='income')  AS total_in,
+               SUM(value_fiat) FILTER(WHERE type='expense') AS total_out
         FROM web3_transactions
         GROUP BY type
     """)
@@ -31,19 +45,14 @@ def summary_web3():
     summary_table.add_column("Type", justify="left")
     summary_table.add_column("Count", justify="right")
     summary_table.add_column("AUD Total", justify="right")
-    summary_table.add_row("ETH In (income)",  str(income["count"]),  f"{currency}{income['sum_in']:.2f}")
-    summary_table.add_row("ETH Out (expense)", str(expense["count"]), f"{currency}{expense['sum_out']:.2f}")
+    summary_table.add_row("ETH In (income)",  str(income["count"]),  f"{currency}{money.fmt(income['sum_in'])}")
+    summary_table.add_row("ETH Out (expense)", str(expense["count"]), f"{currency}{money.fmt(expense['sum_out'])}")
     summary_table.add_row("Swaps (any token)", str(swap["count"]),    "—")
 
     summary_panel = Panel(summary_table, title="VaultPlan Web3 Summary", padding=(1, 2))
 
     # ── Latest 5 transactions preview ──
-    c.execute("""
-        SELECT date, type, symbol, amount_token, value_aud
-        FROM web3_transactions
-        ORDER BY date DESC
-        LIMIT 5
-    """)
+    c.execute(RECENT_SQL)
     recent = c.fetchall()
     preview_table = Table(show_header=True, header_style="bold magenta")
     preview_table.add_column("Date", justify="left")
@@ -52,7 +61,7 @@ def summary_web3():
     preview_table.add_column("Token Amount", justify="right")
     preview_table.add_column("AUD Value", justify="right")
     for date, ttype, sym, amt, val in recent:
-        preview_table.add_row(date, ttype, sym, f"{amt:.8f}", f"{currency}{val:.2f}")
+        preview_table.add_row(date, ttype, sym, money.fmt(amt, money.TOKEN_SCALE, grouping=False), f"{currency}{money.fmt(val)}")
 
     preview_panel = Panel(preview_table, title="Latest 5 Transactions", padding=(1, 2))
 
@@ -1,6 +1,5 @@
 import typer
-import sqlite3
-from utils.db_init import DB_PATH
+from utils.helpers import get_db
 from rich.console import Console
 from rich.table import Table
 
@@ -9,14 +8,13 @@ todo_app = typer.Typer()
 
 @todo_app.command("add")
 def add_todo(task: str):
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("CREATE TABLE IF NOT EXISTS todos (id INTEGER PRIMARY KEY, task TEXT, completed INTEGER DEFAULT 0)")
+    with get_db() as conn:
         conn.execute("INSERT INTO todos (task) VALUES (?)", (task,))
     console.print(f"[green]✓ Added:[/] {task}")
 
 @todo_app.command("list")
 def list_todos():
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db() as conn:
         c = conn.cursor()
         c.execute("SELECT id, task FROM todos WHERE completed = 0")
         rows = c.fetchall()
@@ -32,7 +30,7 @@ def list_todos():
 
 @todo_app.command("done")
 def complete_todo(todo_id: int):
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db() as conn:
         c = conn.cursor()
         c.execute("SELECT id FROM todos WHERE id = ? AND completed = 0", (todo_id,))
         row = c.fetchone()
@@ -44,7 +42,7 @@ def complete_todo(todo_id: int):
 
 @todo_app.command("delete")
 def delete_todo(todo_id: int):
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db() as conn:
         c = conn.cursor()
         c.execute("SELECT id FROM todos WHERE id = ?", (todo_id,))
         row = c.fetchone()
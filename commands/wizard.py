@@ -2,6 +2,7 @@ import typer
 from commands import fullwizard  # This prevents auto-execution
 
 def wizard():
+    """Interactive menu for every VaultPlan action."""
     while True:
         typer.echo("\nVaultPlan Launcher")
         typer.echo("1. Menu")
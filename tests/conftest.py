@@ -0,0 +1,30 @@
+"""Shared fixtures: a fresh vault per test, wired into the process-wide state."""
+import pytest
+
+from utils import config, db, money
+
+
+@pytest.fixture
+def vault_path(tmp_path, monkeypatch):
+    """Where get_connection() (and money.scale()) will open the vault; nothing is created yet.
+
+    config.json is replaced by an empty one, so the test runs on the defaults
+    (two decimal places) whatever the checkout's config says.
+    """
+    monkeypatch.setenv("VAULTPLAN_DB", str(tmp_path / "vault.db"))
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.json")
+    monkeypatch.setattr(db, "_db_path", None)
+    monkeypatch.setattr(money, "_scale", None)
+    config.invalidate_config()
+    yield tmp_path / "vault.db"
+    db.close_connection()
+    config.invalidate_config()
+
+
+@pytest.fixture
+def vault(vault_path):
+    """A migrated vault at vault_path with a 'Bank' account."""
+    conn = db.get_connection()
+    conn.execute("INSERT INTO accounts (name, type, balance) VALUES ('Bank', 'bank', 0)")
+    conn.commit()
+    return conn
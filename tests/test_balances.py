@@ -0,0 +1,66 @@
+"""Balance checkpoints and `balance --as-of`."""
+import json
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from commands.registry import run
+from utils.balances import add_opening_checkpoint, balance_as_of, refresh_checkpoints
+from utils.journal import post
+
+
+def _brute(conn, account, day):
+    opening = conn.execute("SELECT balance FROM balance_checkpoints WHERE account = ? AND as_of = '0000-00-00'",
+                           (account,)).fetchone()
+    return (opening[0] if opening else 0) + conn.execute(
+        "SELECT COALESCE(SUM(amount), 0) FROM journal WHERE account = ? AND date <= ?", (account, day)
+    ).fetchone()[0]
+
+
+def _days(start, n):
+    return [(start + timedelta(days=i)).isoformat() for i in range(n)]
+
+
+@pytest.fixture
+def ledger(vault):
+    add_opening_checkpoint(vault, "Bank", 10000)
+    rng = random.Random(7)
+    for day in _days(date(2026, 1, 1), 120)[::3]:
+        post(vault, "Bank", rng.randint(-5000, 5000), "expense", day)
+    vault.commit()
+    return vault
+
+
+def test_as_of_matches_the_journal_after_checkpoints_are_added(ledger):
+    assert refresh_checkpoints(ledger, today=date(2026, 4, 10)) == 3
+    assert [r[0] for r in ledger.execute("SELECT as_of FROM balance_checkpoints ORDER BY as_of")] == [
+        "0000-00-00", "2026-01-31", "2026-02-28", "2026-03-31",
+    ]
+    assert refresh_checkpoints(ledger, today=date(2026, 4, 10)) == 0
+    for day in _days(date(2025, 12, 30), 130):
+        assert balance_as_of(ledger, "Bank", day) == _brute(ledger, "Bank", day), day
+
+
+def test_backdated_edits_move_the_checkpoints(ledger):
+    refresh_checkpoints(ledger, today=date(2026, 4, 10))
+    post(ledger, "Bank", -700, "expense", "2026-01-15")
+    first = ledger.execute("SELECT id FROM journal ORDER BY id LIMIT 1").fetchone()[0]
+    ledger.execute("UPDATE journal SET date = '2026-03-02', amount = 123 WHERE id = ?", (first,))
+    ledger.execute("DELETE FROM journal WHERE date = '2026-02-03'")
+    for day in ("2026-01-14", "2026-01-15", "2026-01-31", "2026-02-28", "2026-03-01", "2026-03-31", "2026-04-30"):
+        assert balance_as_of(ledger, "Bank", day) == _brute(ledger, "Bank", day), day
+
+
+def test_unknown_account_has_no_balance(ledger):
+    assert balance_as_of(ledger, "Nope", "2026-02-01") is None
+
+
+def test_balance_command_as_of(ledger, capsys):
+    ledger.execute("UPDATE accounts SET balance = (SELECT 10000 + SUM(amount) FROM journal) WHERE name = 'Bank'")
+    ledger.commit()
+    assert run(["--format", "json", "balance", "--as-of", "2026-02-15"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    balances = [r for r in rows if r["record"] == "balance"]
+    assert balances == [{"record": "balance", "account": "Bank", "type": "bank",
+                         "balance": _brute(ledger, "Bank", "2026-02-15") / 100, "wallet": None}]
@@ -0,0 +1,23 @@
+"""Which database VaultPlan opens, and the one an older version may have left behind."""
+import pytest
+import typer
+
+from commands.doctor import doctor
+from utils import db
+
+
+def test_doctor_refuses_while_a_legacy_database_exists(vault, tmp_path, monkeypatch):
+    legacy = tmp_path / "repo" / "data" / "vaultplan.db"
+    monkeypatch.setattr(db, "LEGACY_DB_PATH", legacy)
+    assert db.legacy_db_path() is None
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b"")
+    assert db.legacy_db_path() == legacy
+    with pytest.raises(typer.Exit) as stop:
+        doctor()
+    assert stop.value.exit_code == 1
+
+
+def test_legacy_database_in_use_is_not_reported(vault, tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "LEGACY_DB_PATH", tmp_path / "vault.db")
+    assert db.legacy_db_path() is None
@@ -0,0 +1,78 @@
+"""Delta exports: change_log cursors per table, advanced only by a written export."""
+import json
+
+import pytest
+
+from utils import export
+from utils.export import write_delta_export
+from utils.journal import post
+
+
+def _export(conn, tmp_path, name):
+    (path,), rows = write_delta_export(conn, tmp_path / name, {"mode": "delta"}, "ndjson", tables=("journal", "notes"))
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    meta = lines[0]
+    assert meta["record"] == "meta"
+    return meta["changes"], [(r["record"], r["id"], r["change"]) for r in lines[1:]], rows
+
+
+def test_first_export_is_a_baseline_then_only_changes(vault, tmp_path):
+    a = post(vault, "Bank", 100, "income", "2026-01-01")
+    b = post(vault, "Bank", -50, "expense", "2026-01-02")
+    vault.commit()
+
+    changes, rows, count = _export(vault, tmp_path, "one")
+    assert changes == {"journal": {"after": None, "through": 0}, "notes": {"after": None, "through": 0}}
+    assert rows == [("journal", a, "insert"), ("journal", b, "insert")] and count == 2
+
+    changes, rows, _ = _export(vault, tmp_path, "two")
+    assert rows == [] and changes["journal"] == {"after": 0, "through": 0}
+
+    c = post(vault, "Bank", -20, "expense", "2026-01-03")
+    vault.execute("UPDATE journal SET amount = -30 WHERE id = ?", (c,))  # insert then update: the update wins
+    vault.execute("UPDATE journal SET description = 'edited' WHERE id = ?", (a,))
+    vault.execute("UPDATE journal SET amount = -60 WHERE id = ?", (b,))
+    vault.execute("DELETE FROM journal WHERE id = ?", (b,))  # update then delete: only the delete
+    vault.execute("INSERT INTO notes (note, created_at) VALUES ('hi', '2026-01-03')")
+    vault.commit()
+
+    changes, rows, _ = _export(vault, tmp_path, "three")
+    assert sorted(rows) == sorted([("journal", c, "update"), ("journal", a, "update"), ("journal", b, "delete"),
+                                   ("notes", 1, "insert")])
+    through = changes["journal"]["through"]
+    assert changes["journal"]["after"] == 0 and through > 0
+    assert vault.execute("SELECT COUNT(*) FROM change_log").fetchone()[0] == 0
+    assert dict(vault.execute("SELECT name, seq FROM export_cursors")) == {"journal": through, "notes": through}
+
+
+def test_deleted_rows_carry_only_their_id(vault, tmp_path):
+    a = post(vault, "Bank", 100, "income", "2026-01-01")
+    vault.commit()
+    _export(vault, tmp_path, "base")
+    vault.execute("DELETE FROM journal WHERE id = ?", (a,))
+    vault.commit()
+    path = tmp_path / "gone"
+    (out,), _ = write_delta_export(vault, path, {}, "ndjson", tables=("journal",))
+    deleted = json.loads(out.read_text().splitlines()[1])
+    assert deleted["id"] == a and deleted["change"] == "delete"
+    assert deleted["amount"] is None and deleted["account"] is None
+
+
+def test_failed_write_keeps_the_cursors(vault, tmp_path, monkeypatch):
+    post(vault, "Bank", 100, "income", "2026-01-01")
+    vault.commit()
+    _export(vault, tmp_path, "base")
+    c = post(vault, "Bank", -5, "expense", "2026-01-02")
+    vault.commit()
+    cursors = dict(vault.execute("SELECT name, seq FROM export_cursors"))
+
+    def broken(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patched, pytest.raises(OSError):
+        patched.setattr(export, "write_export", broken)
+        write_delta_export(vault, tmp_path / "fail", {}, "ndjson", tables=("journal", "notes"))
+
+    assert dict(vault.execute("SELECT name, seq FROM export_cursors")) == cursors
+    _, rows, _ = _export(vault, tmp_path, "retry")
+    assert rows == [("journal", c, "insert")]
@@ -0,0 +1,50 @@
+"""expense_items amounts written by the journal triggers (utils/schema.py)."""
+import json
+
+import pytest
+
+from utils.db import connect
+from utils.schema import ensure_schema
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(tmp_path / "vault.db")
+    ensure_schema(conn)
+    conn.execute("INSERT INTO accounts (name, balance) VALUES ('Bank', 0)")
+    yield conn
+    conn.close_for_real()
+
+
+def _expense(conn, amount, items):
+    cur = conn.execute(
+        "INSERT INTO journal (account, amount, date, kind, category, metadata) "
+        "VALUES ('Bank', ?, '2026-01-05', 'expense', 'food', ?)",
+        (-amount, json.dumps(items)),
+    )
+    return [row[0] for row in conn.execute(
+        "SELECT amount FROM expense_items WHERE expense_id = ? ORDER BY position", (cur.lastrowid,)
+    )]
+
+
+def test_uneven_split_gives_the_remainder_to_the_last_item(conn):
+    assert _expense(conn, 1000, ["tea", "cake", "jam"]) == [333, 333, 334]
+
+
+def test_unpriced_items_share_what_the_priced_ones_leave(conn):
+    items = [{"item": "latte", "qty": 2, "price": 4.5}, "croissant", "muffin"]
+    assert _expense(conn, 1251, items) == [900, 175, 176]
+
+
+def test_prices_follow_the_vault_scale(conn):
+    conn.execute("UPDATE vault_meta SET value = '8' WHERE key = 'money_scale'")
+    assert _expense(conn, 50_000_000, [{"item": "fee", "price": 0.00012345}, "coin"]) == [12345, 49987655]
+
+
+def test_rebuild_matches_the_triggers(conn):
+    from utils.items import rebuild
+
+    _expense(conn, 1000, ["tea", "cake", "jam"])
+    before = conn.execute("SELECT * FROM expense_items ORDER BY expense_id, position").fetchall()
+    rebuild(conn)
+    assert conn.execute("SELECT * FROM expense_items ORDER BY expense_id, position").fetchall() == before
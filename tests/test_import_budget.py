@@ -0,0 +1,29 @@
+"""Start-up imports of a cold `vaultplan balance`, measured in a subprocess with -X importtime."""
+import pytest
+
+from benchmarks.imports import BANNED, check
+
+MAX_MODULES = 170  # the budget `python -m benchmarks imports` is run with
+MAX_MS = 250
+# what other commands need and balance must not pull in
+OTHER_COMMANDS = ("numpy", "rich.panel", "rich.columns", "rich.progress", "rich.markdown", "rich.syntax")
+
+
+@pytest.fixture
+def populated(vault, vault_path, tmp_path):
+    vault.execute("INSERT INTO journal (account, amount, date, kind, description) "
+                  "VALUES ('Bank', 120000, '2026-01-05', 'income', 'Pay'), ('Bank', -450, '2026-01-06', 'expense', 'Coffee')")
+    vault.commit()
+    (tmp_path / "home").mkdir()
+    return vault_path
+
+
+def test_balance_stays_within_the_import_budget(populated, tmp_path):
+    report = check(populated, ["balance"], 3, MAX_MODULES, MAX_MS, tmp_path / "home", BANNED + OTHER_COMMANDS)
+    assert report["failures"] == []
+
+
+def test_machine_output_does_not_import_rich(populated, tmp_path):
+    report = check(populated, ["--format", "csv", "balance"], 1, MAX_MODULES, float("inf"), tmp_path / "home",
+                   BANNED + OTHER_COMMANDS + ("rich",))
+    assert report["failures"] == []
@@ -0,0 +1,95 @@
+"""The journal and the income/expenses views written through their INSTEAD OF triggers."""
+import sqlite3
+
+from utils import db, rollups
+from utils.balances import balance_as_of
+from utils.journal import post, post_transfer, verify_balances
+
+
+def _journal(conn):
+    return conn.execute("SELECT account, amount, kind, category, counterparty FROM journal ORDER BY id").fetchall()
+
+
+def test_income_view_writes_income_postings(vault):
+    vault.execute("INSERT INTO income (account, amount, source, date) VALUES ('Bank', 5000, 'Pay', '2026-01-01')")
+    assert _journal(vault) == [("Bank", 5000, "income", None, None)]
+    assert vault.execute("SELECT account, amount, source, date FROM income").fetchall() == [
+        ("Bank", 5000, "Pay", "2026-01-01"),
+    ]
+
+
+def test_expenses_view_maps_categories_to_kinds(vault):
+    rows = [("food", "Lunch"), ("__transfer__", "Transfer to goal Car"), ("__adjustment__", "Fix")]
+    vault.executemany("INSERT INTO expenses (account, amount, category, description, date) "
+                      "VALUES ('Bank', 700, ?, ?, '2026-01-02')", rows)
+    assert _journal(vault) == [
+        ("Bank", -700, "expense", "food", None),
+        ("Bank", -700, "transfer", None, None),
+        ("Bank", -700, "adjustment", None, None),
+    ]
+    assert vault.execute("SELECT amount, category FROM expenses ORDER BY id").fetchall() == [
+        (700, "food"), (700, "__transfer__"), (700, "__adjustment__"),
+    ]
+
+
+def test_view_updates_and_deletes_reach_the_journal_and_rollups(vault):
+    vault.execute("INSERT INTO expenses (account, amount, category, date) VALUES ('Bank', 700, 'food', '2026-01-02')")
+    vault.execute("INSERT INTO income (account, amount, source, date) VALUES ('Bank', 5000, 'Pay', '2026-01-01')")
+    vault.execute("UPDATE expenses SET amount = 900, category = 'rent', date = '2026-02-01'")
+    vault.execute("UPDATE income SET amount = 6000")
+    assert _journal(vault) == [("Bank", -900, "expense", "rent", None), ("Bank", 6000, "income", None, None)]
+    assert rollups.verify(vault) == []
+    assert vault.execute("SELECT month, kind, category, total FROM journal_monthly ORDER BY month").fetchall() == [
+        ("2026-01", "income", "", 6000), ("2026-02", "expense", "rent", -900),
+    ]
+    vault.execute("DELETE FROM expenses")
+    vault.execute("DELETE FROM income")
+    assert _journal(vault) == []
+    assert vault.execute("SELECT COUNT(*) FROM journal_monthly").fetchone()[0] == 0
+
+
+def test_transfer_is_two_postings_seen_by_both_views(vault):
+    vault.execute("INSERT INTO accounts (name, type, balance) VALUES ('Savings', 'bank', 0)")
+    post_transfer(vault, "Bank", "Savings", 2500, "2026-01-03")
+    assert _journal(vault) == [("Bank", -2500, "transfer", None, "Savings"),
+                               ("Savings", 2500, "transfer", None, "Bank")]
+    assert vault.execute("SELECT account, amount, category FROM expenses").fetchall() == [("Bank", 2500, "__transfer__")]
+    assert vault.execute("SELECT account, amount, source FROM income").fetchall() == [
+        ("Savings", 2500, "Transfer from Bank"),
+    ]
+
+
+def test_verify_balances_compares_accounts_with_the_journal(vault):
+    post(vault, "Bank", 1000, "income", "2026-01-01")
+    assert verify_balances(vault) == [("Bank", 0, 1000)]
+    vault.execute("UPDATE accounts SET balance = 1000 WHERE name = 'Bank'")
+    assert verify_balances(vault) == []
+
+
+def test_legacy_tables_become_the_journal(vault_path):
+    # a vault from before the journal: income/expenses tables, a transfer with only its debit
+    legacy = sqlite3.connect(vault_path)
+    legacy.executescript("""
+        CREATE TABLE accounts (id INTEGER PRIMARY KEY, name TEXT, type TEXT, balance REAL, wallet TEXT);
+        CREATE TABLE income (id INTEGER PRIMARY KEY, account TEXT, amount REAL, source TEXT, date TEXT);
+        CREATE TABLE expenses (id INTEGER PRIMARY KEY, account TEXT, amount REAL, category TEXT,
+                               description TEXT, date TEXT, note TEXT, metadata TEXT);
+        INSERT INTO accounts (name, type, balance) VALUES ('A', 'bank', 800), ('B', 'bank', 300);
+        INSERT INTO income (account, amount, source, date) VALUES ('A', 1000, 'Pay', '2026-01-01');
+        INSERT INTO expenses (account, amount, category, description, date)
+            VALUES ('A', 200, '__transfer__', 'Transfer to B', '2026-02-01');
+    """)
+    legacy.commit()
+    legacy.close()
+
+    conn = db.get_connection()
+    assert conn.execute("SELECT account, amount, kind, counterparty, date FROM journal "
+                        "WHERE kind != 'opening' ORDER BY id").fetchall() == [
+        ("A", 100000, "income", None, "2026-01-01"),
+        ("A", -20000, "transfer", "B", "2026-02-01"),
+        ("B", 20000, "transfer", "A", "2026-02-01"),
+    ]
+    assert verify_balances(conn) == []
+    # B's 300 held 100 before the transfer's credit arrived
+    assert balance_as_of(conn, "B", "2026-01-15") == 10000
+    assert balance_as_of(conn, "B", "2026-02-01") == 30000
@@ -0,0 +1,73 @@
+"""Keyset pagination: cursors printed under a page continue exactly where it stopped."""
+from datetime import date, timedelta
+
+import pytest
+import typer
+
+from utils.listing import keyset, parse_after
+from utils.report import summary_report
+
+
+def _post(conn, kind, amount, day, account="Bank", counterparty=None):
+    conn.execute("INSERT INTO journal (account, amount, date, kind, counterparty, description) VALUES (?, ?, ?, ?, ?, ?)",
+                 (account, amount, day, kind, counterparty, kind))
+
+
+def _pages(conn, section_of, size):
+    """All rows of a section, `size` at a time, each page starting from the last page's cursor."""
+    rows, after = [], None
+    while True:
+        section = section_of(after)
+        page = conn.execute(section.sql, section.params).fetchmany(size)
+        rows += page
+        if len(page) < size:
+            return rows
+        after = parse_after(f"{page[-1][0]},{page[-1][-1]}")
+
+
+@pytest.fixture
+def journal(vault):
+    vault.execute("INSERT INTO accounts (name, type, balance) VALUES ('Savings', 'bank', 0)")
+    today = date.today()
+    for n in range(40):
+        day = (today - timedelta(days=n // 3)).isoformat()  # three rows per day: ties on the date
+        _post(vault, "expense", -100 - n, day)
+        _post(vault, "transfer", -10 - n, day, counterparty="Savings")
+        _post(vault, "transfer", 10 + n, day, account="Savings", counterparty="Bank")
+    old = (today - timedelta(days=90)).isoformat()
+    _post(vault, "expense", -5, old)
+    _post(vault, "transfer", -5, old, counterparty="Savings")
+    vault.commit()
+    return vault
+
+
+@pytest.mark.parametrize("size", [1, 7, 40, 100])
+def test_pages_cover_the_listing_once_in_order(journal, size):
+    report = summary_report(journal, 30)
+    for section_of in (report.activity, report.transfers):
+        everything = journal.execute(section_of(None).sql, section_of(None).params).fetchall()
+        assert _pages(journal, section_of, size) == everything
+        assert [(r[0], r[-1]) for r in everything] == sorted(((r[0], r[-1]) for r in everything), reverse=True)
+
+
+def test_summary_listings_respect_the_window(journal):
+    report = summary_report(journal, 30)
+    for section in (report.activity(), report.transfers()):
+        rows = journal.execute(section.sql, section.params).fetchall()
+        assert len(rows) == 40
+        assert min(r[0] for r in rows) >= report.since
+
+
+def test_id_cursor_and_ascending_order():
+    sql, params = keyset("SELECT id FROM t WHERE 1", (17,), "id", descending=False)
+    assert sql == "SELECT id FROM t WHERE 1 AND id > ? ORDER BY id ASC" and params == (17,)
+    sql, params = keyset("SELECT date, id FROM t WHERE 1", ("2026-01-01", 5), "date")
+    assert sql.endswith("AND (date, id) < (?, ?) ORDER BY date DESC, id DESC") and params == ("2026-01-01", 5)
+
+
+def test_bad_cursor_names_its_option():
+    assert parse_after("2026-01-01,12") == ("2026-01-01", 12)
+    assert parse_after("12", numeric=True) == (12,)
+    with pytest.raises(typer.BadParameter) as err:
+        parse_after("2026-01-01", option="--transfers-after")
+    assert err.value.param_hint == "--transfers-after"
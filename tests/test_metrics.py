@@ -0,0 +1,40 @@
+"""Command metrics: a run's row is written once its transaction is over, failed or not."""
+from commands import registry
+from utils import metrics
+
+
+def _rows(conn):
+    return conn.execute("SELECT kind, name, ok, detail FROM metrics ORDER BY id").fetchall()
+
+
+def test_failed_run_is_recorded_and_its_writes_dropped(vault, monkeypatch):
+    def crash(argv):
+        vault.execute("INSERT INTO accounts (name, type, balance) VALUES ('Half', 'bank', 0)")
+        raise RuntimeError("boom")  # before any commit
+
+    monkeypatch.setattr(registry, "_run", crash)
+    try:
+        registry.run(["create-account"])
+    except RuntimeError:
+        pass
+    assert not vault.in_transaction
+    assert vault.execute("SELECT COUNT(*) FROM accounts WHERE name = 'Half'").fetchone()[0] == 0
+    assert _rows(vault) == [("command", "create-account", 0, "exit 1")]
+
+
+def test_nested_run_waits_for_the_callers_row(vault, monkeypatch):
+    def outer(argv):
+        if argv == ["inner"]:
+            with metrics.timed("http", "prices"):
+                pass
+            return 2
+        vault.execute("INSERT INTO accounts (name, type, balance) VALUES ('Open', 'bank', 0)")
+        registry.run(["inner"])  # the outer transaction is still open here
+        assert _rows(vault) == []
+        vault.commit()
+        return 0
+
+    monkeypatch.setattr(registry, "_run", outer)
+    assert registry.run(["outer"]) == 0
+    assert _rows(vault) == [("http", "prices", 1, None), ("command", "inner", 0, "exit 2"),
+                            ("command", "outer", 1, None)]
@@ -0,0 +1,53 @@
+"""utils/money.py: amounts parsed to and formatted from integer minor units."""
+from decimal import Decimal
+
+import pytest
+import typer
+
+from utils import money
+
+
+@pytest.mark.parametrize("text, units", [
+    ("4.5", 450), ("$4.50", 450), ("1,234.50", 123450), ("€3", 300), ("-12.34", -1234), ("0.00", 0),
+])
+def test_amount_parses_to_minor_units(vault, text, units):
+    assert money.amount(text) == units
+
+
+@pytest.mark.parametrize("text", ["abc", "", "1.2.3", "1.234"])
+def test_amount_rejects_text_and_extra_places(vault, text):
+    with pytest.raises(typer.BadParameter):
+        money.amount(text)
+
+
+def test_scale_is_read_from_the_vault(vault):
+    assert money.scale() == 2
+    vault.execute("UPDATE vault_meta SET value = '0' WHERE key = 'money_scale'")
+    money._scale = None
+    assert money.scale() == 0
+    assert money.amount("1,500") == 1500
+    with pytest.raises(typer.BadParameter, match="no decimal places"):
+        money.amount("1.5")
+
+
+def test_to_minor_rounds_half_to_even():
+    assert [money.to_minor(v, 2) for v in ("0.125", "0.135", "-0.125", 2.675)] == [12, 14, -12, 268]
+    assert money.to_minor(Decimal("1e-8"), 8) == 1
+    with pytest.raises(ValueError):
+        money.to_minor("ten", 2)
+
+
+def test_formatting():
+    assert money.fmt(123450, 2) == "1,234.50"
+    assert money.fmt(-5, 2) == "-0.05"
+    assert money.fmt(123450, 2, grouping=False) == "1234.50"
+    assert money.fmt(None, 0) == "0"
+    assert money.fmt(150000000, 8) == "1.50000000"
+    assert money.as_float(123450, 2) == 1234.5
+    assert money.to_major(7, 3) == Decimal("0.007")
+
+
+def test_round_trip_is_exact_for_large_amounts():
+    units = 9_007_199_254_740_993  # beyond float precision
+    assert money.to_minor(money.to_major(units, 2), 2) == units
+    assert money.fmt(units, 2, grouping=False) == "90071992547409.93"
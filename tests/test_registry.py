@@ -0,0 +1,27 @@
+"""commands/registry.py: running an argv in-process."""
+import sqlite3
+
+from commands.registry import run
+from utils import db
+
+
+def _lossy_vault(path):
+    # a pre-migration vault with an amount the default two decimal places would round
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE accounts (id INTEGER PRIMARY KEY, name TEXT, type TEXT, balance REAL, wallet TEXT)")
+    conn.execute("CREATE TABLE expenses (id INTEGER PRIMARY KEY, account TEXT, amount REAL, category TEXT, "
+                 "description TEXT, date TEXT, note TEXT, metadata TEXT)")
+    conn.execute("INSERT INTO accounts (name, type, balance) VALUES ('Bank', 'bank', 98.99)")
+    conn.execute("INSERT INTO expenses (account, amount, category, date) VALUES ('Bank', 1.005, 'food', '2026-01-01')")
+    conn.commit()
+    conn.close()
+
+
+def test_failed_migration_is_one_line_and_exit_1(vault_path, capsys):
+    _lossy_vault(vault_path)
+    assert run(["balance"]) == 1
+    err = capsys.readouterr().err
+    assert err.startswith("⚠ Migration 4 failed: converting amounts to 2 decimal places would round 1 in expenses.amount")
+    assert err.endswith("; run `vaultplan doctor`\n") and err.count("\n") == 1
+    assert db.shared_connection() is None
+    assert sqlite3.connect(vault_path).execute("PRAGMA user_version").fetchone()[0] == 3
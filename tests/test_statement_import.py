@@ -0,0 +1,79 @@
+"""vaultplan import: statement parsing, normalisation and the journal rows it writes."""
+import pytest
+import typer
+
+from commands.statement_import import (
+    classify, import_rows, normalize, parse_csv, parse_ofx, parse_qif, with_hashes,
+)
+
+
+def _txns(lines, date_format=None):
+    errors = []
+    return list(normalize(parse_csv(lines), date_format, errors)), errors
+
+
+def _import(conn, lines, fmt=parse_csv):
+    errors = []
+    rows = classify(with_hashes(normalize(fmt(lines), None, errors), "Bank"), "Bank", {}, "uncategorized")
+    seen, inserted = import_rows(conn, rows, "Bank")
+    conn.commit()
+    return seen, inserted, errors
+
+
+def test_signed_amount_column(vault):
+    txns, errors = _txns(["Date,Description,Amount\n", "2026-01-05,Coffee,-4.50\n", "2026-01-06,Pay,1200\n"])
+    assert [(t.date, t.amount, t.description) for t in txns] == [
+        ("2026-01-05", -450, "Coffee"), ("2026-01-06", 120000, "Pay"),
+    ]
+    assert errors == []
+
+
+def test_credit_with_zero_debit_is_a_credit(vault):
+    txns, errors = _txns(["Date,Description,Debit,Credit\n", "2026-01-05,Refund,0.00,25.00\n"])
+    assert [t.amount for t in txns] == [2500]
+    assert errors == []
+
+
+def test_debit_with_zero_credit_is_a_debit(vault):
+    txns, errors = _txns(["Date,Description,Debit,Credit\n", "2026-01-05,Rent,800.00,0.00\n"])
+    assert [t.amount for t in txns] == [-80000]
+    assert errors == []
+
+
+def test_debit_and_credit_both_set_is_rejected(vault):
+    txns, errors = _txns(["Date,Description,Debit,Credit\n", "2026-01-05,Odd,1.00,2.00\n",
+                          "2026-01-06,Empty,,\n"])
+    assert txns == []
+    assert errors == ["line 2: both debit '1.00' and credit '2.00' are set", "line 3: no debit or credit amount"]
+
+
+def test_ambiguous_dates_need_a_format(vault):
+    lines = ["Date,Description,Amount\n", "03/04/2026,A,-1\n", "05/06/2026,B,-1\n"]
+    with pytest.raises(typer.BadParameter):
+        _txns(lines)
+    txns, _ = _txns(lines, "%m/%d/%Y")
+    assert [t.date for t in txns] == ["2026-03-04", "2026-05-06"]
+
+
+def test_one_date_format_per_statement(vault):
+    txns, errors = _txns(["Date,Description,Amount\n", "03/04/2026,A,-1\n", "13/04/2026,B,-1\n",
+                          "04/13/2026,C,-1\n"])
+    assert [t.date for t in txns] == ["2026-04-03", "2026-04-13"]
+    assert errors == ["line 4: unrecognised date '04/13/2026'"]
+
+
+def test_ofx_and_qif(vault):
+    ofx = ["<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260105120000<TRNAMT>-12.34<FITID>A1<NAME>Shop</STMTTRN>\n"]
+    qif = ["!Type:Bank\n", "D1/31'26\n", "T-5.00\n", "PCafe\n", "^\n"]
+    assert [(t.date, t.amount, t.bank_id) for t in normalize(parse_ofx(ofx), None, [])] == [("2026-01-05", -1234, "A1")]
+    assert [(t.date, t.amount) for t in normalize(parse_qif(qif), None, [])] == [("2026-01-31", -500)]
+
+
+def test_import_is_idempotent_and_updates_the_balance(vault):
+    lines = ["Date,Description,Amount\n", "2026-01-05,Coffee,-4.50\n", "2026-01-05,Coffee,-4.50\n",
+             "2026-01-06,Pay,100\n"]
+    assert _import(vault, lines) == (3, 3, [])
+    assert _import(vault, lines) == (3, 0, [])
+    assert vault.execute("SELECT balance FROM accounts WHERE name = 'Bank'").fetchone()[0] == 9100
+    kinds = vault.execute("SELECT kind, amount FROM journal WHERE account = 'Bank' ORDER BY id").fetchall()
+    assert kinds == [("expense", -450), ("expense", -450), ("income", 10000)]
@@ -0,0 +1,102 @@
+# utils/balances.py
+"""Account balances on past dates.
+
+balance_checkpoints holds one row per account per month end (plus the
+opening balance at OPENING_DATE). Triggers in utils/schema.py keep every
+checkpoint on or after a posting's date correct when journal rows are
+inserted, edited or deleted, so a checkpoint never has to be
+recomputed from scratch.
+
+balance_as_of(account, day) = the latest checkpoint ≤ day + the journal
+postings dated after it, read through the (account, date) index: one
+primary-key probe and one short range scan however long the history is.
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+from typing import Optional
+
+from utils.schema import OPENING_DATE
+
+# both shared with doctor's query plan check (utils/query_plan.py)
+CHECKPOINT_SQL = (
+    "SELECT as_of, balance FROM balance_checkpoints WHERE account = ? AND as_of <= ? "
+    "ORDER BY as_of DESC LIMIT 1"
+)
+DELTA_SQL = """
+SELECT COALESCE(SUM(amount), 0) FROM journal
+WHERE account = :account AND date > :since AND date <= :until
+"""
+
+
+def _month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def _latest_checkpoint(conn: sqlite3.Connection, account: str, day: str) -> Optional[tuple[str, int]]:
+    return conn.execute(CHECKPOINT_SQL, (account, day)).fetchone()
+
+
+def _delta(conn: sqlite3.Connection, account: str, since: str, until: str) -> int:
+    return conn.execute(DELTA_SQL, {"account": account, "since": since, "until": until}).fetchone()[0]
+
+
+def add_opening_checkpoint(conn: sqlite3.Connection, account: str, balance: int) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO balance_checkpoints (account, as_of, balance) VALUES (?, ?, ?)",
+        (account, OPENING_DATE, balance),
+    )
+
+
+def refresh_checkpoints(conn: sqlite3.Connection, today: Optional[date] = None) -> int:
+    """Add month-end checkpoints for every finished month not covered yet.
+
+    Each new checkpoint is the previous one plus that month's delta, so
+    catching up costs one indexed range sum per account per month.
+    Returns the number of checkpoints written (the caller commits).
+    """
+    today = today or date.today()
+    last_done = (today.replace(day=1) - timedelta(days=1)).isoformat()
+    written = 0
+    rows = conn.execute("SELECT account, MAX(as_of) FROM balance_checkpoints GROUP BY account").fetchall()
+    for account, latest in rows:
+        if latest >= last_done:
+            continue
+        if latest == OPENING_DATE:
+            first = conn.execute(
+                "SELECT MIN(date) FROM journal WHERE account = ? AND date > ?",
+                (account, OPENING_DATE),
+            ).fetchone()[0]
+            try:
+                day = _month_end(date.fromisoformat(first[:10]))
+            except (TypeError, ValueError):
+                continue  # no (parseable) dated activity yet
+        else:
+            day = _month_end(date.fromisoformat(latest) + timedelta(days=1))
+
+        prev_as_of, balance = _latest_checkpoint(conn, account, latest)
+        while day.isoformat() <= last_done:
+            as_of = day.isoformat()
+            balance += _delta(conn, account, prev_as_of, as_of)
+            conn.execute(
+                "INSERT OR REPLACE INTO balance_checkpoints (account, as_of, balance) VALUES (?, ?, ?)",
+                (account, as_of, balance),
+            )
+            written += 1
+            prev_as_of = as_of
+            day = _month_end(day + timedelta(days=1))
+    return written
+
+
+def balance_as_of(conn: sqlite3.Connection, account: str, day: str) -> Optional[int]:
+    """Balance of `account` at the end of `day` (YYYY-MM-DD), in minor units.
+
+    None when the account has no opening checkpoint (unknown account).
+    """
+    checkpoint = _latest_checkpoint(conn, account, day)
+    if checkpoint is None:
+        return None
+    as_of, balance = checkpoint
+    return balance + _delta(conn, account, as_of, day)
@@ -1,95 +1,34 @@
 # clear_tables.py
 
-import sqlite3
-from pathlib import Path
-
-DB_PATH = Path.home() / "vaultplan" / "data" / "vaultplan.db"
+from utils import search
+from utils.db import get_connection
+from utils.schema import create_indexes, create_table_sql, create_triggers, create_views
 
 TABLES = [
     "accounts",
-    "income",
-    "expenses",
+    "journal",  # income and expenses are views over it
+    "journal_monthly",  # rollups of the journal
+    "expense_items",
+    "balance_checkpoints",
     "goals",
     "debits",
-    "notes"
+    "notes",
+    "note_tags",
+    "change_log",
+    "export_cursors",  # the next delta export starts from a full baseline
 ]
 
-SCHEMAS = {
-    "accounts": """
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY,
-            name TEXT,
-            type TEXT,
-            balance REAL,
-            wallet TEXT
-        )
-    """,
-    "income": """
-        CREATE TABLE IF NOT EXISTS income (
-            id INTEGER PRIMARY KEY,
-            amount REAL,
-            source TEXT,
-            date TEXT,
-            account TEXT
-        )
-    """,
-    "expenses": """
-        CREATE TABLE IF NOT EXISTS expenses (
-            id INTEGER PRIMARY KEY,
-            amount REAL,
-            category TEXT,
-            description TEXT,
-            account TEXT,
-            metadata TEXT,
-            note TEXT,
-            date TEXT
-        )
-    """,
-    "goals": """
-        CREATE TABLE IF NOT EXISTS goals (
-            id INTEGER PRIMARY KEY,
-            title TEXT,
-            target_amount REAL,
-            current_amount REAL DEFAULT 0,
-            account TEXT,
-            priority INTEGER,
-            deadline TEXT,
-            note TEXT,
-            created_at TEXT,
-            status TEXT DEFAULT 'active'
-        )
-    """,
-    "debits": """
-        CREATE TABLE IF NOT EXISTS debits (
-            id INTEGER PRIMARY KEY,
-            label TEXT,
-            amount REAL,
-            account TEXT,
-            due_date TEXT,
-            note TEXT,
-            paid REAL DEFAULT 0,
-            created_at TEXT,
-            status TEXT DEFAULT 'pending'
-        )
-    """,
-    "notes": """
-        CREATE TABLE IF NOT EXISTS notes (
-            id INTEGER PRIMARY KEY,
-            mood INTEGER,
-            note TEXT,
-            timestamp TEXT
-        )
-    """
-}
-
-conn = sqlite3.connect(DB_PATH)
+conn = get_connection()
 c = conn.cursor()
 
 for table in TABLES:
     print(f"Dropping and recreating: {table}")
     c.execute(f"DROP TABLE IF EXISTS {table}")
-    c.execute(SCHEMAS[table])
+    c.execute(create_table_sql(table))
+create_views(conn)
+create_triggers(conn)
+create_indexes(conn)
+search.rebuild(conn)  # web3 transactions are kept
 
 conn.commit()
-conn.close()
 print("✅ All VaultPlan tables reset.")
@@ -0,0 +1,189 @@
+# utils/columnar.py
+"""Columnar NumPy snapshots of the vault for offline analytics.
+
+write_snapshot() turns each table into a directory of typed .npy
+columns that np.load can memory-map, plus one meta.json:
+
+    snapshot/meta.json                money scale, row counts, column types
+    snapshot/journal/amount.npy       int64 minor units
+    snapshot/journal/date.npy         int32 days since 1970-01-01 (NO_DATE if missing)
+    snapshot/journal/category.npy     int32 codes into category.labels.npy (-1 = NULL)
+    snapshot/journal/category.labels.npy
+
+load_snapshot() opens it again without parsing a single row, so a
+multi-year history is ready in milliseconds and filters are vectorized:
+
+    snap = load_snapshot(path)
+    j = snap["journal"]
+    food = j["category"] == j.code("category", "food")
+    j.amounts("amount")[food & (j.dates("date") >= np.datetime64("2025-01-01"))].sum()
+
+NumPy is optional for VaultPlan; only this module needs it.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from utils import money
+from utils.config import get_config
+from utils.schema import MONEY_COLUMNS, TABLES, TOKEN_COLUMNS
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_TABLES = ("journal", "accounts", "goals", "debits", "notes", "web3_transactions", "balance_checkpoints")
+DATE_COLUMNS = {"date", "created_at", "due_date", "deadline", "as_of"}
+NO_DATE = np.iinfo(np.int32).min
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _column_type(decl: str, column: str) -> str:
+    if column in DATE_COLUMNS:
+        return "date"
+    if decl.startswith("INTEGER"):
+        return "int"
+    if decl.startswith("REAL"):
+        return "float"
+    return "text"
+
+
+def _days(label: str) -> int:
+    try:
+        return date.fromisoformat(label[:10]).toordinal() - _EPOCH
+    except (TypeError, ValueError):
+        return NO_DATE  # e.g. OPENING_DATE, or a hand-typed date
+
+
+def _write_table(conn: sqlite3.Connection, out: Path, table: str) -> dict:
+    columns = [(col, _column_type(decl, col)) for col, decl in TABLES[table]]
+    rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    data, labels, nulls = {}, {}, {}
+    for col, kind in columns:
+        if kind == "int":
+            data[col], nulls[col] = np.zeros(rows, np.int64), np.zeros(rows, bool)
+        elif kind == "float":
+            data[col] = np.full(rows, np.nan)
+        else:  # text and dates are dictionary-encoded while reading
+            data[col], labels[col] = np.full(rows, -1, np.int32), {}
+
+    cur = conn.execute(f"SELECT {', '.join(col for col, _ in columns)} FROM {table} ORDER BY rowid")
+    size, start = get_config().fetch_size, 0
+    while batch := cur.fetchmany(size):
+        end = start + len(batch)
+        for j, (col, kind) in enumerate(columns):
+            values = [row[j] for row in batch]
+            if kind == "int":
+                nulls[col][start:end] = [v is None for v in values]
+                data[col][start:end] = [0 if v is None else v for v in values]
+            elif kind == "float":
+                data[col][start:end] = [np.nan if v is None else v for v in values]
+            else:
+                lookup = labels[col]
+                data[col][start:end] = [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+        start = end
+
+    out.mkdir(parents=True, exist_ok=True)
+    spec = {}
+    for col, kind in columns:
+        if kind == "date":
+            # one conversion per distinct day, not per row
+            day_of = np.array([_days(label) for label in labels[col]] + [NO_DATE], np.int32)
+            np.save(out / f"{col}.npy", day_of[data[col]])  # code -1 picks the trailing NO_DATE
+        elif kind == "text":
+            np.save(out / f"{col}.npy", data[col])
+            np.save(out / f"{col}.labels.npy", np.array([str(v) for v in labels[col]], dtype=str))
+        else:
+            np.save(out / f"{col}.npy", data[col])
+            if kind == "int" and nulls[col].any():
+                np.save(out / f"{col}.null.npy", nulls[col])
+        spec[col] = {"type": kind}
+        if col in MONEY_COLUMNS.get(table, ()):
+            spec[col]["places"] = money.TOKEN_SCALE if (table, col) in TOKEN_COLUMNS else money.scale()
+    return {"rows": start, "columns": spec}
+
+
+def write_snapshot(conn: sqlite3.Connection, directory: Path,
+                   tables: Iterable[str] = SNAPSHOT_TABLES) -> dict[str, int]:
+    """Write every table in `tables` under `directory`; returns {table: rows}."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    meta = {"version": SNAPSHOT_VERSION, "money_scale": money.scale(), "tables": {}}
+    conn.execute("SAVEPOINT snapshot")  # every table from the same read snapshot
+    try:
+        for table in tables:
+            if table in existing:
+                meta["tables"][table] = _write_table(conn, directory / table, table)
+    finally:
+        conn.execute("RELEASE snapshot")
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2))
+    return {table: spec["rows"] for table, spec in meta["tables"].items()}
+
+
+class SnapshotTable:
+    """One table of a snapshot; columns are loaded (memory-mapped) on first use."""
+
+    def __init__(self, path: Path, spec: dict, mmap: bool = True):
+        self.path = path
+        self.rows = spec["rows"]
+        self.columns = spec["columns"]
+        self._mode = "r" if mmap else None
+        self._loaded: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _load(self, name: str) -> np.ndarray:
+        if name not in self._loaded:
+            self._loaded[name] = np.load(self.path / f"{name}.npy", mmap_mode=self._mode)
+        return self._loaded[name]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """The stored column: int64/float64 values, int32 days or int32 label codes."""
+        if column not in self.columns:
+            raise KeyError(column)
+        return self._load(column)
+
+    def labels(self, column: str) -> np.ndarray:
+        return self._load(f"{column}.labels")
+
+    def code(self, column: str, label: str) -> int:
+        """Code of `label` in a text column (-2 if absent, so comparisons match nothing)."""
+        hits = np.flatnonzero(self.labels(column) == label)
+        return int(hits[0]) if hits.size else -2
+
+    def decode(self, column: str) -> np.ndarray:
+        """A text column as an object array of strings (None for NULL)."""
+        codes = self[column]
+        out = np.empty(len(codes), dtype=object)
+        present = codes >= 0
+        out[present] = self.labels(column)[codes[present]]
+        return out
+
+    def dates(self, column: str) -> np.ndarray:
+        """A date column as datetime64[D] (NaT where missing)."""
+        days = np.asarray(self[column]).astype("int64")
+        return np.where(days == NO_DATE, np.iinfo(np.int64).min, days).astype("datetime64[D]")
+
+    def nulls(self, column: str) -> np.ndarray:
+        path = self.path / f"{column}.null.npy"
+        if path.exists():
+            return self._load(f"{column}.null")
+        return np.zeros(self.rows, bool)
+
+    def amounts(self, column: str) -> np.ndarray:
+        """A money column in major units (float64)."""
+        places = self.columns[column].get("places", 0)
+        return np.asarray(self[column]) / 10 ** places
+
+
+def load_snapshot(directory: Path, mmap: bool = True) -> dict[str, SnapshotTable]:
+    directory = Path(directory)
+    meta = json.loads((directory / "meta.json").read_text())
+    if meta.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {meta.get('version')!r}")
+    return {table: SnapshotTable(directory / table, spec, mmap) for table, spec in meta["tables"].items()}
@@ -1,11 +1,96 @@
 # utils/config.py
+"""Process-wide, typed view of config.json.
+
+get_config() parses the file once and hands out the same frozen Config
+object until config.json's mtime changes. The mtime itself is checked
+at most once per RECHECK_SECONDS, so hot paths (and long-running
+`vaultplan serve` / batch processes) never re-read or re-parse the file.
+"""
 import json
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 # point at the project root next to vaultplan.py
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
 
+RECHECK_SECONDS = 1.0
+
+# Default fallback is dollar symbol
+DEFAULT_CURRENCY_SYMBOL = "$"
+
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "AUD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "CNY": "¥",
+    "INR": "₹",
+    "KRW": "₩",
+    "BTC": "₿",
+    "ETH": "Ξ"
+}
+
+
+@dataclass(frozen=True)
+class Config:
+    display_currency: str = "USD"
+    etherscan_api_key: Optional[str] = None
+    etherscan_chains: tuple = (1,)
+    db_path: Optional[Path] = None
+    money_scale: Optional[int] = None  # decimal places for a new vault; None = money.DEFAULT_SCALE
+    # performance knobs
+    sqlite_cache_kb: int = 16384
+    sqlite_mmap_mb: int = 64
+    busy_timeout_ms: int = 5000
+    fetch_size: int = 1000
+
+    @property
+    def currency_symbol(self) -> str:
+        return CURRENCY_SYMBOLS.get(self.display_currency.upper(), DEFAULT_CURRENCY_SYMBOL)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Config":
+        defaults = cls()
+
+        def knob(key, default):
+            try:
+                return type(default)(data.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        chains = data.get("etherscan_chains") or list(defaults.etherscan_chains)
+        db_path = data.get("db_path")
+        return cls(
+            display_currency=str(data.get("display_currency") or defaults.display_currency),
+            etherscan_api_key=data.get("etherscan_api_key") or None,
+            etherscan_chains=tuple(int(c) for c in chains),
+            db_path=Path(db_path).expanduser() if db_path else None,
+            money_scale=_scale_setting(data.get("money_scale")),
+            sqlite_cache_kb=knob("sqlite_cache_kb", defaults.sqlite_cache_kb),
+            sqlite_mmap_mb=knob("sqlite_mmap_mb", defaults.sqlite_mmap_mb),
+            busy_timeout_ms=knob("busy_timeout_ms", defaults.busy_timeout_ms),
+            fetch_size=knob("fetch_size", defaults.fetch_size),
+        )
+
+
+def _scale_setting(value) -> Optional[int]:
+    try:
+        scale = int(value)
+    except (TypeError, ValueError):
+        return None
+    return scale if 0 <= scale <= 8 else None
+
+
+_cached: Optional[Config] = None
+_cached_mtime: Optional[int] = None
+_checked_at = 0.0
+
+
 def load_config() -> dict:
+    """Raw config.json contents (use get_config() for the cached, typed view)."""
     try:
         if CONFIG_PATH.exists():
             return json.loads(CONFIG_PATH.read_text())
@@ -16,29 +101,29 @@ def load_config() -> dict:
 def save_config(cfg: dict) -> None:
     with open(CONFIG_PATH, "w") as f:
         json.dump(cfg, f, indent=2)
+    invalidate_config()
 
-# Default fallback is dollar symbol
-DEFAULT_CURRENCY_SYMBOL = "$"
+def invalidate_config() -> None:
+    global _cached
+    _cached = None
 
-def get_display_currency():
-    currency_map = {
-        "USD": "$",
-        "AUD": "$",
-        "EUR": "€",
-        "GBP": "£",
-        "JPY": "¥",
-        "CNY": "¥",
-        "INR": "₹",
-        "KRW": "₩",
-        "BTC": "₿",
-        "ETH": "Ξ"
-    }
-
-    if CONFIG_PATH.exists():
+def get_config() -> Config:
+    global _cached, _cached_mtime, _checked_at
+    now = time.monotonic()
+    if _cached is not None and now - _checked_at < RECHECK_SECONDS:
+        return _cached
+    _checked_at = now
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    if _cached is None or mtime != _cached_mtime:
         try:
-            data = json.loads(CONFIG_PATH.read_text())
-            code = data.get("display_currency", "USD")
-            return currency_map.get(code.upper(), DEFAULT_CURRENCY_SYMBOL)
-        except Exception:
-            return DEFAULT_CURRENCY_SYMBOL
-    return DEFAULT_CURRENCY_SYMBOL
+            _cached = Config.from_dict(load_config())
+        except (TypeError, ValueError, AttributeError):
+            _cached = Config()
+        _cached_mtime = mtime
+    return _cached
+
+def get_display_currency():
+    return get_config().currency_symbol
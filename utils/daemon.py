@@ -0,0 +1,89 @@
+# utils/daemon.py
+"""Client side of `vaultplan serve`.
+
+Protocol (one request per connection, newline-delimited JSON):
+    client → {"argv": [...], "cwd": "...", "tty": bool, "db": "/resolved/vault.db"}
+    server → {"stdout": "...", "stderr": "...", "code": int}
+             or {"other_db": "/daemon/vault.db"} when the client's vault
+             is not the daemon's; the client then runs the command itself
+
+This module must stay import-light: it runs before typer/rich are
+loaded so a forwarded command never pays for them.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+SOCKET_PATH = Path(os.environ.get("VAULTPLAN_SOCKET", Path.home() / ".vaultplan" / "vaultplan.sock"))
+
+# commands that must never be forwarded to the daemon (the wizard prompts)
+LOCAL_ONLY = {"serve", "wizard"}
+
+
+def _recv_line(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def send_message(sock: socket.socket, payload: dict) -> None:
+    sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+
+def read_message(sock: socket.socket) -> Optional[dict]:
+    line = _recv_line(sock)
+    if not line.strip():
+        return None
+    return json.loads(line)
+
+
+def db_key(path: Path) -> str:
+    """A vault path in the form client and daemon compare."""
+    return str(Path(path).expanduser().resolve())
+
+
+def forward(argv: Sequence[str], socket_path: Path = SOCKET_PATH) -> Optional[int]:
+    """Run argv on a live daemon and return its exit code.
+
+    Returns None when the command should run in-process instead: no
+    daemon socket, daemon not answering, VAULTPLAN_NO_DAEMON set, a
+    LOCAL_ONLY command, --profile, or a VAULTPLAN_DB / config db_path
+    that points at another vault than the daemon's.
+    """
+    from commands.registry import profile_requested, requested_command
+    from utils.db import resolve_db_path
+
+    if os.environ.get("VAULTPLAN_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    if requested_command(argv) in LOCAL_ONLY or not socket_path.exists():
+        return None
+    if profile_requested(argv) is not None:
+        return None  # a profile is of this process, not of the daemon
+    if "-" in argv:
+        return None  # reads our stdin (e.g. `batch -`), which the daemon cannot see
+
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(socket_path))
+    except OSError:
+        return None  # stale socket file; fall back to running locally
+
+    with sock:
+        send_message(sock, {"argv": list(argv), "cwd": os.getcwd(), "tty": sys.stdout.isatty(),
+                            "db": db_key(resolve_db_path())})
+        reply = read_message(sock)
+
+    if reply is None or "other_db" in reply:
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return int(reply.get("code", 1))
@@ -0,0 +1,230 @@
+# utils/db.py
+"""The one place VaultPlan opens its SQLite database.
+
+• resolve_db_path()  — VAULTPLAN_DB env > config.json "db_path" >
+                       ~/.vaultplan/data/vaultplan.db, resolved once
+• legacy_db_path()   — data/vaultplan.db beside the code, if an old
+                       version left one there (doctor refuses to go on)
+• connect()          — a new connection with the tuned PRAGMAs below
+• get_connection()   — the per-process connection every command shares
+                       (schema checked on first open, closed at exit)
+
+WAL + synchronous=NORMAL means a commit is an append to the WAL instead
+of a rollback-journal fsync dance, and readers no longer block behind a
+writer (cron jobs, the daemon and an interactive shell can overlap).
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from utils.config import get_config
+from utils.schema import ensure_schema
+
+if TYPE_CHECKING:
+    from utils.profiling import Session
+
+DEFAULT_DB_PATH = Path.home() / ".vaultplan" / "data" / "vaultplan.db"
+# before utils/db.py, income, expenses and todos were written next to the code
+LEGACY_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "vaultplan.db"
+STATEMENT_CACHE_SIZE = 256
+
+_db_path: Optional[Path] = None
+_shared: Optional["VaultConnection"] = None
+_profile: Optional["Session"] = None  # set by `vaultplan --profile` (utils/profiling.py)
+
+
+class VaultConnection(sqlite3.Connection):
+    """Connection handed out by get_connection().
+
+    close() is a no-op because the connection is shared for the whole
+    process. While `held` is set, commit()/rollback() (including the
+    implicit ones from `with conn:`) are ignored so the owner of the
+    transaction (e.g. `vaultplan batch`) decides the outcome with finish().
+    """
+
+    held = False
+
+    def commit(self):
+        if not self.held:
+            super().commit()
+
+    def rollback(self):
+        if not self.held:
+            super().rollback()
+
+    def __exit__(self, exc_type, exc, tb):
+        # sqlite3's own __exit__ commits without going through commit()
+        if self.held:
+            return False
+        return super().__exit__(exc_type, exc, tb)
+
+    def finish(self, commit: bool) -> None:
+        self.held = False
+        if commit:
+            self.commit()
+        else:
+            self.rollback()
+
+    def close(self):
+        pass  # shared for the whole process; see close_connection()
+
+    def close_for_real(self):
+        super().close()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that adds its execute and fetch time, and its rows, to the profile."""
+
+    _stmt = None
+
+    def _timed(self, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            if self._stmt is not None:
+                self._stmt.seconds += time.perf_counter() - start
+
+    def _record(self, sql: str, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(sql, *args)
+        finally:
+            changed = self.rowcount if self.rowcount > 0 else 0
+            self._stmt = _profile.executed(sql, time.perf_counter() - start, changed) if _profile else None
+
+    def execute(self, sql, parameters=()):
+        return self._record(sql, super().execute, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._record(sql, super().executemany, seq_of_parameters)
+
+    def _fetched(self, rows):
+        if self._stmt is not None:
+            self._stmt.rows += len(rows)
+        return rows
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is not None and self._stmt is not None:
+            self._stmt.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        return self._fetched(self._timed(super().fetchmany, size or self.arraysize))
+
+    def fetchall(self):
+        return self._fetched(self._timed(super().fetchall))
+
+    def __next__(self):
+        row = self._timed(super().__next__)
+        if self._stmt is not None:
+            self._stmt.rows += 1
+        return row
+
+
+class ProfiledConnection(VaultConnection):
+    """VaultConnection whose statements go through TimedCursor (only under --profile)."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        super().commit()
+        if _profile is not None:
+            _profile.executed("COMMIT", time.perf_counter() - start, 0)
+
+
+def profile_with(session: Optional["Session"]) -> None:
+    """Time and trace every connection opened from now on for `session` (None stops)."""
+    global _profile
+    _profile = session
+
+
+def resolve_db_path() -> Path:
+    global _db_path
+    if _db_path is None:
+        env = os.environ.get("VAULTPLAN_DB")
+        _db_path = Path(env).expanduser() if env else (get_config().db_path or DEFAULT_DB_PATH)
+    return _db_path
+
+
+def legacy_db_path() -> Optional[Path]:
+    """LEGACY_DB_PATH when it exists and is not the database in use (its rows are not read)."""
+    if LEGACY_DB_PATH.exists() and LEGACY_DB_PATH.resolve() != resolve_db_path().resolve():
+        return LEGACY_DB_PATH
+    return None
+
+
+def _tune(conn: sqlite3.Connection) -> None:
+    cfg = get_config()
+    conn.execute(f"PRAGMA busy_timeout = {int(cfg.busy_timeout_ms)}")
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.OperationalError:
+        pass  # e.g. a filesystem without shared-memory support; keep the default journal
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = {-int(cfg.sqlite_cache_kb)}")
+    conn.execute(f"PRAGMA mmap_size = {int(cfg.sqlite_mmap_mb) * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def connect(path: Optional[Path] = None) -> VaultConnection:
+    """Open a new tuned connection (most code wants get_connection())."""
+    path = Path(path) if path else resolve_db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        path,
+        factory=VaultConnection if _profile is None else ProfiledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        timeout=get_config().busy_timeout_ms / 1000,
+    )
+    if _profile is not None:
+        conn.set_trace_callback(_profile.trace)
+    _tune(conn)
+    return conn
+
+
+def get_connection() -> VaultConnection:
+    """The shared per-process connection, migrated to the current schema."""
+    global _shared
+    if _shared is None:
+        conn = connect()
+        try:
+            ensure_schema(conn)
+        except Exception:
+            conn.close_for_real()  # the next call tries again from scratch
+            raise
+        _shared = conn
+    return _shared
+
+
+def shared_connection() -> Optional[VaultConnection]:
+    """The shared connection if this process opened it already, else None (never opens it)."""
+    return _shared
+
+
+def close_connection() -> None:
+    global _shared
+    if _shared is not None:
+        conn, _shared = _shared, None
+        try:
+            conn.execute("PRAGMA optimize")  # refresh planner stats when SQLite thinks it helps
+        except sqlite3.Error:
+            pass
+        conn.close_for_real()
+
+
+atexit.register(close_connection)
@@ -0,0 +1,234 @@
+# utils/export.py
+"""Streaming exports.
+
+Rows travel from a cursor to the output file `fetch_size` at a time
+(config.json, default 1000), each one written as soon as it is read, so
+peak memory stays flat however many years of history are exported.
+Totals belong in the header and are SQL aggregates, never Python sums
+over fetched rows.
+
+Formats (any of them gzip-compressed with compress=True, adding ".gz"):
+• json   — one document: the header keys, then each section as a list
+           (sections sharing a `group` nest under that key)
+• ndjson — a {"record": "meta", ...header} line, then one
+           {"record": <section>, ...row} line per row
+• csv    — <stem>.meta.csv (key,value) plus <stem>.<section>.csv per section
+
+Delta exports (write_delta_export) emit only the rows of CHANGE_TRACKED
+tables inserted, updated or deleted since the previous delta export.
+Triggers append (table, row id, op) to change_log once a table has an
+export cursor; each export reads change_log after the cursor, joins the
+current rows, then moves the cursor and prunes what it consumed, all in
+one transaction. The first delta export of a table is a full baseline.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+from typing import IO, Iterable, Iterator, NamedTuple, Optional
+
+from utils import money
+from utils.config import get_config
+from utils.schema import CHANGE_TRACKED, MONEY_COLUMNS, TABLES, TOKEN_COLUMNS
+
+FORMATS = ("json", "ndjson", "csv")
+
+
+class Section(NamedTuple):
+    name: str
+    sql: str
+    params: tuple = ()
+    amounts: tuple = ()  # (column, decimal places or None for the vault scale)
+    group: Optional[str] = None  # json only: nest under this key
+
+
+def amounts_of(table: str) -> tuple:
+    """Section.amounts for a SELECT * over `table`."""
+    return tuple(
+        (col, money.TOKEN_SCALE if (table, col) in TOKEN_COLUMNS else None)
+        for col in MONEY_COLUMNS.get(table, ())
+    )
+
+
+def _dicts(cur: sqlite3.Cursor, size: Optional[int] = None) -> Iterator[dict]:
+    size = size or get_config().fetch_size
+    columns = [d[0] for d in cur.description]
+    while True:
+        batch = cur.fetchmany(size)
+        if not batch:
+            return
+        for row in batch:
+            yield dict(zip(columns, row))
+
+
+def iter_rows(conn: sqlite3.Connection, sql: str, params: tuple = (),
+              size: Optional[int] = None) -> Iterator[dict]:
+    """Rows of `sql` as dicts, fetched `size` (default cfg.fetch_size) at a time."""
+    return _dicts(conn.execute(sql, params), size)
+
+
+def section_rows(conn: sqlite3.Connection, section: Section) -> tuple[list[str], Iterator[dict]]:
+    """(column names, rows) of a section, stored minor units turned into plain numbers."""
+    cur = conn.execute(section.sql, section.params)
+    columns = [d[0] for d in cur.description]
+
+    def rows() -> Iterator[dict]:
+        for row in _dicts(cur):
+            for col, places in section.amounts:
+                if row.get(col) is not None:
+                    row[col] = money.as_float(row[col], places)
+            yield row
+
+    return columns, rows()
+
+
+def _open(path: Path, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _path(stem: Path, suffix: str, compress: bool) -> Path:
+    return stem.with_name(f"{stem.name}.{suffix}{'.gz' if compress else ''}")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str)
+
+
+def _write_json(conn, stem, header, sections, compress) -> tuple[list[Path], int]:
+    path = _path(stem, "json", compress)
+    written = 0
+    with _open(path, compress) as out:
+        out.write("{")
+        sep = "\n  "
+        for key, value in header.items():
+            out.write(f"{sep}{_dumps(key)}: {_dumps(value)}")
+            sep = ",\n  "
+        group = None
+        for section in sections:
+            if section.group != group:
+                if group is not None:
+                    out.write("\n  }")
+                    sep = ",\n  "
+                if section.group is not None:
+                    out.write(f"{sep}{_dumps(section.group)}: {{")
+                    sep = "\n    "
+                group = section.group
+            indent = "    " if group is not None else "  "
+            out.write(f"{sep}{_dumps(section.name)}: [")
+            row_sep = "\n" + indent + "  "
+            empty = True
+            for row in section_rows(conn, section)[1]:
+                out.write(row_sep + _dumps(row))
+                row_sep = ",\n" + indent + "  "
+                empty = False
+                written += 1
+            out.write("]" if empty else "\n" + indent + "]")
+            sep = ",\n" + indent
+        if group is not None:
+            out.write("\n  }")
+        out.write("\n}\n")
+    return [path], written
+
+
+def _write_ndjson(conn, stem, header, sections, compress) -> tuple[list[Path], int]:
+    path = _path(stem, "ndjson", compress)
+    written = 0
+    with _open(path, compress) as out:
+        out.write(_dumps({"record": "meta", **header}) + "\n")
+        for section in sections:
+            for row in section_rows(conn, section)[1]:
+                out.write(_dumps({"record": section.name, **row}) + "\n")
+                written += 1
+    return [path], written
+
+
+def _write_csv(conn, stem, header, sections, compress) -> tuple[list[Path], int]:
+    meta = _path(stem, "meta.csv", compress)
+    with _open(meta, compress) as out:
+        writer = csv.writer(out)
+        writer.writerow(("key", "value"))
+        for key, value in header.items():
+            writer.writerow((key, value if isinstance(value, (str, int, float)) else _dumps(value)))
+    paths, written = [meta], 0
+    for section in sections:
+        path = _path(stem, f"{section.name}.csv", compress)
+        columns, rows = section_rows(conn, section)
+        with _open(path, compress) as out:
+            writer = csv.DictWriter(out, fieldnames=columns)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                written += 1
+        paths.append(path)
+    return paths, written
+
+
+_WRITERS = {"json": _write_json, "ndjson": _write_ndjson, "csv": _write_csv}
+
+
+def write_export(conn: sqlite3.Connection, stem: Path, header: dict, sections: Iterable[Section],
+                 fmt: str = "json", compress: bool = False) -> tuple[list[Path], int]:
+    """Stream `header` and every section to files named after `stem`.
+
+    Returns (files written, number of rows).
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format {fmt!r} (choose {', '.join(FORMATS)})")
+    return _WRITERS[fmt](conn, Path(stem), header, list(sections), compress)
+
+
+def delta_sql(table: str, since: Optional[int]) -> str:
+    columns = ", ".join(f"t.{col}" for col, _ in TABLES[table] if col != "id")
+    if since is None:
+        return f"SELECT t.id, 'insert' AS change, {columns} FROM {table} t ORDER BY t.id"
+    # the last change of each row wins; deleted rows keep only their id
+    return f"""
+        SELECT c.row_id AS id, c.op AS change, {columns}
+        FROM (SELECT MAX(seq) AS seq FROM change_log
+              WHERE tbl = ? AND seq > ? AND seq <= ? GROUP BY row_id) latest
+        JOIN change_log c ON c.seq = latest.seq
+        LEFT JOIN {table} t ON t.id = c.row_id AND c.op != 'delete'
+        ORDER BY c.seq
+    """
+
+
+def write_delta_export(conn: sqlite3.Connection, stem: Path, header: dict, fmt: str = "json",
+                       compress: bool = False, tables: Iterable[str] = CHANGE_TRACKED) -> tuple[list[Path], int]:
+    """Stream the rows changed since the last delta export, then advance the cursors.
+
+    header gains "changes": {table: {"after": seq or None for a baseline, "through": seq}}.
+    If writing fails, the cursors stay put and the next export repeats these rows.
+    """
+    conn.execute("SAVEPOINT delta_export")
+    try:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        through = row[0] if row else 0
+        cursors = dict(conn.execute("SELECT name, seq FROM export_cursors").fetchall())
+        sections, changes = [], {}
+        for table in tables:
+            since = cursors.get(table)
+            params = () if since is None else (table, since, through)
+            sections.append(Section(table, delta_sql(table, since), params, amounts_of(table)))
+            changes[table] = {"after": since, "through": through}
+
+        result = write_export(conn, stem, {**header, "changes": changes}, sections, fmt, compress)
+
+        for table in changes:
+            conn.execute(
+                "INSERT INTO export_cursors (name, seq, exported_at) VALUES (?, ?, datetime('now')) "
+                "ON CONFLICT(name) DO UPDATE SET seq = excluded.seq, exported_at = excluded.exported_at",
+                (table, through),
+            )
+            conn.execute("DELETE FROM change_log WHERE tbl = ? AND seq <= ?", (table, through))
+    except BaseException:
+        conn.execute("ROLLBACK TO delta_export")
+        conn.execute("RELEASE delta_export")
+        raise
+    conn.execute("RELEASE delta_export")
+    conn.commit()
+    return result
@@ -1,53 +1,59 @@
-from pathlib import Path
-import os
-import sqlite3
-import requests
-import json
-from datetime import datetime
-
-DB_PATH = Path.home() / ".vaultplan" / "data" / "vaultplan.db"
-
-def get_token_prices(symbols: list[str]) -> dict:
-    """
-    For each token symbol, query Dexscreener search API and return AUD prices.
-    """
-    prices = {}
-    for symbol in symbols:
-        try:
-            url = f"https://api.dexscreener.com/latest/dex/search?q={symbol}"
-            r = requests.get(url, timeout=5)
-            result = r.json().get("pairs", [])
-            if not result:
-                prices[symbol] = 0
-                continue
-
-            # Prefer USD-quoted price
-            for pair in result:
-                if pair.get("quoteToken", {}).get("symbol", "").upper() == "USD":
-                    usd = float(pair.get("priceUsd", 0.0))
-                    prices[symbol] = round(usd * 1.54, 6)
-                    break
-            else:
-                # Fallback: take first match
-                usd = float(result[0].get("priceUsd", 0.0))
-                prices[symbol] = round(usd * 1.54, 6)
-
-        except Exception:
-            prices[symbol] = 0
-
-    return prices
-
-def ensure_data_dir():
-    os.makedirs(DB_PATH.parent, exist_ok=True)
-
-def get_db():
-    ensure_data_dir()
-    return sqlite3.connect(DB_PATH)
-
-def get_config():
-    if CONFIG_PATH.exists():
-        return json.loads(CONFIG_PATH.read_text())
-    return {}
-
-def get_display_currency():
-    return get_config().get("display_currency", "AUD")
+import os
+
+from utils.config import get_config  # re-exported for older imports
+from utils.db import get_connection, resolve_db_path
+
+def get_token_prices(symbols: list[str]) -> dict:
+    """
+    For each token symbol, query Dexscreener search API and return AUD prices.
+    """
+    import requests  # only web3 commands pay for this import
+
+    from utils import metrics
+
+    prices = {}
+    for symbol in symbols:
+        try:
+            url = f"https://api.dexscreener.com/latest/dex/search?q={symbol}"
+            with metrics.timed("http", "dexscreener search") as call:
+                r = requests.get(url, timeout=5)
+                result = r.json().get("pairs", [])
+                call.rows = len(result)
+            if not result:
+                prices[symbol] = 0
+                continue
+
+            # Prefer USD-quoted price
+            for pair in result:
+                if pair.get("quoteToken", {}).get("symbol", "").upper() == "USD":
+                    usd = float(pair.get("priceUsd", 0.0))
+                    prices[symbol] = round(usd * 1.54, 6)
+                    break
+            else:
+                # Fallback: take first match
+                usd = float(result[0].get("priceUsd", 0.0))
+                prices[symbol] = round(usd * 1.54, 6)
+
+        except Exception:
+            prices[symbol] = 0
+
+    return prices
+
+def ensure_data_dir():
+    os.makedirs(resolve_db_path().parent, exist_ok=True)
+
+def get_db():
+    """The shared, tuned per-process connection (see utils/db.py)."""
+    return get_connection()
+
+def check_date(value, option):
+    """Reject a --since/--until style option that is not YYYY-MM-DD."""
+    if value:
+        from datetime import datetime
+
+        import typer
+
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            raise typer.BadParameter(f"{value!r} is not a YYYY-MM-DD date", param_hint=option)
@@ -0,0 +1,73 @@
+# utils/items.py
+"""Expense line items.
+
+`add-expense --metadata` keeps the purchased items as a JSON array on the
+journal row: plain names, or {"item": ..., "qty": ..., "price": ...}
+objects with the unit price in major units. Triggers in utils/schema.py
+copy them into expense_items (one row per item, name lower-cased, price
+in minor units) whenever an expense is written, so item questions are
+answered with an indexed join instead of parsing every row's JSON.
+
+Each item row carries the amount it accounts for: price x qty when the
+metadata has a price, otherwise an equal share of what the priced items
+leave of the expense (the last unpriced item also takes the cents that do
+not divide evenly). An expense's item amounts therefore add up to the
+expense, and summed per item they answer "how much went on coffee".
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Optional, Sequence
+
+from utils.schema import expense_items_sql
+
+ORDERS = {"spent": "spent DESC", "purchases": "purchases DESC", "qty": "qty DESC"}
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Refill expense_items from the journal; returns the number of items. The caller commits."""
+    conn.execute("DELETE FROM expense_items")
+    for sql in expense_items_sql("journal"):
+        conn.execute(sql)
+    return conn.execute("SELECT COUNT(*) FROM expense_items").fetchone()[0]
+
+
+def _like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def totals(conn: sqlite3.Connection, since: Optional[str] = None, until: Optional[str] = None,
+           category: Optional[str] = None, items: Sequence[str] = (), order: str = "spent",
+           limit: Optional[int] = None) -> sqlite3.Cursor:
+    """Per item: (item, purchases, qty, spent, last_bought), for expenses dated
+    in [since, until]; `items` keeps the names containing any of the strings."""
+    return conn.execute(*totals_query(since, until, category, items, order, limit))
+
+
+def totals_query(since: Optional[str] = None, until: Optional[str] = None, category: Optional[str] = None,
+                 items: Sequence[str] = (), order: str = "spent", limit: Optional[int] = None) -> tuple[str, list]:
+    """totals()' SELECT and parameters (also checked by doctor, see utils/query_plan.py)."""
+    sql = (
+        "SELECT i.item, COUNT(DISTINCT i.expense_id) AS purchases, SUM(COALESCE(i.qty, 1)) AS qty, "
+        "SUM(i.amount) AS spent, MAX(j.date) AS last_bought "
+        "FROM journal j JOIN expense_items i ON i.expense_id = j.id "
+        "WHERE j.kind = 'expense'"
+    )
+    params: list = []
+    if since:
+        sql += " AND j.date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND j.date <= ?"
+        params.append(until)
+    if category:
+        sql += " AND j.category = ?"
+        params.append(category)
+    if items:
+        sql += " AND (" + " OR ".join("i.item LIKE ? ESCAPE '\\'" for _ in items) + ")"
+        params += [f"%{_like(item.strip().lower())}%" for item in items]
+    sql += f" GROUP BY i.item ORDER BY {ORDERS[order]}, i.item"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
@@ -0,0 +1,59 @@
+# utils/journal.py
+"""Postings in the journal table.
+
+Every balance movement is one signed posting (+ credit, - debit) with a
+kind (utils.schema.KINDS). A transfer is two postings that name each
+other as counterparty. The old income/expenses tables are views over
+the journal, so existing queries and scripts keep working, while the
+balance of every account is one indexed GROUP BY away.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Optional
+
+
+def post(
+    conn: sqlite3.Connection,
+    account: str,
+    amount: int,
+    kind: str,
+    date: Optional[str] = None,
+    *,
+    counterparty: Optional[str] = None,
+    category: Optional[str] = None,
+    description: Optional[str] = None,
+    note: Optional[str] = None,
+    metadata: Optional[str] = None,
+) -> int:
+    """Insert one posting (date defaults to today) and return its id. The caller commits."""
+    cur = conn.execute(
+        "INSERT INTO journal (account, amount, date, kind, counterparty, category, description, note, metadata) "
+        "VALUES (?, ?, COALESCE(?, DATE('now')), ?, ?, ?, ?, ?, ?)",
+        (account, amount, date, kind, counterparty, category, description, note, metadata),
+    )
+    return cur.lastrowid
+
+
+def post_transfer(conn: sqlite3.Connection, from_account: str, to_account: str, amount: int,
+                  date: Optional[str] = None) -> None:
+    post(conn, from_account, -amount, "transfer", date, counterparty=to_account,
+         description=f"Transfer to {to_account}")
+    post(conn, to_account, amount, "transfer", date, counterparty=from_account,
+         description=f"Transfer from {from_account}")
+
+
+def verify_balances(conn: sqlite3.Connection) -> list[tuple[str, int, int]]:
+    """[(account, accounts.balance, journal total)] for every account that disagrees.
+
+    Undated postings are left out, as in balance_as_of().
+    """
+    return conn.execute(
+        """
+        SELECT a.name, COALESCE(a.balance, 0), COALESCE(j.total, 0)
+        FROM accounts a
+        LEFT JOIN (SELECT account, SUM(amount) AS total FROM journal
+                   WHERE date IS NOT NULL GROUP BY account) j ON j.account = a.name
+        WHERE COALESCE(a.balance, 0) != COALESCE(j.total, 0)
+        """
+    ).fetchall()
@@ -0,0 +1,150 @@
+# utils/listing.py
+"""Long listings: keyset pages, rows printed as they arrive, a pager on a TTY.
+
+Every listing is ordered by a sort key plus the row id, so `--after KEY,ID`
+(the token printed under a truncated listing) continues with a
+row-value comparison the index can seek to, instead of OFFSET re-reading
+everything before it. `--limit N` stops after N rows.
+
+Rows are fetched and printed in chunks: the first chunk is sized to the
+terminal so the first screen appears immediately, however large the
+table. When stdout is a terminal the output goes through $PAGER
+(default `less`, with LESS=FRX so short output prints as usual);
+VAULTPLAN_PAGER overrides it and an empty value turns paging off.
+"""
+from __future__ import annotations
+
+import os
+import shlex
+import sqlite3
+import subprocess
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, NamedTuple, Optional
+
+import typer
+
+if TYPE_CHECKING:  # rich is only imported once something is printed
+    from rich.console import Console
+    from rich.table import Table
+
+CHUNK_ROWS = 500
+
+
+class Listing(NamedTuple):
+    title: str
+    columns: list[tuple[str, dict]]  # (header, rich Column options)
+    cells: Callable[[tuple], list[str]]  # row -> table cells
+    cursor: Callable[[tuple], str]  # row -> --after token
+    render: Optional[Callable[[tuple], object]] = None  # one renderable per row instead of a table
+    option: str = "--after"  # the option that takes the cursor
+
+
+def parse_after(token: Optional[str], numeric: bool = False, option: str = "--after") -> Optional[tuple]:
+    """'2025-06-01,1234' -> ('2025-06-01', 1234); '17' -> (17,) when numeric."""
+    if not token:
+        return None
+    try:
+        if numeric:
+            return (int(token),)
+        key, _, row_id = token.rpartition(",")
+        return key, int(row_id)
+    except ValueError:
+        raise typer.BadParameter(f"{token!r} is not a cursor printed by a previous listing", param_hint=option)
+
+
+def keyset(sql: str, after: Optional[tuple], key: str, descending: bool = True) -> tuple[str, tuple]:
+    """Append the `(key, id)` cursor condition and ORDER BY to a query that ends in its WHERE clause."""
+    direction, op = ("DESC", "<") if descending else ("ASC", ">")
+    params: tuple = ()
+    if after is not None:
+        if len(after) == 1:
+            sql += f" AND id {op} ?"
+        else:
+            sql += f" AND ({key}, id) {op} (?, ?)"
+        params = tuple(after)
+    order = "id" if key == "id" else f"{key} {direction}, id"
+    return f"{sql} ORDER BY {order} {direction}", params
+
+
+def _pager_closed() -> None:
+    raise BrokenPipeError
+
+
+@contextmanager
+def pager(console: Console) -> Iterator[Console]:
+    """A console that writes to $PAGER when stdout is a terminal, else `console` itself."""
+    command = os.environ.get("VAULTPLAN_PAGER", os.environ.get("PAGER", "less"))
+    if not command or not sys.stdout.isatty():
+        yield console
+        return
+    try:
+        proc = subprocess.Popen(
+            shlex.split(command), stdin=subprocess.PIPE, text=True, encoding="utf-8",
+            env={**os.environ, "LESS": os.environ.get("LESS", "FRX")},
+        )
+    except OSError:
+        yield console
+        return
+    from rich.console import Console
+
+    paged = Console(file=proc.stdin, force_terminal=True, width=console.width)
+    paged.on_broken_pipe = _pager_closed  # rich would exit the whole process
+    try:
+        yield paged
+    except BrokenPipeError:
+        pass  # the pager was closed before the end of the listing
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+
+
+def _table(listing: Listing, first: bool, widths: Optional[list[int]]) -> Table:
+    from rich.table import Table
+
+    table = Table(title=listing.title if first else None, show_header=first)
+    for i, (header, options) in enumerate(listing.columns):
+        table.add_column(header, min_width=widths[i] if widths else None, **options)
+    return table
+
+
+def stream(listing: Listing, cur: sqlite3.Cursor, console: Console, limit: Optional[int] = None,
+           chunk_rows: int = CHUNK_ROWS) -> int:
+    """Print `cur`'s rows as tables of at most `chunk_rows` (or one listing.render
+    per row), stopping after `limit`.
+
+    Returns the number of rows printed. When rows remain beyond `limit`, the
+    --after token for the next page is printed under the listing.
+    """
+    printed, last, more = 0, None, False
+    widths: Optional[list[int]] = None
+    with pager(console) as out:
+        size = max(out.height - 8, 10)  # first screen
+        while True:
+            want = size if limit is None else min(size, limit - printed)
+            if want <= 0:
+                more = cur.fetchone() is not None
+                break
+            rows = cur.fetchmany(want)
+            if not rows:
+                break
+            printed += len(rows)
+            last = rows[-1]
+            size = chunk_rows
+            if listing.render is not None:
+                for row in rows:
+                    out.print(listing.render(row))
+                continue
+            cells = [listing.cells(row) for row in rows]
+            if widths is None:  # later chunks line up with the first one
+                widths = [max(len(header), *(len(c[i]) for c in cells)) for i, (header, _) in enumerate(listing.columns)]
+            table = _table(listing, printed == len(rows), widths)
+            for row_cells in cells:
+                table.add_row(*row_cells)
+            out.print(table)
+        if more:
+            out.print(f"[dim]… more rows: {listing.option} {shlex.quote(listing.cursor(last))}[/dim]", highlight=False)
+    return printed
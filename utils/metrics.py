@@ -0,0 +1,180 @@
+# utils/metrics.py
+"""Command latency and outcome, recorded in the vault itself.
+
+commands/registry.run() records one `metrics` row per command run
+(duration, rows changed, exit status) and the web3 fetchers one per HTTP
+call (duration, rows returned, success). HTTP calls are buffered and
+written with their command's row after it finished, in one INSERT and
+one commit on the shared connection, so a run costs well under a
+millisecond more. By then the command's transaction is over (registry
+rolls back one it left open), so a failed run's row is kept; a nested
+run inside a caller's open transaction leaves its rows buffered for the
+caller's row instead of riding along with that transaction. Only
+runs that opened the database are recorded (not `--help`); batch lines
+are covered by the `batch` row. VAULTPLAN_METRICS=0 turns it off.
+
+The table is a ring: once it holds more than KEEP rows the oldest are
+pruned. summarize() computes runs, failures and nearest-rank
+p50/p95/p99 per (kind, name) in SQL; write_prom() turns that into a
+node_exporter textfile-collector file.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+KEEP = 100_000
+PRUNE_EVERY = 500  # ids
+
+_pending: list[tuple] = []
+
+
+def enabled() -> bool:
+    return os.environ.get("VAULTPLAN_METRICS", "1") not in ("0", "false", "no", "")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class Call:
+    """Set .rows (and .ok) inside a timed() block."""
+
+    rows: Optional[int] = None
+    ok: bool = True
+    detail: Optional[str] = None
+
+
+@contextmanager
+def timed(kind: str, name: str) -> Iterator[Call]:
+    """Record the duration and outcome of the block; an exception marks it failed."""
+    call = Call()
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException as err:
+        call.ok, call.detail = False, type(err).__name__
+        raise
+    finally:
+        if enabled():
+            _pending.append((_now(), kind, name, time.perf_counter() - start, call.rows,
+                             int(call.ok), call.detail))
+
+
+def changes() -> int:
+    """Rows changed so far on the shared connection (0 if it is not open yet)."""
+    from utils.db import shared_connection
+
+    conn = shared_connection()
+    return conn.total_changes if conn is not None else 0
+
+
+def record_command(name: str, seconds: float, code: int, changed: int) -> None:
+    """Write the command's row and any buffered HTTP rows (only if the database is open)."""
+    from utils.db import shared_connection
+
+    conn = shared_connection()
+    rows = _pending[:]
+    _pending.clear()
+    if conn is None or conn.held or not enabled():
+        return
+    rows.append((_now(), "command", name, seconds, changed, int(code == 0),
+                 None if code == 0 else f"exit {code}"))
+    if conn.in_transaction:
+        _pending[:0] = rows  # a caller's transaction is still open: write them with the caller's row
+        return
+    try:
+        conn.executemany(
+            "INSERT INTO metrics (at, kind, name, seconds, rows, ok, detail) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        last = conn.execute("SELECT MAX(id) FROM metrics").fetchone()[0] or 0
+        if last % PRUNE_EVERY < len(rows):
+            conn.execute("DELETE FROM metrics WHERE id <= ?", (last - KEEP,))
+        conn.commit()
+    except sqlite3.Error:  # read-only or locked vault: losing a sample beats failing the command
+        if conn.in_transaction:
+            conn.rollback()
+
+
+class Summary(NamedTuple):
+    kind: str
+    name: str
+    runs: int
+    failures: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    total: float  # seconds
+    avg_rows: Optional[float]
+    last_at: str
+
+
+# nearest rank: the ceil(p * n)-th fastest run
+SUMMARY_SQL = """
+    WITH ranked AS (
+        SELECT kind, name, seconds, ok, rows, at,
+               ROW_NUMBER() OVER (PARTITION BY kind, name ORDER BY seconds) AS rn,
+               COUNT(*) OVER (PARTITION BY kind, name) AS n
+        FROM metrics
+        WHERE at >= ?
+    )
+    SELECT kind, name, COUNT(*), SUM(1 - ok),
+           MAX(CASE WHEN rn = (50 * n + 99) / 100 THEN seconds END),
+           MAX(CASE WHEN rn = (95 * n + 99) / 100 THEN seconds END),
+           MAX(CASE WHEN rn = (99 * n + 99) / 100 THEN seconds END),
+           MAX(seconds), SUM(seconds), AVG(rows), MAX(at)
+    FROM ranked
+    GROUP BY kind, name
+    ORDER BY kind, name
+"""
+
+
+def summarize(conn: sqlite3.Connection, since: str) -> list[Summary]:
+    """Per (kind, name) statistics of the runs recorded at or after `since` (UTC timestamp)."""
+    return [Summary(*row) for row in conn.execute(SUMMARY_SQL, (since,))]
+
+
+def _number(value) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prom_text(summaries: list[Summary], window: str) -> str:
+    """node_exporter textfile-collector format; every value is a gauge over `window`."""
+    families = [
+        ("vaultplan_duration_seconds", f"Latency quantiles over the last {window}.",
+         lambda s: [({"quantile": q}, v) for q, v in (("0.5", s.p50), ("0.95", s.p95), ("0.99", s.p99))]),
+        ("vaultplan_duration_seconds_max", f"Slowest run over the last {window}.", lambda s: [({}, s.max)]),
+        ("vaultplan_runs", f"Runs recorded over the last {window}.", lambda s: [({}, s.runs)]),
+        ("vaultplan_failures", f"Failed runs over the last {window}.", lambda s: [({}, s.failures)]),
+        ("vaultplan_last_run_timestamp_seconds", "Unix time of the latest recorded run.",
+         lambda s: [({}, datetime.strptime(s.last_at, "%Y-%m-%dT%H:%M:%S")
+                     .replace(tzinfo=timezone.utc).timestamp())]),
+    ]
+    lines = []
+    for metric, help_text, samples in families:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for s in summaries:
+            for extra, value in samples(s):
+                labels = {"kind": s.kind, "name": s.name, **extra}
+                body = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+                lines.append(f"{metric}{{{body}}} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prom(path: Path, summaries: list[Summary], window: str) -> None:
+    """Write atomically (the collector may read at any moment)."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(prom_text(summaries, window))
+    os.replace(tmp, path)
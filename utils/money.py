@@ -0,0 +1,109 @@
+# utils/money.py
+"""Money as integers.
+
+Every amount column stores int64 minor units. The number of decimal
+places is fixed once per vault, when it is created or converted, and
+kept in `vault_meta.money_scale`: DEFAULT_SCALE (cents) unless
+config.json sets "money_scale" (0 for whole yen, 8 for BTC, ...).
+The display currency never picks it, so switching currency later
+changes the symbol, never the meaning of the stored numbers. Token quantities
+(web3_transactions.amount_token) use a fixed TOKEN_SCALE.
+
+Conversion only happens at the edges:
+• amount()    — Typer parser: "$1,234.50" → 123450
+• fmt()       — 123450 → "1,234.50" (the caller adds the symbol)
+• as_float()  — 123450 → 1234.5 for JSON exports
+Inside, SUMs and comparisons are plain integer arithmetic and exact.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Optional, Union
+
+from utils.config import CURRENCY_SYMBOLS
+
+DEFAULT_SCALE = 2
+TOKEN_SCALE = 8  # 1e-8 token units; keeps a 92-billion-token balance inside int64
+
+# currencies whose minor unit is not 1/100 (a hint for "money_scale"; never applied on its own)
+CURRENCY_SCALES = {
+    "JPY": 0,
+    "KRW": 0,
+    "BTC": 8,
+    "ETH": 8,
+}
+
+Number = Union[int, float, str, Decimal]
+
+_SYMBOLS = frozenset(CURRENCY_SYMBOLS.values())
+
+_scale: Optional[int] = None
+
+
+def currency_scale(code: str) -> int:
+    return CURRENCY_SCALES.get(code.upper(), DEFAULT_SCALE)
+
+
+def new_vault_scale() -> int:
+    """Decimal places for a vault being created or converted: config "money_scale", else DEFAULT_SCALE."""
+    from utils.config import get_config
+
+    chosen = get_config().money_scale
+    return DEFAULT_SCALE if chosen is None else chosen
+
+
+def scale() -> int:
+    """Decimal places of this vault's fiat amounts (read once per process)."""
+    global _scale
+    if _scale is None:
+        from utils.db import get_connection
+
+        row = get_connection().execute(
+            "SELECT value FROM vault_meta WHERE key = 'money_scale'"
+        ).fetchone()
+        _scale = int(row[0]) if row else DEFAULT_SCALE
+    return _scale
+
+
+def to_minor(value: Number, places: Optional[int] = None) -> int:
+    """Round a major-unit amount to integer minor units (banker's rounding)."""
+    places = scale() if places is None else places
+    try:
+        exact = Decimal(value) if isinstance(value, (int, Decimal)) else Decimal(str(value))
+        return int(exact.scaleb(places).to_integral_value(ROUND_HALF_EVEN))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"not an amount: {value!r}") from None
+
+
+def to_major(units: Optional[int], places: Optional[int] = None) -> Decimal:
+    places = scale() if places is None else places
+    return Decimal(units or 0).scaleb(-places)
+
+
+def as_float(units: Optional[int], places: Optional[int] = None) -> float:
+    return float(to_major(units, places))
+
+
+def fmt(units: Optional[int], places: Optional[int] = None, grouping: bool = True) -> str:
+    places = scale() if places is None else places
+    spec = f"{',' if grouping else ''}.{places}f"
+    return format(to_major(units, places), spec)
+
+
+def amount(text: str) -> int:
+    """Typer parser for amount arguments: accepts 4.5, $4.50, 1,234.50, €3."""
+    import typer
+
+    cleaned = text.strip().replace(",", "")
+    for symbol in _SYMBOLS:
+        cleaned = cleaned.replace(symbol, "")
+    try:
+        units = to_minor(cleaned.strip())
+        exact = to_major(units) == Decimal(cleaned.strip())
+    except (ValueError, InvalidOperation):
+        raise typer.BadParameter(f"{text!r} is not an amount")
+    if not exact:
+        places = scale()
+        allowed = "no decimal places" if places == 0 else f"at most {places} decimal place{'s' if places != 1 else ''}"
+        raise typer.BadParameter(f"{text!r}: amounts in this vault have {allowed} (vault_meta money_scale)")
+    return units
@@ -0,0 +1,124 @@
+# utils/output.py
+"""Machine-readable output for the read commands.
+
+`vaultplan --format json|csv|tsv <command>` prints plain rows instead of
+rich tables, for dashboards and scripts that poll the vault:
+
+• json — one JSON object per line: {"record": <what>, ...columns}
+• csv / tsv — a header line, then one line per row; a command that
+              prints several record types separates them by a blank line
+
+Money is in major units (JSON numbers, plain decimals in csv/tsv). Rows
+go from the cursor to stdout `fetch_size` at a time and rich is never
+imported, so a poll costs the query and little else.
+
+`console` stands in for a rich Console and only creates (and imports)
+one when something is printed through it.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sqlite3
+import sys
+from itertools import islice
+from typing import Iterable, Optional, Sequence
+
+from utils import money
+from utils.config import get_config
+
+FORMATS = ("table", "json", "csv", "tsv")
+
+_format = "table"
+_sections = 0  # record types printed so far in csv/tsv
+
+
+def set_format(fmt: str) -> None:
+    """Select the output format for this invocation (the global --format option)."""
+    global _format, _sections
+    if fmt not in FORMATS:
+        import typer
+
+        raise typer.BadParameter(f"{fmt!r} is not one of {', '.join(FORMATS)}", param_hint="--format")
+    _format, _sections = fmt, 0
+
+
+def machine() -> bool:
+    """True when rows should be written as json/csv/tsv instead of rich tables."""
+    return _format != "table"
+
+
+class _LazyConsole:
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def _stdout_closed() -> None:
+    # e.g. `| head`: stop quietly and keep the interpreter from complaining at exit
+    try:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+def write_rows(record: str, columns: Sequence[str], rows: Iterable[Sequence],
+               amounts: tuple = ()) -> int:
+    """Write `rows` (tuples in `columns` order) in the selected format; returns how many.
+
+    amounts is (column, decimal places or None for the vault scale), as in
+    utils.export.Section.
+    """
+    global _sections
+    out = sys.stdout
+    money_at = [(columns.index(col), places) for col, places in amounts if col in columns]
+    written = 0
+    try:
+        if _format == "json":
+            for row in rows:
+                values = list(row)
+                for i, places in money_at:
+                    if values[i] is not None:
+                        values[i] = money.as_float(values[i], places)
+                out.write(json.dumps({"record": record, **dict(zip(columns, values))}, default=str) + "\n")
+                written += 1
+        else:
+            writer = csv.writer(out, delimiter="\t" if _format == "tsv" else ",", lineterminator="\n")
+            if _sections:
+                out.write("\n")
+            _sections += 1
+            writer.writerow(columns)
+            for row in rows:
+                values = list(row)
+                for i, places in money_at:
+                    if values[i] is not None:
+                        values[i] = money.fmt(values[i], places, grouping=False)
+                writer.writerow(values)
+                written += 1
+        out.flush()
+    except BrokenPipeError:
+        _stdout_closed()
+    return written
+
+
+def write_cursor(record: str, cur: sqlite3.Cursor, amounts: tuple = (),
+                 limit: Optional[int] = None) -> int:
+    """write_rows() straight from a cursor, fetch_size rows at a time, stopping after `limit`."""
+    size = get_config().fetch_size
+    columns = [d[0] for d in cur.description]
+
+    def rows():
+        while batch := cur.fetchmany(size):
+            yield from batch
+
+    return write_rows(record, columns, rows() if limit is None else islice(rows(), limit), amounts)
@@ -0,0 +1,198 @@
+# utils/profiling.py
+"""`vaultplan --profile <command>`: where one invocation spends its time.
+
+A Session is started by commands/registry.run() before anything else is
+loaded and splits the run into phases:
+
+• startup — interpreter start-up up to the registry (CPU time only)
+• load    — building the Typer app, i.e. importing the command module
+• prepare — opening the database and checking the schema
+• command — the command itself, rendering included
+
+Each phase gets wall time, CPU time and the time spent importing
+modules (from its own cProfile run). Every SQL statement is recorded
+through the shared connection: utils/db.py times execute/fetch calls
+and counts rows, and sqlite3's trace callback sees everything SQLite
+runs, trigger programs and implicit BEGIN/COMMIT included.
+
+The report (stderr, so `--format json` output stays clean) ranks the
+slowest statements and functions; `--profile-out FILE` also writes the
+merged cProfile data for pstats/snakeviz. cProfile slows pure-Python
+code down, so compare profiles with profiles, not with plain runs.
+"""
+from __future__ import annotations
+
+import cProfile
+import pstats
+import re
+import sys
+import time
+from typing import IO, NamedTuple, Optional
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|-?\b\d+(?:\.\d+)?\b|\bNULL\b", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def statement_key(sql: str) -> str:
+    """SQL with literals replaced by ?, so bound and traced (expanded) forms match."""
+    return _LITERALS.sub("?", _SPACES.sub(" ", sql).strip())
+
+
+class Phase(NamedTuple):
+    name: str
+    wall: Optional[float]  # seconds
+    cpu: float
+    imports: float  # seconds inside the import system
+    modules: int  # modules imported
+
+
+class Statement:
+    __slots__ = ("text", "calls", "seconds", "rows", "runs")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0  # execute()/executemany() calls through the connection
+        self.seconds = 0.0  # executing + fetching
+        self.rows = 0  # fetched, or changed by DML
+        self.runs = 0  # statement runs seen by the trace callback (triggers, implicit BEGIN/COMMIT)
+
+
+class Session:
+    def __init__(self, argv: list[str]):
+        self.argv = argv
+        self.phases: list[Phase] = [Phase("startup", None, time.process_time(), 0.0, len(sys.modules))]
+        self.statements: dict[str, Statement] = {}
+        self.stats: Optional[pstats.Stats] = None
+        self._phase: Optional[tuple] = None
+        self._begin("load")
+
+    # -- phases --------------------------------------------------------------
+    def _begin(self, name: str) -> None:
+        profile = cProfile.Profile()
+        self._phase = (name, time.perf_counter(), time.process_time(), len(sys.modules), profile)
+        profile.enable()
+
+    def _end(self) -> None:
+        if self._phase is None:
+            return
+        name, wall, cpu, modules, profile = self._phase
+        profile.disable()
+        self._phase = None
+        stats = pstats.Stats(profile)
+        imports = sum(ct for (_, _, func), (_, _, _, ct, _) in stats.stats.items() if func == "_find_and_load")
+        self.phases.append(Phase(name, time.perf_counter() - wall, time.process_time() - cpu,
+                                 imports, len(sys.modules) - modules))
+        if self.stats is None:
+            self.stats = stats
+        else:
+            self.stats.add(stats)
+
+    def mark(self, name: str) -> None:
+        """End the current phase and start `name`."""
+        self._end()
+        self._begin(name)
+
+    def finish(self) -> None:
+        self._end()
+
+    # -- SQL -----------------------------------------------------------------
+    def _statement(self, sql: str) -> Statement:
+        key = statement_key(sql)
+        found = self.statements.get(key)
+        if found is None:
+            found = self.statements[key] = Statement(_SPACES.sub(" ", sql).strip())
+        return found
+
+    def trace(self, sql: str) -> None:
+        """sqlite3 trace callback."""
+        self._statement(sql).runs += 1
+
+    def executed(self, sql: str, seconds: float, rows: int) -> Statement:
+        stmt = self._statement(sql)
+        if not stmt.calls:  # the trace saw it first, with the parameters filled in
+            stmt.text = _SPACES.sub(" ", sql).strip()
+        stmt.calls += 1
+        stmt.seconds += seconds
+        stmt.rows += rows
+        return stmt
+
+    # -- output --------------------------------------------------------------
+    def report(self, out: IO[str], top: int = 15) -> None:
+        write = out.write
+        timed = [p for p in self.phases if p.wall is not None]
+        wall = sum(p.wall for p in timed)
+        cpu = sum(p.cpu for p in self.phases)
+        write(f"\nProfile: vaultplan {' '.join(self.argv)}\n")
+        write(f"wall {wall * 1000:.1f} ms after start-up, cpu {cpu * 1000:.1f} ms in total\n\n")
+
+        write(f"{'phase':<10}{'wall ms':>10}{'cpu ms':>10}{'import ms':>11}{'modules':>9}\n")
+        for p in self.phases:
+            shown = "—" if p.wall is None else f"{p.wall * 1000:.1f}"
+            imports = "—" if p.wall is None else f"{p.imports * 1000:.1f}"
+            write(f"{p.name:<10}{shown:>10}{p.cpu * 1000:>10.1f}{imports:>11}{p.modules:>9}\n")
+
+        statements = sorted(self.statements.values(), key=lambda s: (s.seconds, s.runs), reverse=True)
+        sql_time = sum(s.seconds for s in statements)
+        write(f"\nSlowest SQL ({len(statements)} distinct statements, {sum(s.runs for s in statements)} runs "
+              f"traced, {sql_time * 1000:.1f} ms timed)\n")
+        write(f"{'ms':>9}{'calls':>7}{'rows':>9}{'runs':>7}  statement\n")
+        for s in statements[:top]:
+            text = s.text if len(s.text) <= 90 else s.text[:87] + "..."
+            write(f"{s.seconds * 1000:>9.2f}{s.calls:>7}{s.rows:>9}{s.runs:>7}  {text}\n")
+
+        if self.stats is not None:
+            write(f"\nSlowest functions (own time)\n{'own ms':>9}{'cum ms':>9}{'calls':>8}  function\n")
+            ranked = sorted(self.stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+            for (filename, line, func), (_, calls, own, cumulative, _) in ranked[:top]:
+                where = func if filename == "~" else f"{_short(filename)}:{line}({func})"
+                write(f"{own * 1000:>9.2f}{cumulative * 1000:>9.2f}{calls:>8}  {where}\n")
+        out.flush()
+
+    def dump(self, path: str) -> None:
+        if self.stats is not None:
+            self.stats.dump_stats(path)
+
+
+def _short(filename: str) -> str:
+    for root in sorted(sys.path, key=len, reverse=True):
+        if root and filename.startswith(root):
+            return filename[len(root):].lstrip("/\\")
+    return filename
+
+
+_session: Optional[Session] = None
+
+
+def current() -> Optional[Session]:
+    return _session
+
+
+def start(argv: list[str]) -> Session:
+    global _session
+    from utils import db
+
+    _session = Session(argv)
+    db.profile_with(_session)  # connections opened from now on are timed and traced
+    return _session
+
+
+def mark(name: str) -> None:
+    if _session is not None:
+        _session.mark(name)
+
+
+def stop(dump: Optional[str] = None, out: Optional[IO[str]] = None) -> None:
+    """Finish the session, print its report to `out` (stderr) and write the pstats file if asked."""
+    global _session
+    from utils import db
+
+    session, _session = _session, None
+    if session is None:
+        return
+    db.profile_with(None)
+    session.finish()
+    out = out or sys.stderr
+    session.report(out)
+    if dump:
+        session.dump(dump)
+        out.write(f"\ncProfile data written to {dump} (python -m pstats {dump})\n")
@@ -0,0 +1,111 @@
+# utils/query_plan.py
+"""Hot queries and their EXPLAIN QUERY PLAN check.
+
+_hot_queries() lists the statements the everyday commands run against
+tables that grow without bound, with representative parameters. The
+SQL comes from the helpers the commands themselves build it with, so
+the check cannot drift from what actually runs. `doctor`
+explains each one and flags any step that still scans a whole table,
+so a missing or unusable index shows up before a multi-year history
+makes the command slow.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import NamedTuple
+
+SINCE = "2000-01-01"
+
+
+class HotQuery(NamedTuple):
+    label: str
+    sql: str
+    params: tuple | list | dict = ()
+
+
+def _hot_queries() -> list[HotQuery]:
+    # the SQL the commands actually run, built by their own helpers
+    from commands.balance import ACCOUNTS_SQL, activity_query
+    from commands.debit import debits_query
+    from commands.export_summaries import EXPENSES_SQL, INCOME_SQL, TRANSFERS_SQL as EXPORT_TRANSFERS_SQL
+    from commands.goal import GOAL_SQL, goals_query
+    from commands.note import notes_query, tags_query
+    from commands.summary_web3 import RECENT_SQL
+    from utils.balances import CHECKPOINT_SQL, DELTA_SQL
+    from utils.export import delta_sql
+    from utils.items import totals_query
+    from utils.listing import keyset
+    from utils.metrics import SUMMARY_SQL
+    from utils.report import ACTIVITY_SQL, TRANSFERS_SQL
+
+    summary_activity, _ = keyset(ACTIVITY_SQL, None, "date")
+    summary_transfers, _ = keyset(TRANSFERS_SQL, None, "date")
+    return [
+        HotQuery("account lookup", ACCOUNTS_SQL + " WHERE name = ?", ("Bank",)),
+        HotQuery("balance activity (one account)", *activity_query("Bank", SINCE)),
+        HotQuery("balance activity (all accounts)", *activity_query(None, SINCE)),
+        HotQuery("summary activity", summary_activity, (SINCE,)),
+        HotQuery("summary transfers", summary_transfers, (SINCE,)),
+        HotQuery("export-summary income", INCOME_SQL, (SINCE,)),
+        HotQuery("export-summary expenses", EXPENSES_SQL, (SINCE,)),
+        HotQuery("export-summary transfers", EXPORT_TRANSFERS_SQL, (SINCE,)),
+        HotQuery("list-notes", *notes_query(SINCE)),
+        HotQuery("list-notes --account", *notes_query(SINCE, "Bank")),
+        HotQuery("list-notes --tag", *notes_query(SINCE, tags=["work", "win"])),
+        HotQuery("note-tags", *tags_query()),
+        HotQuery("note-tags --days", *tags_query(SINCE)),
+        HotQuery("item-totals", *totals_query(SINCE, "9999-12-31")),
+        HotQuery("top-items", *totals_query(order="spent", limit=10)),
+        HotQuery("list-debits", *debits_query()),
+        HotQuery("goal lookup", GOAL_SQL, ("Emergency",)),
+        HotQuery("list-goals", *goals_query("active")),
+        HotQuery("balance --as-of checkpoint", CHECKPOINT_SQL, ("Bank", SINCE)),
+        HotQuery("balance --as-of delta", DELTA_SQL, {"account": "Bank", "since": SINCE, "until": SINCE}),
+        HotQuery("export-summary --mode delta", delta_sql("journal", 0), ("journal", 0, 0)),
+        HotQuery("metrics window", SUMMARY_SQL, (SINCE,)),
+        HotQuery("summary-web3 latest", RECENT_SQL),
+    ]
+
+
+def explain(conn: sqlite3.Connection, query: HotQuery) -> list[str]:
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query.sql, query.params)]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Plan steps that read a whole table (no index involved).
+
+    Reading a subquery or CTE the plan has just built (MATERIALIZE x or
+    CO-ROUTINE x, then SCAN x) is not a table scan; how it was built is.
+    """
+    built = {step.split(" ", 1)[1] for step in plan if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    return [step for step in plan
+            if step.startswith("SCAN ") and " USING " not in step and step[len("SCAN "):] not in built]
+
+
+def _schema_only_copy(conn: sqlite3.Connection) -> sqlite3.Connection:
+    # Without sqlite_stat1 the planner picks an index whenever one fits, which
+    # is what we want to check; with stats from a small vault it rightly
+    # prefers scanning a 3-row table and every check would look like a miss.
+    copy = sqlite3.connect(":memory:")
+    rows = conn.execute(
+        "SELECT type, sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    order = {"table": 0, "index": 1, "view": 2, "trigger": 3}
+    for _, sql in sorted(rows, key=lambda row: order.get(row[0], 4)):
+        if sql.startswith("CREATE TABLE '"):
+            continue  # an FTS5 shadow table, created again by its virtual table
+        copy.execute(sql)
+    return copy
+
+
+def check_hot_queries(conn: sqlite3.Connection) -> list[tuple[HotQuery, list[str], list[str]]]:
+    """[(query, plan, full-scan steps)] for every registered hot query."""
+    copy = _schema_only_copy(conn)
+    results = []
+    try:
+        for query in _hot_queries():
+            plan = explain(copy, query)
+            results.append((query, plan, full_scans(plan)))
+    finally:
+        copy.close()
+    return results
@@ -0,0 +1,125 @@
+# utils/report.py
+"""The summary report, computed once and rendered many ways.
+
+summary_report() gathers everything `summary` shows: the aggregates
+(account balances, all-time income/expense totals from the monthly
+rollups, web3 totals per type) in ONE SQL pass, plus the two row listings
+(activity and transfers since `since`) as Sections that renderers
+iterate or stream (utils/export.py) without materialising them.
+
+`summary` (rich tables), `summary-export` (JSON) and anything else that
+wants the numbers read the same SummaryReport. The aggregates are cached
+per process (e.g. in `vaultplan serve`) until the database changes.
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from utils import money
+from utils.export import Section
+from utils.listing import keyset
+
+# one pass over three small sources; tag says which row is which. The totals
+# cover the whole history (TOTALS_PERIOD), not just the listings' window
+TOTALS_PERIOD = "all-time"
+AGGREGATES_SQL = """
+    SELECT 'account', name, type, balance FROM accounts
+    UNION ALL
+    SELECT 'totals', NULL,
+           COALESCE(SUM(total) FILTER (WHERE kind = 'income'), 0),
+           COALESCE(-SUM(total) FILTER (WHERE kind = 'expense'), 0)
+    FROM journal_monthly
+    UNION ALL
+    SELECT 'web3', type, COUNT(*), COALESCE(SUM(value_fiat), 0) FROM web3_transactions GROUP BY type
+"""
+# listings end in their WHERE clause; keyset() adds the cursor and ORDER BY
+ACTIVITY_SQL = """
+    SELECT date, amount, upper(substr(kind, 1, 1)) || substr(kind, 2) AS type,
+           CASE WHEN category IS NOT NULL THEN category || ': ' || COALESCE(description, '')
+                ELSE description END AS "desc",
+           account, id
+    FROM journal
+    WHERE date >= ? AND kind NOT IN ('transfer', 'opening')
+"""
+TRANSFERS_SQL = """
+    SELECT date, -amount AS amount, account AS "from",
+           COALESCE(counterparty, replace(description, 'Transfer to ', '')) AS "to", id
+    FROM journal
+    WHERE date >= ? AND kind = 'transfer' AND amount < 0
+"""
+
+
+class Web3Total(NamedTuple):
+    type: str
+    count: int
+    value_fiat: int
+
+
+class SummaryReport(NamedTuple):
+    days: int
+    since: str
+    accounts: list[tuple[str, str, int]]  # (name, type, balance)
+    total_income: int
+    total_expenses: int
+    web3: list[Web3Total]
+    warnings: list[str]
+
+    @property
+    def net(self) -> int:
+        return self.total_income - self.total_expenses
+
+    def activity(self, after: Optional[tuple] = None) -> Section:
+        sql, params = keyset(ACTIVITY_SQL, after, "date")
+        return Section("recent_activity", sql, (self.since, *params), (("amount", None),))
+
+    def transfers(self, after: Optional[tuple] = None) -> Section:
+        sql, params = keyset(TRANSFERS_SQL, after, "date")
+        return Section("transfers", sql, (self.since, *params), (("amount", None),))
+
+    def header(self) -> dict:
+        """The aggregates as plain JSON values (major units)."""
+        return {
+            "accounts": [{"name": n, "type": t, "balance": money.as_float(b)} for n, t, b in self.accounts],
+            "totals_period": TOTALS_PERIOD,
+            "total_income": money.as_float(self.total_income),
+            "total_expenses": money.as_float(self.total_expenses),
+            "net": money.as_float(self.net),
+            "web3": [{"type": w.type, "count": w.count, "total_fiat": money.as_float(w.value_fiat)}
+                     for w in self.web3],
+            "since": self.since,  # of recent_activity and transfers
+        }
+
+
+_cached: Optional[tuple[tuple, SummaryReport]] = None
+
+
+def _stamp(conn: sqlite3.Connection, since: str) -> tuple:
+    # data_version moves when another connection commits, total_changes when this one writes
+    return id(conn), since, conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+def summary_report(conn: sqlite3.Connection, days: int = 30) -> SummaryReport:
+    global _cached
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    stamp = _stamp(conn, since)
+    if _cached is not None and _cached[0] == stamp:
+        return _cached[1]
+
+    accounts, web3, warnings = [], [], []
+    total_income = total_expenses = 0
+    try:
+        for tag, name, a, b in conn.execute(AGGREGATES_SQL):
+            if tag == "account":
+                accounts.append((name, a, b))
+            elif tag == "totals":
+                total_income, total_expenses = a, b
+            else:
+                web3.append(Web3Total(name or "unknown", a, b))
+    except sqlite3.OperationalError as e:
+        warnings.append(f"Could not calculate totals: {e}")
+
+    report = SummaryReport(days, since, accounts, total_income, total_expenses, web3, warnings)
+    _cached = (stamp, report)
+    return report
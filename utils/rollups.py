@@ -0,0 +1,47 @@
+# utils/rollups.py
+"""Monthly rollups of the journal.
+
+journal_monthly holds one row per (account, month, kind, category) with
+the posting count, signed total, sum of credits and min/max amount.
+Triggers in utils/schema.py fold every journal insert, edit and delete
+into it, so summaries and exports read O(accounts x months x categories)
+rows instead of the whole ledger:
+
+    income   = SUM(total) WHERE kind = 'income'
+    money in = SUM(credits), money out = SUM(credits - total)
+
+rebuild() recomputes the table from the journal in one GROUP BY (used by
+the migration and by `vaultplan rebuild-rollups`); verify() is doctor's
+check that the triggers and the journal still agree.
+"""
+from __future__ import annotations
+
+import sqlite3
+
+_GROUPED = """
+    SELECT COALESCE(account, ''), COALESCE(substr(date, 1, 7), ''), kind, COALESCE(category, ''),
+           COUNT(*), SUM(amount), SUM(MAX(amount, 0)), MIN(amount), MAX(amount)
+    FROM journal
+    GROUP BY 1, 2, 3, 4
+"""
+
+_COLUMNS = "account, month, kind, category, count, total, credits, min_amount, max_amount"
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute journal_monthly from scratch; returns the number of groups. The caller commits."""
+    conn.execute("DELETE FROM journal_monthly")
+    conn.execute(f"INSERT INTO journal_monthly ({_COLUMNS}) {_GROUPED}")
+    return conn.execute("SELECT COUNT(*) FROM journal_monthly").fetchone()[0]
+
+
+def verify(conn: sqlite3.Connection) -> list[tuple]:
+    """Groups whose rollup row differs from the journal (missing on either side included)."""
+    return conn.execute(
+        f"""
+        SELECT * FROM (SELECT {_COLUMNS} FROM journal_monthly EXCEPT {_GROUPED})
+        UNION ALL
+        SELECT * FROM ({_GROUPED} EXCEPT SELECT {_COLUMNS} FROM journal_monthly)
+        """
+    ).fetchall()
+
@@ -0,0 +1,862 @@
+# utils/schema.py
+"""Single source of truth for the VaultPlan SQLite schema.
+
+TABLES describes the current shape of every table. MIGRATIONS is an
+ordered list of (version, function) steps; the version reached is kept
+in `PRAGMA user_version`, so the hot path is one integer comparison per
+process instead of CREATE TABLE / PRAGMA table_info on every command.
+
+Migration steps must be idempotent: a fresh database gets the current
+shape from step 1, and later steps only act on what is actually
+missing or out of date.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, NamedTuple
+
+# table -> [(column, declaration)], plus optional table constraints
+TABLES: dict[str, list[tuple[str, str]]] = {
+    "accounts": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("name", "TEXT"),
+        ("type", "TEXT"),
+        ("balance", "INTEGER"),
+        ("wallet", "TEXT"),
+    ],
+    # every balance movement, signed (+ credit / - debit); income and
+    # expenses are views over it (see VIEWS)
+    "journal": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("account", "TEXT"),
+        ("amount", "INTEGER NOT NULL"),
+        ("date", "TEXT"),
+        ("kind", "TEXT NOT NULL"),  # see KINDS
+        ("counterparty", "TEXT"),  # the other account of a transfer
+        ("category", "TEXT"),
+        ("description", "TEXT"),
+        ("note", "TEXT"),
+        ("metadata", "TEXT"),
+        ("import_hash", "TEXT"),  # set by `vaultplan import`, see UNIQUE_INDEXES
+    ],
+    "goals": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("name", "TEXT"),
+        ("target_amount", "INTEGER"),
+        ("saved_amount", "INTEGER DEFAULT 0"),
+        ("account", "TEXT"),
+        ("priority", "INTEGER DEFAULT 3"),
+        ("status", "TEXT DEFAULT 'active'"),
+        ("created_at", "TEXT"),
+        ("note", "TEXT"),
+        ("deadline", "TEXT"),
+    ],
+    "debits": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("label", "TEXT"),
+        ("amount_due", "INTEGER"),
+        ("amount_paid", "INTEGER DEFAULT 0"),
+        ("account", "TEXT"),
+        ("due_date", "TEXT"),
+        ("created_at", "TEXT"),
+        ("status", "TEXT DEFAULT 'open'"),
+        ("note", "TEXT"),
+    ],
+    "notes": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("mood", "INTEGER"),
+        ("note", "TEXT"),
+        ("account", "TEXT"),
+        ("tags", "TEXT"),
+        ("created_at", "TEXT"),
+    ],
+    # notes.tags (a JSON array) one row per tag, lower-cased; kept current by triggers
+    "note_tags": [
+        ("note_id", "INTEGER NOT NULL"),
+        ("tag", "TEXT NOT NULL"),
+    ],
+    # the items of an expense's metadata (a JSON array of names or
+    # {"item", "qty", "price"} objects), one row each; kept current by triggers
+    "expense_items": [
+        ("expense_id", "INTEGER NOT NULL"),  # journal.id
+        ("position", "INTEGER NOT NULL"),  # index in the metadata array
+        ("item", "TEXT NOT NULL"),  # lower-cased
+        ("qty", "REAL"),
+        ("price", "INTEGER"),  # unit price, when the metadata gives one
+        ("amount", "INTEGER NOT NULL"),  # price x qty, else an equal share of what the priced items leave
+    ],
+    "todos": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("task", "TEXT"),
+        ("completed", "INTEGER DEFAULT 0"),
+    ],
+    "web3_seen_tx": [
+        ("hash", "TEXT"),
+        ("direction", "TEXT"),
+        ("account", "TEXT"),
+        ("chain_id", "INTEGER"),
+        ("date", "TEXT"),
+    ],
+    "web3_scan_state": [
+        ("wallet", "TEXT"),
+        ("chain_id", "INTEGER"),
+        ("last_block", "INTEGER"),
+    ],
+    "web3_transactions": [
+        ("date", "TEXT"),
+        ("type", "TEXT"),  # "income" | "expense" | "swap"
+        ("symbol", "TEXT"),
+        ("amount_token", "INTEGER"),
+        ("price_at_time", "REAL"),
+        ("value_fiat", "INTEGER"),
+        ("account", "TEXT"),
+        ("description", "TEXT"),
+        ("hash", "TEXT UNIQUE"),
+    ],
+    # balance at the end of `as_of` (see utils/balances.py); as_of = OPENING_DATE
+    # holds the opening balance
+    "balance_checkpoints": [
+        ("account", "TEXT NOT NULL"),
+        ("as_of", "TEXT NOT NULL"),
+        ("balance", "INTEGER NOT NULL"),
+    ],
+    # journal aggregated per (account, month, kind, category), kept current by
+    # triggers (see utils/rollups.py); '' stands for a NULL key part
+    "journal_monthly": [
+        ("account", "TEXT NOT NULL"),
+        ("month", "TEXT NOT NULL"),  # YYYY-MM of journal.date
+        ("kind", "TEXT NOT NULL"),
+        ("category", "TEXT NOT NULL"),
+        ("count", "INTEGER NOT NULL"),
+        ("total", "INTEGER NOT NULL"),
+        ("credits", "INTEGER NOT NULL"),  # sum of the positive amounts only
+        ("min_amount", "INTEGER"),
+        ("max_amount", "INTEGER"),
+    ],
+    # row-level changes to CHANGE_TRACKED tables, written by triggers once the
+    # table has an export cursor (see utils/export.py delta exports)
+    "change_log": [
+        ("seq", "INTEGER PRIMARY KEY AUTOINCREMENT"),  # never reused, even after pruning
+        ("tbl", "TEXT NOT NULL"),
+        ("row_id", "INTEGER NOT NULL"),
+        ("op", "TEXT NOT NULL"),  # insert | update | delete
+    ],
+    # table -> last change_log.seq already exported
+    "export_cursors": [
+        ("name", "TEXT PRIMARY KEY"),
+        ("seq", "INTEGER NOT NULL"),
+        ("exported_at", "TEXT"),
+    ],
+    # one row per command run and per web3 HTTP call (see utils/metrics.py),
+    # pruned to the newest metrics.KEEP rows
+    "metrics": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("at", "TEXT NOT NULL"),  # UTC, YYYY-MM-DDTHH:MM:SS
+        ("kind", "TEXT NOT NULL"),  # command | http
+        ("name", "TEXT NOT NULL"),  # command name, or the API call
+        ("seconds", "REAL NOT NULL"),
+        ("rows", "INTEGER"),  # rows changed (commands) or returned (http)
+        ("ok", "INTEGER NOT NULL"),
+        ("detail", "TEXT"),  # exit code or error of a failed run
+    ],
+    # per-vault settings that must not follow config.json (e.g. money_scale)
+    "vault_meta": [
+        ("key", "TEXT PRIMARY KEY"),
+        ("value", "TEXT"),
+    ],
+}
+
+# Tables that were replaced by views. Migrations 1-5 still create and
+# reshape them on older vaults before migration 6 folds them into journal.
+LEGACY_TABLES: dict[str, list[tuple[str, str]]] = {
+    "income": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("account", "TEXT"),
+        ("amount", "INTEGER"),
+        ("source", "TEXT"),
+        ("date", "TEXT"),
+    ],
+    "expenses": [
+        ("id", "INTEGER PRIMARY KEY"),
+        ("account", "TEXT"),
+        ("amount", "INTEGER"),
+        ("category", "TEXT"),
+        ("description", "TEXT"),
+        ("date", "TEXT"),
+        ("note", "TEXT"),
+        ("metadata", "TEXT"),
+    ],
+}
+
+# journal.kind values
+KINDS = ("opening", "income", "expense", "transfer", "adjustment")
+
+# expense categories that stand for a kind rather than a user category
+KIND_CATEGORIES = {"__transfer__": "transfer", "__adjustment__": "adjustment"}
+
+# amount columns stored as integer minor units (see utils/money.py);
+# the ones listed in TOKEN_COLUMNS use money.TOKEN_SCALE instead
+MONEY_COLUMNS: dict[str, list[str]] = {
+    "accounts": ["balance"],
+    "journal": ["amount"],
+    "income": ["amount"],
+    "expenses": ["amount"],
+    "goals": ["target_amount", "saved_amount"],
+    "debits": ["amount_due", "amount_paid"],
+    "web3_transactions": ["amount_token", "value_fiat"],
+}
+TOKEN_COLUMNS = {("web3_transactions", "amount_token")}
+
+CONSTRAINTS: dict[str, list[str]] = {
+    "web3_seen_tx": ["PRIMARY KEY (hash, direction)"],
+    "web3_scan_state": ["PRIMARY KEY (wallet, chain_id)"],
+    "balance_checkpoints": ["PRIMARY KEY (account, as_of)"],
+    "journal_monthly": ["PRIMARY KEY (account, month, kind, category)"],
+    "note_tags": ["PRIMARY KEY (note_id, tag)"],
+    "expense_items": ["PRIMARY KEY (expense_id, position)"],
+}
+
+OPENING_DATE = "0000-00-00"  # sorts before every real YYYY-MM-DD
+
+# index name -> definition; each one backs a query checked by utils/query_plan.py
+INDEXES: dict[str, str] = {
+    "idx_accounts_name": "accounts(name)",
+    "idx_journal_date": "journal(date)",
+    "idx_journal_account_date": "journal(account, date)",
+    "idx_journal_kind_date": "journal(kind, date)",
+    "idx_notes_created_at": "notes(created_at)",
+    "idx_notes_account_created_at": "notes(account, created_at)",
+    "idx_web3_tx_date": "web3_transactions(date)",
+    "idx_goals_name": "goals(name)",
+    "idx_note_tags_tag": "note_tags(tag, note_id)",
+    "idx_expense_items_item": "expense_items(item)",
+    "idx_metrics_at": "metrics(at)",
+    "idx_goals_status": "goals(status)",  # list-goals: WHERE status = ? ORDER BY id
+    # partial index: only the rows the default listing looks at, in its order
+    "idx_debits_open_due": "debits(COALESCE(due_date, '')) WHERE status = 'open'",
+}
+
+
+# compatibility views: the pre-journal tables, row for row
+VIEWS: dict[str, str] = {
+    "income": """
+        SELECT id, account, amount, description AS source, date
+        FROM journal
+        WHERE kind = 'income' OR (kind = 'transfer' AND amount > 0)
+    """,
+    "expenses": """
+        SELECT id, account, -amount AS amount,
+               CASE kind WHEN 'transfer' THEN '__transfer__'
+                         WHEN 'adjustment' THEN '__adjustment__'
+                         ELSE category END AS category,
+               description, date, note, metadata
+        FROM journal
+        WHERE kind IN ('expense', 'adjustment') OR (kind = 'transfer' AND amount < 0)
+    """,
+}
+
+
+def _shape(table: str) -> list[tuple[str, str]]:
+    return TABLES[table] if table in TABLES else LEGACY_TABLES[table]
+
+
+def create_table_sql(table: str) -> str:
+    parts = [f"{col} {decl}" for col, decl in _shape(table)]
+    parts += CONSTRAINTS.get(table, [])
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(parts) + "\n)"
+
+
+# unique index name -> definition
+UNIQUE_INDEXES: dict[str, str] = {
+    # re-importing a statement skips the rows it already brought in
+    "idx_journal_import_hash": "journal(import_hash) WHERE import_hash IS NOT NULL",
+}
+
+
+def _existing(conn: sqlite3.Connection, kind: str) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    # older vaults run this from migrations that predate some tables
+    tables = _existing(conn, "table")
+    for unique, indexes in (("", INDEXES), ("UNIQUE ", UNIQUE_INDEXES)):
+        for name, definition in indexes.items():
+            if definition.split("(", 1)[0] in tables:
+                conn.execute(f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def create_views(conn: sqlite3.Connection) -> None:
+    for name, select in VIEWS.items():
+        conn.execute(f"CREATE VIEW IF NOT EXISTS {name} AS {select}")
+
+
+# a posting dated D changes every checkpoint of its account taken on or after D
+_BUMP = (
+    "UPDATE balance_checkpoints SET balance = balance {op} {row}.amount "
+    "WHERE account = {row}.account AND as_of >= {row}.date;"
+)
+_EXPENSE_KIND = (
+    "CASE NEW.category WHEN '__transfer__' THEN 'transfer' "
+    "WHEN '__adjustment__' THEN 'adjustment' ELSE 'expense' END"
+)
+_EXPENSE_CATEGORY = (
+    "CASE WHEN NEW.category IN ('__transfer__', '__adjustment__') THEN NULL ELSE NEW.category END"
+)
+
+# the journal_monthly group of a journal row
+_GROUP = {
+    "account": "COALESCE({row}.account, '')",
+    "month": "COALESCE(substr({row}.date, 1, 7), '')",
+    "kind": "{row}.kind",
+    "category": "COALESCE({row}.category, '')",
+}
+_ROLLUP_ADD = (
+    "INSERT INTO journal_monthly (account, month, kind, category, count, total, credits, min_amount, max_amount) "
+    "VALUES (" + ", ".join(_GROUP.values()).format(row="NEW") + ", "
+    "1, NEW.amount, MAX(NEW.amount, 0), NEW.amount, NEW.amount) "
+    "ON CONFLICT (account, month, kind, category) DO UPDATE SET "
+    "count = count + 1, total = total + excluded.total, credits = credits + excluded.credits, "
+    "min_amount = MIN(min_amount, excluded.min_amount), max_amount = MAX(max_amount, excluded.max_amount);"
+)
+_OLD_GROUP = " AND ".join(f"{col} = {expr}" for col, expr in _GROUP.items()).format(row="OLD")
+# min/max only need the (one account, one month) journal range when the
+# removed row was the extreme one
+_RECOMPUTE = (
+    "(SELECT {fn}(amount) FROM journal WHERE account IS OLD.account "
+    "AND date BETWEEN substr(OLD.date, 1, 7) || '-00' AND substr(OLD.date, 1, 7) || '-99' "
+    "AND kind = OLD.kind AND category IS OLD.category)"
+)
+_ROLLUP_REMOVE = (
+    "UPDATE journal_monthly SET count = count - 1, total = total - OLD.amount, "
+    "credits = credits - MAX(OLD.amount, 0), "
+    f"min_amount = CASE WHEN OLD.amount > min_amount THEN min_amount ELSE {_RECOMPUTE.format(fn='MIN')} END, "
+    f"max_amount = CASE WHEN OLD.amount < max_amount THEN max_amount ELSE {_RECOMPUTE.format(fn='MAX')} END "
+    f"WHERE {_OLD_GROUP}; "
+    f"DELETE FROM journal_monthly WHERE {_OLD_GROUP} AND count = 0;"
+)
+
+# trigger name -> definition (everything after CREATE TRIGGER <name>)
+TRIGGERS: dict[str, str] = {
+    "trg_journal_checkpoint_insert": (
+        f"AFTER INSERT ON journal BEGIN {_BUMP.format(op='+', row='NEW')} END"
+    ),
+    "trg_journal_checkpoint_update": (
+        "AFTER UPDATE OF amount, account, date ON journal BEGIN "
+        f"{_BUMP.format(op='-', row='OLD')} {_BUMP.format(op='+', row='NEW')} END"
+    ),
+    "trg_journal_checkpoint_delete": (
+        f"AFTER DELETE ON journal BEGIN {_BUMP.format(op='-', row='OLD')} END"
+    ),
+    "trg_journal_rollup_insert": f"AFTER INSERT ON journal BEGIN {_ROLLUP_ADD} END",
+    "trg_journal_rollup_update": (
+        "AFTER UPDATE OF amount, account, date, kind, category ON journal BEGIN "
+        f"{_ROLLUP_REMOVE} {_ROLLUP_ADD} END"
+    ),
+    "trg_journal_rollup_delete": f"AFTER DELETE ON journal BEGIN {_ROLLUP_REMOVE} END",
+    # writes through the compatibility views
+    "trg_income_insert": (
+        "INSTEAD OF INSERT ON income BEGIN "
+        "INSERT INTO journal (account, amount, date, kind, description) "
+        "VALUES (NEW.account, NEW.amount, NEW.date, 'income', NEW.source); END"
+    ),
+    "trg_income_update": (
+        "INSTEAD OF UPDATE ON income BEGIN "
+        "UPDATE journal SET account = NEW.account, amount = NEW.amount, "
+        "description = NEW.source, date = NEW.date WHERE id = OLD.id; END"
+    ),
+    "trg_income_delete": "INSTEAD OF DELETE ON income BEGIN DELETE FROM journal WHERE id = OLD.id; END",
+    "trg_expenses_insert": (
+        "INSTEAD OF INSERT ON expenses BEGIN "
+        "INSERT INTO journal (account, amount, date, kind, category, description, note, metadata) "
+        f"VALUES (NEW.account, -NEW.amount, NEW.date, {_EXPENSE_KIND}, {_EXPENSE_CATEGORY}, "
+        "NEW.description, NEW.note, NEW.metadata); END"
+    ),
+    "trg_expenses_update": (
+        "INSTEAD OF UPDATE ON expenses BEGIN "
+        "UPDATE journal SET account = NEW.account, amount = -NEW.amount, date = NEW.date, "
+        f"kind = {_EXPENSE_KIND}, category = {_EXPENSE_CATEGORY}, description = NEW.description, "
+        "note = NEW.note, metadata = NEW.metadata WHERE id = OLD.id; END"
+    ),
+    "trg_expenses_delete": "INSTEAD OF DELETE ON expenses BEGIN DELETE FROM journal WHERE id = OLD.id; END",
+}
+
+
+# the note_tags rows of NEW (in a trigger) or of every note; tags that are
+# not a JSON array of strings add none
+_NOTE_TAGS = (
+    "INSERT OR IGNORE INTO note_tags (note_id, tag) "
+    "SELECT {row}.id, lower(trim(value)) "
+    "FROM {source}json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END) "
+    "WHERE type = 'text' AND trim(value) != ''"
+)
+_TAGS_ADD = _NOTE_TAGS.format(row="NEW", source="") + ";"
+_TAGS_REMOVE = "DELETE FROM note_tags WHERE note_id = OLD.id;"
+
+TRIGGERS.update({
+    "trg_notes_tags_insert": f"AFTER INSERT ON notes BEGIN {_TAGS_ADD} END",
+    "trg_notes_tags_update": f"AFTER UPDATE OF id, tags ON notes BEGIN {_TAGS_REMOVE} {_TAGS_ADD} END",
+    "trg_notes_tags_delete": f"AFTER DELETE ON notes BEGIN {_TAGS_REMOVE} END",
+})
+
+
+# the expense_items rows of NEW (in a trigger) or of every expense. Amounts
+# in the metadata are major units; names and numbers of any other type
+# are ignored, and metadata that is not valid JSON adds no rows.
+_MINOR = (
+    "COALESCE((SELECT CAST(substr('100000000', 1, value + 1) AS INTEGER) FROM vault_meta "
+    "WHERE key = 'money_scale'), 100)"
+)  # 10^money_scale; scales run 0-8
+_ITEM_FIELD = (
+    "CASE WHEN j.type = 'object' AND json_type(j.value, '$.{field}') IN ('integer', 'real') "
+    "THEN json_extract(j.value, '$.{field}') END"
+)
+_EXPENSE_ITEMS = (
+    "INSERT INTO expense_items (expense_id, position, item, qty, price, amount) "
+    "SELECT id, position, item, qty, price, COALESCE(CAST(ROUND(price * COALESCE(qty, 1)) AS INTEGER), 0) FROM ("
+    "SELECT {row}.id AS id, j.key AS position, "
+    "lower(trim(CASE j.type WHEN 'text' THEN j.value "
+    "WHEN 'object' THEN json_extract(j.value, '$.item') END)) AS item, "
+    f"{_ITEM_FIELD.format(field='qty')} AS qty, "
+    f"CAST(ROUND({_ITEM_FIELD.format(field='price')} * {_MINOR}) AS INTEGER) AS price "
+    "FROM {source}json_each(CASE WHEN json_valid({row}.metadata) AND json_type({row}.metadata) = 'array' "
+    "THEN {row}.metadata ELSE '[]' END) j "
+    "WHERE {row}.kind = 'expense') "
+    "WHERE COALESCE(item, '') != ''"
+)
+# then the items without a price share what the priced ones leave of the
+# expense (never below 0): equal shares rounded down, and the last of them
+# also takes the remainder so the items add up to the expense
+_ITEM_LEFT = (
+    "MAX((SELECT -amount FROM journal WHERE id = expense_items.expense_id) - "
+    "(SELECT COALESCE(SUM(p.amount), 0) FROM expense_items p "
+    "WHERE p.expense_id = expense_items.expense_id AND p.price IS NOT NULL), 0)"
+)
+_ITEM_UNPRICED = "FROM expense_items u WHERE u.expense_id = expense_items.expense_id AND u.price IS NULL"
+_ITEM_SHARES = (
+    f"UPDATE expense_items SET amount = {_ITEM_LEFT} / (SELECT COUNT(*) {_ITEM_UNPRICED}) + "
+    f"CASE WHEN position = (SELECT MAX(u.position) {_ITEM_UNPRICED}) "
+    f"THEN {_ITEM_LEFT} % (SELECT COUNT(*) {_ITEM_UNPRICED}) ELSE 0 END "
+    "WHERE price IS NULL{only}"
+)
+
+
+def expense_items_sql(row: str) -> list[str]:
+    """Statements filling expense_items for NEW (in a trigger) or, with row="journal", every expense."""
+    if row == "journal":
+        return [_EXPENSE_ITEMS.format(row=row, source="journal, "), _ITEM_SHARES.format(only="")]
+    return [_EXPENSE_ITEMS.format(row=row, source=""), _ITEM_SHARES.format(only=f" AND expense_id = {row}.id")]
+
+
+_ITEMS_ADD = " ".join(f"{sql};" for sql in expense_items_sql("NEW"))
+_ITEMS_REMOVE = "DELETE FROM expense_items WHERE expense_id = OLD.id;"
+
+TRIGGERS.update({
+    "trg_journal_items_insert": f"AFTER INSERT ON journal WHEN NEW.metadata IS NOT NULL BEGIN {_ITEMS_ADD} END",
+    "trg_journal_items_update": (
+        f"AFTER UPDATE OF id, amount, kind, metadata ON journal BEGIN {_ITEMS_REMOVE} {_ITEMS_ADD} END"
+    ),
+    "trg_journal_items_delete": f"AFTER DELETE ON journal BEGIN {_ITEMS_REMOVE} END",
+})
+
+
+# tables whose inserts/updates/deletes feed change_log (all keyed by id)
+CHANGE_TRACKED = ("journal", "accounts", "goals", "debits", "notes")
+
+
+def _change_trigger(table: str, op: str, row: str) -> str:
+    # nothing is logged until a delta export has created the table's cursor
+    return (
+        f"AFTER {op.upper()} ON {table} "
+        f"WHEN EXISTS (SELECT 1 FROM export_cursors WHERE name = '{table}') BEGIN "
+        f"INSERT INTO change_log (tbl, row_id, op) VALUES ('{table}', {row}.id, '{op}'); END"
+    )
+
+
+TRIGGERS.update({
+    f"trg_{table}_change_{op}": _change_trigger(table, op, row)
+    for table in CHANGE_TRACKED
+    for op, row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD"))
+})
+
+
+# full-text index over the free text of notes, journal postings and web3
+# transactions (see utils/search.py); its own rows, kept current by triggers
+SEARCH_TABLE = "search_index"
+SEARCH_INDEX_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "body, kind UNINDEXED, ref UNINDEXED, date UNINDEXED, account UNINDEXED, "
+    "prefix = '2 3', tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+
+class Searched(NamedTuple):
+    slot: int  # search_index.rowid = key * 4 + slot, so a source row finds its entry directly
+    key: str  # the source table's row id column
+    body: str  # indexed text, as an expression over {row}
+    kind: str  # search_index.kind: note | web3 | the journal kind
+    date: str
+    watched: str  # columns whose update re-indexes the row
+    where: str = "1"  # rows worth indexing, besides having text
+
+
+SEARCHED: dict[str, Searched] = {
+    "notes": Searched(1, "id", "{row}.note", "'note'", "{row}.created_at", "note, created_at, account"),
+    "journal": Searched(
+        2, "id", "trim(COALESCE({row}.description, '') || ' ' || COALESCE({row}.note, ''))", "{row}.kind",
+        "{row}.date", "description, note, kind, date, account", "{row}.kind != 'opening'",
+    ),
+    # no id column: keyed by rowid, which only VACUUM renumbers (`vaultplan rebuild-search`)
+    "web3_transactions": Searched(
+        3, "rowid", "{row}.description", "'web3'", "{row}.date", "description, date, account",
+    ),
+}
+
+
+def search_rows_sql(table: str, row: str) -> str:
+    """SELECT of the search_index entries for NEW (in a trigger) or, with row=table, every row of `table`."""
+    spec = SEARCHED[table]
+    body = spec.body.format(row=row)
+    source = f" FROM {table}" if row == table else ""
+    return (
+        f"SELECT {row}.{spec.key} * 4 + {spec.slot}, {body}, {spec.kind.format(row=row)}, {row}.{spec.key}, "
+        f"{spec.date.format(row=row)}, {row}.account{source} "
+        f"WHERE COALESCE({body}, '') != '' AND {spec.where.format(row=row)}"
+    )
+
+
+def _search_trigger(table: str, op: str) -> str:
+    spec = SEARCHED[table]
+    insert = f"INSERT INTO {SEARCH_TABLE} (rowid, body, kind, ref, date, account) {search_rows_sql(table, 'NEW')};"
+    delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.{spec.key} * 4 + {spec.slot};"
+    return {
+        "insert": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        "update": f"AFTER UPDATE OF {spec.watched} ON {table} BEGIN {delete} {insert} END",
+        "delete": f"AFTER DELETE ON {table} BEGIN {delete} END",
+    }[op]
+
+
+TRIGGERS.update({
+    f"trg_search_{table}_{op}": _search_trigger(table, op)
+    for table in SEARCHED
+    for op in ("insert", "update", "delete")
+})
+
+
+def create_triggers(conn: sqlite3.Connection) -> None:
+    tables = _existing(conn, "table")
+    for name, definition in TRIGGERS.items():
+        if name.startswith("trg_search_") and SEARCH_TABLE not in tables:
+            continue  # the index arrives with migration 11
+        if name.startswith("trg_notes_tags_") and "note_tags" not in tables:
+            continue  # migration 12
+        if name.startswith("trg_journal_items_") and "expense_items" not in tables:
+            continue  # migration 13
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {definition}")
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> dict[str, str]:
+    """Existing columns of `table` as {name: declared type} (empty if missing)."""
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _rename_column(conn: sqlite3.Connection, table: str, old: str, new: str) -> None:
+    cols = table_columns(conn, table)
+    if old in cols and new not in cols:
+        conn.execute(f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}")
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str) -> None:
+    cols = table_columns(conn, table)
+    if not cols:
+        return  # created by a later migration
+    for col, decl in _shape(table):
+        if col not in cols:
+            # ADD COLUMN cannot carry PRIMARY KEY / UNIQUE constraints
+            decl = decl.replace("PRIMARY KEY", "").replace("UNIQUE", "").strip()
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+def _m1_create_tables(conn: sqlite3.Connection) -> None:
+    for table in [*TABLES, *LEGACY_TABLES]:
+        conn.execute(create_table_sql(table))
+
+
+def _m2_reconcile_legacy_columns(conn: sqlite3.Connection) -> None:
+    # older installs were created by db_init / clear_tables / setup_db.sh
+    _rename_column(conn, "goals", "title", "name")
+    _rename_column(conn, "goals", "current_amount", "saved_amount")
+    _rename_column(conn, "debits", "paid", "amount_paid")
+    _rename_column(conn, "web3_transactions", "value_aud", "value_fiat")
+    for table in [*TABLES, *LEGACY_TABLES]:
+        _add_missing_columns(conn, table)
+    # list-debits only shows 'open'; db_init used to default to 'pending'
+    conn.execute("UPDATE debits SET status = 'open' WHERE status = 'pending' OR status IS NULL")
+
+
+def _m3_hot_path_indexes(conn: sqlite3.Connection) -> None:
+    create_indexes(conn)
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str, exprs: dict[str, str]) -> None:
+    """Recreate `table` in its TABLES shape, copying each column through
+    exprs[column] (default: the column itself). Columns unknown to TABLES
+    keep their old declaration so nothing is dropped."""
+    old = table_columns(conn, table)
+    declared = dict(_shape(table))
+    parts = [f"{col} {declared.get(col, old[col])}" for col in old]
+    parts += [f"{col} {decl}" for col, decl in _shape(table) if col not in old]
+    parts += CONSTRAINTS.get(table, [])
+    conn.execute(f"CREATE TABLE {table}__new (\n    " + ",\n    ".join(parts) + "\n)")
+    select = ", ".join(exprs.get(col, col) for col in old)
+    conn.execute(f"INSERT INTO {table}__new ({', '.join(old)}) SELECT {select} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+
+
+def _m4_integer_money(conn: sqlite3.Connection) -> None:
+    from utils.money import TOKEN_SCALE, new_vault_scale
+
+    conn.execute(create_table_sql("vault_meta"))
+    conn.execute(
+        "INSERT OR IGNORE INTO vault_meta (key, value) VALUES ('money_scale', ?)", (str(new_vault_scale()),)
+    )
+    scale = int(conn.execute("SELECT value FROM vault_meta WHERE key = 'money_scale'").fetchone()[0])
+
+    pending = {}
+    for table, columns in MONEY_COLUMNS.items():
+        types = table_columns(conn, table)
+        if not types or table not in _existing(conn, "table"):
+            continue  # journal on vaults older than migration 6
+        if all(types.get(col, "").upper().startswith("INTEGER") for col in columns):
+            continue  # created with integer amounts (fresh vault) or already converted
+        pending[table] = {
+            col: 10 ** (TOKEN_SCALE if (table, col) in TOKEN_COLUMNS else scale) for col in columns
+        }
+
+    # refuse to round: the whole migration rolls back and nothing is lost
+    lossy = []
+    for table, factors in pending.items():
+        for col, factor in factors.items():
+            count = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE abs({col} * {factor} - ROUND({col} * {factor})) > 1e-6"
+            ).fetchone()[0]
+            if count:
+                lossy.append(f"{count} in {table}.{col}")
+    if lossy:
+        raise ValueError(
+            f"converting amounts to {scale} decimal places would round {', '.join(lossy)}; "
+            'set "money_scale" in config.json to the decimal places these amounts need'
+        )
+
+    for table, factors in pending.items():
+        _rebuild_table(conn, table, {
+            col: f"CAST(ROUND({col} * {factor}) AS INTEGER)" for col, factor in factors.items()
+        })
+    create_indexes(conn)  # DROP TABLE took the old indexes with it
+
+
+def _m5_balance_checkpoints(conn: sqlite3.Connection) -> None:
+    conn.execute(create_table_sql("balance_checkpoints"))
+    # opening balance = current balance minus everything the ledger recorded,
+    # so balance-as-of-today matches accounts.balance for existing vaults
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO balance_checkpoints (account, as_of, balance)
+        SELECT a.name, ?, COALESCE(a.balance, 0)
+               - COALESCE((SELECT SUM(amount) FROM income WHERE account = a.name AND date IS NOT NULL), 0)
+               + COALESCE((SELECT SUM(amount) FROM expenses WHERE account = a.name AND date IS NOT NULL), 0)
+        FROM accounts a
+        """,
+        (OPENING_DATE,),
+    )
+
+
+# transfer debits ("Transfer to X" with X an account) whose credit leg was never recorded
+_MISSING_CREDITS = """
+    SELECT d.counterparty, -d.amount, d.date, d.account
+    FROM journal d
+    WHERE d.kind = 'transfer' AND d.amount < 0 AND d.date IS NOT NULL
+      AND d.counterparty IN (SELECT name FROM accounts)
+      AND NOT EXISTS (SELECT 1 FROM journal c
+                      WHERE c.kind = 'transfer' AND c.account = d.counterparty AND c.amount = -d.amount
+                        AND c.date = d.date AND c.counterparty = d.account)
+    ORDER BY d.id
+"""
+
+
+def _m6_journal(conn: sqlite3.Connection) -> None:
+    conn.execute(create_table_sql("journal"))
+    if {"income", "expenses"} <= _existing(conn, "table"):
+        conn.execute(
+            """
+            INSERT INTO journal (account, amount, date, kind, counterparty, category,
+                                 description, note, metadata)
+            SELECT * FROM (
+                SELECT account, amount, date,
+                       CASE WHEN source LIKE 'Transfer from %' THEN 'transfer' ELSE 'income' END,
+                       CASE WHEN source LIKE 'Transfer from %' THEN substr(source, 15) END,
+                       NULL, source, NULL, NULL
+                FROM income
+                UNION ALL
+                SELECT account, -amount, date,
+                       CASE category WHEN '__transfer__' THEN 'transfer'
+                                     WHEN '__adjustment__' THEN 'adjustment' ELSE 'expense' END,
+                       CASE WHEN category = '__transfer__' AND description LIKE 'Transfer to %'
+                                 AND description NOT LIKE 'Transfer to goal %'
+                            THEN substr(description, 13) END,
+                       CASE WHEN category IN ('__transfer__', '__adjustment__') THEN NULL ELSE category END,
+                       description, note, metadata
+                FROM expenses
+            )
+            ORDER BY 3
+            """
+        )
+        conn.execute("DROP TABLE income")
+        conn.execute("DROP TABLE expenses")
+    # old `transfer` rows that only recorded the debit: the receiving account's
+    # checkpoints (migration 5) absorbed the credit, so move it to its date
+    for to_account, amount, date, from_account in conn.execute(_MISSING_CREDITS).fetchall():
+        conn.execute(
+            "INSERT INTO journal (account, amount, date, kind, counterparty, description) "
+            "VALUES (?, ?, ?, 'transfer', ?, ?)",
+            (to_account, amount, date, from_account, f"Transfer from {from_account}"),
+        )
+        conn.execute(
+            "UPDATE balance_checkpoints SET balance = balance - ? WHERE account = ? AND as_of < ?",
+            (amount, to_account, date),
+        )
+    # opening balances become postings too, so SUM(amount) per account is the balance
+    conn.execute(
+        """
+        INSERT INTO journal (account, amount, date, kind, description)
+        SELECT account, balance, as_of, 'opening', 'Opening balance'
+        FROM balance_checkpoints
+        WHERE as_of = ? AND balance != 0
+          AND NOT EXISTS (SELECT 1 FROM journal j WHERE j.account = balance_checkpoints.account
+                                                   AND j.kind = 'opening')
+        """,
+        (OPENING_DATE,),
+    )
+    create_views(conn)
+    create_triggers(conn)  # after the copy: checkpoints already include these rows
+    create_indexes(conn)
+
+
+def _m7_import_hash(conn: sqlite3.Connection) -> None:
+    _add_missing_columns(conn, "journal")
+    create_indexes(conn)
+
+
+def _m8_change_log(conn: sqlite3.Connection) -> None:
+    conn.execute(create_table_sql("change_log"))
+    conn.execute(create_table_sql("export_cursors"))
+    create_triggers(conn)
+
+
+def _m9_monthly_rollups(conn: sqlite3.Connection) -> None:
+    from utils.rollups import rebuild
+
+    conn.execute(create_table_sql("journal_monthly"))
+    rebuild(conn)
+    create_triggers(conn)
+
+
+def _m10_metrics(conn: sqlite3.Connection) -> None:
+    conn.execute(create_table_sql("metrics"))
+    create_indexes(conn)
+
+
+def _m11_search_index(conn: sqlite3.Connection) -> None:
+    from utils.search import rebuild
+
+    conn.execute(SEARCH_INDEX_SQL)
+    rebuild(conn)
+    create_triggers(conn)
+
+
+def _m12_note_tags(conn: sqlite3.Connection) -> None:
+    conn.execute(create_table_sql("note_tags"))
+    conn.execute(_NOTE_TAGS.format(row="notes", source="notes, "))
+    create_indexes(conn)
+    create_triggers(conn)
+
+
+def _m13_expense_items(conn: sqlite3.Connection) -> None:
+    from utils.items import rebuild
+
+    conn.execute(create_table_sql("expense_items"))
+    rebuild(conn)
+    create_indexes(conn)
+    create_triggers(conn)
+
+
+MIGRATIONS: list[tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _m1_create_tables),
+    (2, _m2_reconcile_legacy_columns),
+    (3, _m3_hot_path_indexes),
+    (4, _m4_integer_money),
+    (5, _m5_balance_checkpoints),
+    (6, _m6_journal),
+    (7, _m7_import_hash),
+    (8, _m8_change_log),
+    (9, _m9_monthly_rollups),
+    (10, _m10_metrics),
+    (11, _m11_search_index),
+    (12, _m12_note_tags),
+    (13, _m13_expense_items),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class MigrationError(Exception):
+    """A migration step failed and was rolled back; `applied` lists the steps that went in before it."""
+
+    def __init__(self, version: int, cause: Exception, applied: list[int]):
+        super().__init__(f"Migration {version} failed: {cause}")
+        self.version = version
+        self.cause = cause
+        self.applied = applied
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn: sqlite3.Connection) -> list[int]:
+    version = current_version(conn)
+    return [v for v, _ in MIGRATIONS if v > version]
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """Apply pending migrations, one transaction each. Returns versions applied.
+
+    A failing step is rolled back and raised as MigrationError; the steps
+    before it stay applied.
+    """
+    applied = []
+    version = current_version(conn)
+    for target, step in MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN")
+        try:
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise MigrationError(target, e, applied) from e
+        applied.append(target)
+    return applied
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Bring the database up to SCHEMA_VERSION (one PRAGMA read when current)."""
+    if current_version(conn) < SCHEMA_VERSION:
+        migrate(conn)
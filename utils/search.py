@@ -0,0 +1,94 @@
+# utils/search.py
+"""Full-text search over the vault's free text.
+
+search_index (an SQLite FTS5 table, see utils/schema.py) holds one entry
+per note, journal posting (description and note) and web3 transaction
+that has any text. Triggers on the source tables insert, replace and
+delete entries as rows change; each entry's rowid is derived from its
+source row (schema.SEARCHED), so keeping it current is a primary-key
+write and never a scan.
+
+query() ranks matches by BM25 and returns a highlighted snippet per hit;
+date, account and kind filters apply to the matches only. rebuild()
+refills the index from the source tables (the migration and `vaultplan
+rebuild-search`); verify() is doctor's check that it is complete.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Optional, Sequence
+
+from utils.schema import SEARCH_TABLE, SEARCHED, search_rows_sql
+
+_COLUMNS = "rowid, body, kind, ref, date, account"
+_WORD = re.compile(r'[^\s"]+')
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Refill search_index from the source tables; returns the number of entries. The caller commits."""
+    conn.execute(f"DELETE FROM {SEARCH_TABLE}")
+    for table in SEARCHED:
+        conn.execute(f"INSERT INTO {SEARCH_TABLE} ({_COLUMNS}) {search_rows_sql(table, table)}")
+    conn.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return conn.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}").fetchone()[0]
+
+
+def verify(conn: sqlite3.Connection) -> int:
+    """Entries missing from, or left over in, search_index (0 when it matches its sources)."""
+    union = " UNION ALL ".join(f"SELECT * FROM ({search_rows_sql(table, table)})" for table in SEARCHED)
+    expected = f"SELECT * FROM ({union})"
+    return conn.execute(
+        f"""
+        SELECT COUNT(*) FROM (
+            SELECT * FROM (SELECT {_COLUMNS} FROM {SEARCH_TABLE} EXCEPT {expected})
+            UNION ALL
+            SELECT * FROM ({expected} EXCEPT SELECT {_COLUMNS} FROM {SEARCH_TABLE})
+        )
+        """
+    ).fetchone()[0]
+
+
+def match_expression(text: str) -> str:
+    """Plain words -> an FTS5 query matching all of them; a trailing * keeps a word a prefix.
+
+    'flat white caf*' -> '"flat" "white" "caf"*'. Punctuation inside a word
+    is left to the tokenizer, so 'coffee-shop' matches the phrase "coffee shop".
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def query(conn: sqlite3.Connection, expression: str, since: Optional[str] = None, until: Optional[str] = None,
+          account: Optional[str] = None, kinds: Sequence[str] = (), limit: int = 20,
+          marks: tuple[str, str] = ("", "")) -> sqlite3.Cursor:
+    """Best matches first: (kind, ref, date, account, snippet, score).
+
+    `expression` is FTS5 query syntax (see match_expression); `marks` wrap
+    the matched terms in the snippet. Dates compare on YYYY-MM-DD, so
+    `until` includes the whole day.
+    """
+    sql = (
+        f"SELECT kind, ref, date, account, snippet({SEARCH_TABLE}, 0, ?, ?, '…', 12) AS snippet, "
+        f"round(bm25({SEARCH_TABLE}), 3) AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?"
+    )
+    params: list = [*marks, expression]
+    if since:
+        sql += " AND date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND substr(date, 1, 10) <= ?"
+        params.append(until)
+    if account:
+        sql += " AND account = ?"
+        params.append(account)
+    if kinds:
+        sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+        params += kinds
+    return conn.execute(sql + " ORDER BY rank LIMIT ?", (*params, limit))